@@ -0,0 +1,316 @@
+"""
+Travel Path Batch Simulator
+===========================
+Monte Carlo engine that simulates many independent travellers at once, for
+route studies far beyond the single interactive traveller of
+travel_path_simulator.
+
+Features:
+- Random walks over the 8 compass directions, with optional direction
+  weights and a range of step distances
+- Scripted routes (CSV/JSON Lines, as accepted by travel_path_simulator)
+  replayed by every agent, with optional distance jitter and a chance of
+  taking a random direction instead
+- Agents x steps NumPy arrays, simulated in shards across a process pool
+- Reproducible: each shard draws from its own child of one SeedSequence,
+  so results do not depend on the number of workers
+- Displacement and efficiency distributions (mean, spread, percentiles,
+  histogram) across all agents
+
+Usage:
+    python batch_simulation.py --agents 100000 --steps 10000
+    python batch_simulation.py --route route.csv --agents 10000 --jitter 0.1
+
+Author: Enhanced Version
+Date: November 2025
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import numpy as np
+from typing import List, Optional, Sequence, Tuple
+
+from travel_path_simulator import DIRECTIONS, DIRECTION_CODES, UNIT_VECTORS, read_movements
+
+# Cells (agents x steps) simulated per shard; bounds the memory of each worker
+SHARD_CELLS = 1 << 22
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+# Final statistics kept per agent (full paths are never materialised in a batch)
+AGENT_DTYPE = np.dtype([
+    ('final_x', np.float64), ('final_y', np.float64),
+    ('total_distance', np.float64), ('displacement', np.float64),
+    ('efficiency', np.float64),
+])
+
+
+def random_walk_steps(rng: np.random.Generator, agents: int, steps: int,
+                      min_distance: float = 1.0, max_distance: float = 1.0,
+                      weights: Optional[Sequence[float]] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Draw random-walk movements for a block of agents.
+
+    Args:
+        rng: Random generator
+        agents, steps: Block shape
+        min_distance, max_distance: Step distances are uniform in this range
+        weights: Relative probability of each direction code (see DIRECTIONS)
+
+    Returns:
+        (distances, direction codes) arrays of shape (agents, steps)
+    """
+    if weights is None:
+        codes = rng.integers(0, len(DIRECTIONS), size=(agents, steps), dtype=np.uint8)
+    else:
+        p = np.asarray(weights, dtype=np.float64)
+        codes = rng.choice(len(DIRECTIONS), size=(agents, steps), p=p / p.sum()).astype(np.uint8)
+    if min_distance == max_distance:
+        distances = np.full((agents, steps), float(min_distance))
+    else:
+        distances = rng.uniform(min_distance, max_distance, size=(agents, steps))
+    return distances, codes
+
+
+def scripted_steps(rng: np.random.Generator, agents: int, route_distances: np.ndarray,
+                   route_codes: np.ndarray, jitter: float = 0.0,
+                   error_rate: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Replay a scripted route for a block of agents.
+
+    Args:
+        rng: Random generator
+        agents: Number of agents
+        route_distances, route_codes: The route, one entry per step
+        jitter: Relative standard deviation applied to each step distance
+        error_rate: Probability that a step goes in a random direction
+
+    Returns:
+        (distances, direction codes) arrays of shape (agents, len(route))
+    """
+    shape = (agents, len(route_codes))
+    distances = np.broadcast_to(route_distances, shape)
+    codes = np.broadcast_to(route_codes.astype(np.uint8), shape)
+    if jitter > 0:
+        distances = np.clip(distances * rng.normal(1.0, jitter, size=shape), 0.0, None)
+    if error_rate > 0:
+        wrong = rng.random(shape) < error_rate
+        codes = np.where(wrong, rng.integers(0, len(DIRECTIONS), size=shape, dtype=np.uint8),
+                         codes)
+    return distances, codes
+
+
+def simulate_paths(distances: np.ndarray, codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Positions of every agent after every step.
+
+    Returns:
+        (x, y) arrays of shape (agents, steps + 1), starting at (0, 0)
+    """
+    agents = distances.shape[0]
+    x = np.zeros((agents, distances.shape[1] + 1))
+    y = np.zeros_like(x)
+    np.cumsum(distances * UNIT_VECTORS[:, 0][codes], axis=1, out=x[:, 1:])
+    np.cumsum(distances * UNIT_VECTORS[:, 1][codes], axis=1, out=y[:, 1:])
+    return x, y
+
+
+def summarize_agents(distances: np.ndarray, codes: np.ndarray) -> np.ndarray:
+    """Final position, distance, displacement and efficiency of each agent."""
+    summary = np.empty(distances.shape[0], dtype=AGENT_DTYPE)
+    summary['final_x'] = (distances * UNIT_VECTORS[:, 0][codes]).sum(axis=1)
+    summary['final_y'] = (distances * UNIT_VECTORS[:, 1][codes]).sum(axis=1)
+    summary['total_distance'] = distances.sum(axis=1)
+    summary['displacement'] = np.hypot(summary['final_x'], summary['final_y'])
+    # Same definition as calculate_statistics: 0% for agents that never moved
+    total = summary['total_distance']
+    summary['efficiency'] = np.divide(summary['displacement'] * 100, total,
+                                      out=np.zeros_like(total), where=total > 0)
+    return summary
+
+
+def _simulate_shard(job: tuple) -> np.ndarray:
+    """Simulate one shard of agents in a worker and return their summaries."""
+    seed, agents, steps, options = job
+    rng = np.random.default_rng(seed)
+    route = options.get('route')
+    # Split the shard into blocks of whole agents of at most SHARD_CELLS cells
+    block = max(1, SHARD_CELLS // max(steps, 1))
+    parts = []
+    for start in range(0, agents, block):
+        count = min(block, agents - start)
+        if route is None:
+            distances, codes = random_walk_steps(
+                rng, count, steps, options['min_distance'], options['max_distance'],
+                options.get('weights'))
+        else:
+            distances, codes = scripted_steps(
+                rng, count, route[0], route[1], options['jitter'], options['error_rate'])
+        parts.append(summarize_agents(distances, codes))
+    return np.concatenate(parts)
+
+
+def run_batch(agents: int, steps: Optional[int] = None,
+              route: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+              min_distance: float = 1.0, max_distance: float = 1.0,
+              weights: Optional[Sequence[float]] = None, jitter: float = 0.0,
+              error_rate: float = 0.0, seed: Optional[int] = None,
+              workers: Optional[int] = None, shard_agents: Optional[int] = None) -> np.ndarray:
+    """
+    Simulate many independent travellers across a process pool.
+
+    Args:
+        agents: Number of agents
+        steps: Steps per agent for random walks (ignored with a route)
+        route: (distances, direction codes) replayed by every agent
+        min_distance, max_distance: Random-walk step distance range
+        weights: Random-walk direction weights, in DIRECTIONS order
+        jitter, error_rate: Route noise (see scripted_steps)
+        seed: Seed for reproducible runs
+        workers: Worker processes (default: CPU count; 1 runs in-process)
+        shard_agents: Agents per shard (default: as many as fit in
+            SHARD_CELLS cells; independent of workers so that seeded runs
+            are reproducible on any machine)
+
+    Returns:
+        Structured array (AGENT_DTYPE) with one row per agent
+    """
+    if route is not None:
+        steps = len(route[1])
+    if agents <= 0 or not steps or steps <= 0:
+        raise ValueError("Agents and steps must be positive")
+    if weights is not None and len(weights) != len(DIRECTIONS):
+        raise ValueError(f"Expected {len(DIRECTIONS)} direction weights")
+    if min_distance <= 0 or max_distance < min_distance:
+        raise ValueError("Step distances must satisfy 0 < min_distance <= max_distance")
+
+    workers = workers or os.cpu_count() or 1
+    if shard_agents is None:
+        shard_agents = max(1, SHARD_CELLS // steps)
+    starts = range(0, agents, shard_agents)
+    seeds = np.random.SeedSequence(seed).spawn(len(starts))
+    options = {'route': route, 'min_distance': min_distance, 'max_distance': max_distance,
+               'weights': weights, 'jitter': jitter, 'error_rate': error_rate}
+    jobs = [(s, min(shard_agents, agents - start), steps, options)
+            for s, start in zip(seeds, starts)]
+
+    if workers == 1 or len(jobs) == 1:
+        return np.concatenate([_simulate_shard(job) for job in jobs])
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return np.concatenate(list(executor.map(_simulate_shard, jobs)))
+
+
+def distribution(values: np.ndarray, bins: int = 20) -> dict:
+    """Summary statistics and a histogram of one per-agent quantity."""
+    counts, edges = np.histogram(values, bins=bins)
+    return {
+        'mean': float(values.mean()),
+        'std': float(values.std()),
+        'min': float(values.min()),
+        'max': float(values.max()),
+        'percentiles': {p: float(v) for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))},
+        'histogram': {'counts': counts.tolist(), 'edges': edges.tolist()},
+    }
+
+
+def batch_report(summary: np.ndarray, bins: int = 20) -> dict:
+    """Displacement and efficiency distributions across all agents."""
+    return {
+        'agents': len(summary),
+        'displacement': distribution(summary['displacement'], bins),
+        'efficiency': distribution(summary['efficiency'], bins),
+    }
+
+
+def print_batch_report(report: dict, elapsed: Optional[float] = None, steps: int = 0) -> None:
+    """Print a batch report as a table."""
+    print("\n" + "=" * 60)
+    print("📊 BATCH SIMULATION SUMMARY")
+    print("=" * 60)
+    print(f"  👥 Agents : {report['agents']:,}")
+    if steps:
+        print(f"  🚶 Steps  : {steps:,} per agent")
+    if elapsed:
+        print(f"  ⏱️  Time   : {elapsed:.2f} s "
+              f"({report['agents'] * steps / elapsed:,.0f} steps/s)")
+    header = f"\n{'':<18}{'Mean':>10}{'Std':>10}" + "".join(f"{f'P{p}':>10}" for p in PERCENTILES)
+    print(header)
+    print("-" * (len(header) - 1))
+    for key, label in (('displacement', 'Displacement (km)'), ('efficiency', 'Efficiency (%)')):
+        d = report[key]
+        print(f"{label:<18}{d['mean']:>10.2f}{d['std']:>10.2f}"
+              + "".join(f"{d['percentiles'][p]:>10.2f}" for p in PERCENTILES))
+    print("=" * 60)
+
+
+def load_route(path: str, fmt: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Read a scripted route from a CSV/JSON Lines movement file."""
+    if fmt is None:
+        fmt = 'jsonl' if path.lower().endswith(('.jsonl', '.ndjson', '.json')) else 'csv'
+    with open(path, 'r', encoding='utf-8') as stream:
+        chunks = list(read_movements(stream, fmt))
+    if not chunks:
+        raise ValueError(f"No movements found in {path}")
+    return (np.concatenate([d for d, _ in chunks]), np.concatenate([c for _, c in chunks]))
+
+
+def _parse_weights(text: str) -> List[float]:
+    """Parse 'N=2,E=1,...' into weights in DIRECTIONS order (unlisted: 0)."""
+    weights = [0.0] * len(DIRECTIONS)
+    for item in text.split(','):
+        name, _, value = item.partition('=')
+        code = DIRECTION_CODES.get(name.strip().upper())
+        if code is None:
+            raise ValueError(f"invalid direction '{name.strip()}'")
+        weights[code] += float(value)
+    return weights
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Travel path batch simulator")
+    parser.add_argument('--agents', type=int, default=10_000, help="number of travellers")
+    parser.add_argument('--steps', type=int, default=1_000, help="random-walk steps per agent")
+    parser.add_argument('--route', metavar='FILE',
+                        help="scripted route (CSV/JSON Lines) replayed by every agent")
+    parser.add_argument('--min-distance', type=float, default=1.0)
+    parser.add_argument('--max-distance', type=float, default=None,
+                        help="random-walk step distance upper bound (default: --min-distance)")
+    parser.add_argument('--weights', help="direction weights, e.g. 'N=2,E=1,S=1,W=1'")
+    parser.add_argument('--jitter', type=float, default=0.0,
+                        help="relative std of route step distances")
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help="probability a route step goes in a random direction")
+    parser.add_argument('--seed', type=int, help="random seed")
+    parser.add_argument('--workers', type=int, help="worker processes (default: CPU count)")
+    parser.add_argument('--bins', type=int, default=20, help="histogram bins")
+    parser.add_argument('--json', action='store_true', help="emit the report as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        route = load_route(args.route) if args.route else None
+        weights = _parse_weights(args.weights) if args.weights else None
+        start = time.perf_counter()
+        summary = run_batch(args.agents, args.steps, route, args.min_distance,
+                            args.max_distance or args.min_distance, weights, args.jitter,
+                            args.error_rate, args.seed, args.workers)
+        elapsed = time.perf_counter() - start
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    report = batch_report(summary, args.bins)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        steps = len(route[1]) if route is not None else args.steps
+        print_batch_report(report, elapsed, steps)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,361 @@
+"""
+Travel Path Binary Format
+=========================
+Compact columnar file format for recorded travel paths, with a
+memory-mapped reader for journeys larger than RAM.
+
+Layout (little-endian):
+- 64-byte header (HEADER_DTYPE): magic, version, float width, flags, point
+  count, total distance and the byte offset of each column
+- x and y positions (float32 or float64, one per point, starting point first;
+  longitude and latitude in degrees when FLAG_GEODESIC is set)
+- step distances (same float width, one per step)
+- direction codes (int8, one per step; see DIRECTIONS, -1 for no movement)
+
+Every column starts on a 64-byte boundary, so each one maps straight onto a
+NumPy array.
+
+Features:
+- Streaming writer: movement files convert without holding the path in RAM
+- Memory-mapped reader: slice by step range, re-summarize and re-plot
+  without loading whole columns
+
+Usage:
+    python path_format.py convert moves.csv journey.tpath [--float32]
+    python path_format.py summary journey.tpath [--start 0] [--stop 1000]
+    python path_format.py plot journey.tpath journey.png [--start 0] [--stop 1000]
+
+Author: Enhanced Version
+Date: November 2025
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import numpy as np
+from typing import IO, Optional, Tuple
+
+from travel_path_simulator import (STREAM_CHUNK_SIZE, UNIT_VECTORS, calculate_statistics,
+                                   direction_codes, plot_path, print_movement_summary,
+                                   read_movements, rhumb_line)
+
+MAGIC = b'TPATH\x00\x00\x01'
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+COLUMNS = ('x', 'y', 'distance', 'code')
+FLOAT_TYPES = {'float32': np.dtype('<f4'), 'float64': np.dtype('<f8')}
+CODE_TYPE = np.dtype('i1')
+FLAG_GEODESIC = 1
+
+HEADER_DTYPE = np.dtype([
+    ('magic', 'S8'), ('version', '<u2'), ('float_size', '<u2'), ('flags', '<u4'),
+    ('points', '<u8'), ('total_distance', '<f8'),
+    ('x_offset', '<u8'), ('y_offset', '<u8'), ('distance_offset', '<u8'), ('code_offset', '<u8'),
+])
+assert HEADER_DTYPE.itemsize == ALIGNMENT
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+class PathWriter:
+    """
+    Write a path file incrementally.
+
+    Columns are streamed to temporary files next to the target and joined on
+    close(), which replaces the target atomically. Use as a context manager.
+    """
+
+    def __init__(self, filename: str, precision: str = 'float64', geodesic: bool = False):
+        if precision not in FLOAT_TYPES:
+            raise ValueError(f"Unsupported precision '{precision}', use one of {sorted(FLOAT_TYPES)}")
+        self.filename = filename
+        self.float_type = FLOAT_TYPES[precision]
+        self.geodesic = geodesic
+        self._tmp = f"{filename}.{os.getpid()}"
+        self._columns = {name: open(f"{self._tmp}.{name}.tmp", 'wb') for name in COLUMNS}
+        self.points = 0
+        self.total_distance = 0.0
+        self._last = (0.0, 0.0)
+
+    def write(self, x, y, distances, codes) -> None:
+        """
+        Append raw columns. The first call supplies one more position than
+        steps (the starting point); later calls supply one position per step.
+        """
+        expected = len(distances) + (1 if self.points == 0 else 0)
+        if not (len(x) == len(y) == expected and len(codes) == len(distances)):
+            raise ValueError("Column lengths do not match")
+        for name, values, dtype in (('x', x, self.float_type), ('y', y, self.float_type),
+                                    ('distance', distances, self.float_type),
+                                    ('code', codes, CODE_TYPE)):
+            self._columns[name].write(np.ascontiguousarray(values, dtype=dtype).tobytes())
+        self.points += len(x)
+        self.total_distance += float(np.sum(distances, dtype=np.float64))
+        if len(x):
+            self._last = (float(x[-1]), float(y[-1]))
+
+    def extend(self, distances: np.ndarray, codes: np.ndarray) -> None:
+        """Append planar moves given as distances and direction codes (0..7)."""
+        if self.geodesic:
+            raise ValueError("extend() writes planar paths; use write() for geodesic ones")
+        start = [0.0] if self.points == 0 else []
+        x = np.cumsum(UNIT_VECTORS[codes, 0] * distances) + self._last[0]
+        y = np.cumsum(UNIT_VECTORS[codes, 1] * distances) + self._last[1]
+        self.write(np.concatenate((start, x)), np.concatenate((start, y)), distances, codes)
+
+    def close(self) -> str:
+        """Assemble the file and move it into place."""
+        if self.points == 0:
+            self.write([0.0], [0.0], [], [])
+        sizes = {'x': self.points * self.float_type.itemsize,
+                 'y': self.points * self.float_type.itemsize,
+                 'distance': (self.points - 1) * self.float_type.itemsize,
+                 'code': (self.points - 1) * CODE_TYPE.itemsize}
+        header = np.zeros(1, dtype=HEADER_DTYPE)
+        header['magic'], header['version'] = MAGIC, FORMAT_VERSION
+        header['float_size'] = self.float_type.itemsize
+        header['flags'] = FLAG_GEODESIC if self.geodesic else 0
+        header['points'], header['total_distance'] = self.points, self.total_distance
+        offset = ALIGNMENT
+        for name in COLUMNS:
+            header[f'{name}_offset'] = offset
+            offset = _aligned(offset + sizes[name])
+
+        tmp_path = f"{self._tmp}.tmp"
+        try:
+            with open(tmp_path, 'wb') as out:
+                out.write(header.tobytes())
+                for name in COLUMNS:
+                    column = self._columns[name]
+                    column.close()
+                    out.seek(int(header[f'{name}_offset'][0]))
+                    with open(column.name, 'rb') as f:
+                        shutil.copyfileobj(f, out, 1 << 20)
+                out.truncate(offset)
+            os.replace(tmp_path, self.filename)
+        finally:
+            self._cleanup()
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return self.filename
+
+    def _cleanup(self) -> None:
+        for column in self._columns.values():
+            column.close()
+            if os.path.exists(column.name):
+                os.remove(column.name)
+
+    def __enter__(self) -> "PathWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._cleanup()
+
+
+def save_path(filename: str, path_x, path_y, precision: str = 'float64',
+              chunk_size: int = 1 << 20, geodesic: bool = False) -> str:
+    """
+    Save positions (e.g. a PathBuffer's x/y), deriving steps from them.
+    With geodesic=True, x/y are longitudes/latitudes and steps are measured
+    along rhumb lines, the inverse of GeoPathBuffer.
+    """
+    with PathWriter(filename, precision, geodesic) as writer:
+        for start in range(0, max(len(path_x) - 1, 1), chunk_size):
+            stop = min(start + chunk_size, len(path_x) - 1)
+            x = np.asarray(path_x[start:stop + 1], dtype=np.float64)
+            y = np.asarray(path_y[start:stop + 1], dtype=np.float64)
+            if geodesic:
+                lengths, headings = rhumb_line(y[:-1], x[:-1], y[1:], x[1:])
+                dx = lengths * np.cos(np.radians(headings))
+                dy = lengths * np.sin(np.radians(headings))
+            else:
+                dx, dy = np.diff(x), np.diff(y)
+                lengths = np.hypot(dx, dy)
+            first = 0 if start == 0 else 1
+            writer.write(x[first:], y[first:], lengths, direction_codes(dx, dy))
+    return filename
+
+
+def convert_movements(stream: IO[str], filename: str, fmt: str = 'csv',
+                      precision: str = 'float64',
+                      chunk_size: int = STREAM_CHUNK_SIZE) -> str:
+    """Stream a CSV/JSON Lines movement file straight into a path file."""
+    with PathWriter(filename, precision) as writer:
+        for distances, codes in read_movements(stream, fmt, chunk_size):
+            writer.extend(distances, codes)
+    return filename
+
+
+class PathFile:
+    """Memory-mapped, read-only view of a path file."""
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        header = np.fromfile(filename, dtype=HEADER_DTYPE, count=1)
+        if len(header) != 1 or header['magic'][0] != MAGIC:
+            raise ValueError(f"{filename} is not a travel path file")
+        if header['version'][0] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported path file version {header['version'][0]}")
+        self.header = header[0]
+        self.points = int(self.header['points'])
+        self.total_distance = float(self.header['total_distance'])
+        self.geodesic = bool(int(self.header['flags']) & FLAG_GEODESIC)
+        float_type = {t.itemsize: t for t in FLOAT_TYPES.values()}[int(self.header['float_size'])]
+        sizes = {'x': self.points, 'y': self.points,
+                 'distance': self.points - 1, 'code': self.points - 1}
+        types = {'x': float_type, 'y': float_type, 'distance': float_type, 'code': CODE_TYPE}
+        self._columns = {}
+        for name in COLUMNS:
+            if sizes[name] == 0:
+                self._columns[name] = np.empty(0, dtype=types[name])
+            else:
+                self._columns[name] = np.memmap(filename, dtype=types[name], mode='r',
+                                                offset=int(self.header[f'{name}_offset']),
+                                                shape=(sizes[name],))
+
+    @property
+    def x(self) -> np.ndarray:
+        return self._columns['x']
+
+    @property
+    def y(self) -> np.ndarray:
+        return self._columns['y']
+
+    @property
+    def distances(self) -> np.ndarray:
+        return self._columns['distance']
+
+    @property
+    def codes(self) -> np.ndarray:
+        return self._columns['code']
+
+    @property
+    def moves(self) -> int:
+        return self.points - 1
+
+    def __len__(self) -> int:
+        return self.points
+
+    def _range(self, start: int, stop: Optional[int]) -> Tuple[int, int]:
+        stop = self.moves if stop is None else min(stop, self.moves)
+        start = max(start, 0)
+        if start > stop:
+            raise ValueError(f"Empty step range {start}:{stop}")
+        return start, stop
+
+    def steps(self, start: int = 0, stop: Optional[int] = None):
+        """
+        Views of steps start..stop-1 (0-based, like slicing).
+
+        Returns:
+            (x, y, distances, codes), where x and y hold the stop - start + 1
+            positions the steps connect
+        """
+        start, stop = self._range(start, stop)
+        return (self.x[start:stop + 1], self.y[start:stop + 1],
+                self.distances[start:stop], self.codes[start:stop])
+
+    def stats(self, start: int = 0, stop: Optional[int] = None) -> dict:
+        """
+        Statistics for a step range, in the form used by
+        print_movement_summary and plot_path. Per-step entries are views into
+        the file; nothing proportional to the path length is loaded.
+        """
+        x, y, distances, codes = self.steps(start, stop)
+        if start == 0 and stop is None:
+            total = self.total_distance
+        else:
+            total = float(np.sum(distances, dtype=np.float64))
+        stats = calculate_statistics(x, y, total, self.geodesic)
+        stats.update({
+            'step_lengths': distances,
+            'direction_codes': codes,
+            'total_distance': total,
+            'moves': len(distances),
+            'geodesic': self.geodesic,
+        })
+        return stats
+
+    def summarize(self, start: int = 0, stop: Optional[int] = None, max_steps: int = 20) -> dict:
+        """Print the movement summary for a step range."""
+        x, y, _, _ = self.steps(start, stop)
+        stats = self.stats(start, stop)
+        print_movement_summary(x, y, stats['total_distance'], max_steps, stats,
+                               first_step=max(start, 0) + 1)
+        return stats
+
+    def plot(self, start: int = 0, stop: Optional[int] = None, **kwargs):
+        """Plot a step range; returns the figure (see plot_path)."""
+        x, y, _, _ = self.steps(start, stop)
+        return plot_path(x, y, self.stats(start, stop), **kwargs)
+
+    def close(self) -> None:
+        """Drop the memory maps (they are unmapped once no view refers to them)."""
+        self._columns = {}
+
+    def __enter__(self) -> "PathFile":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Travel path binary files")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    convert = sub.add_parser('convert', help="convert a CSV/JSON Lines movement file")
+    convert.add_argument('source', help="movement file ('-' for stdin)")
+    convert.add_argument('target', help="path file to write")
+    convert.add_argument('--format', choices=('csv', 'jsonl'))
+    convert.add_argument('--float32', action='store_true', help="store positions as float32")
+
+    for name, help_text in (('summary', "print the journey summary"),
+                            ('plot', "plot the path to an image")):
+        command = sub.add_parser(name, help=help_text)
+        command.add_argument('path', help="path file")
+        if name == 'plot':
+            command.add_argument('image', help="output image file")
+        command.add_argument('--start', type=int, default=0, help="first step (0-based)")
+        command.add_argument('--stop', type=int, help="step to stop before")
+        if name == 'summary':
+            command.add_argument('--max-steps', type=int, default=20)
+
+    args = parser.parse_args(argv)
+    try:
+        if args.command == 'convert':
+            fmt = args.format or ('jsonl' if args.source.lower().endswith(
+                ('.jsonl', '.ndjson', '.json')) else 'csv')
+            precision = 'float32' if args.float32 else 'float64'
+            if args.source == '-':
+                convert_movements(sys.stdin, args.target, fmt, precision)
+            else:
+                with open(args.source, 'r', encoding='utf-8') as stream:
+                    convert_movements(stream, args.target, fmt, precision)
+            with PathFile(args.target) as path:
+                print(f"✅ Wrote {path.moves:,} steps to {args.target} "
+                      f"({os.path.getsize(args.target):,} bytes)")
+        elif args.command == 'summary':
+            with PathFile(args.path) as path:
+                path.summarize(args.start, args.stop, args.max_steps)
+        else:
+            import matplotlib.pyplot as plt
+            with PathFile(args.path) as path:
+                fig = path.plot(args.start, args.stop)
+                fig.savefig(args.image, dpi=fig.dpi)
+                plt.close(fig)
+            print(f"✅ Plot saved as {args.image}")
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+"""
+Travel Path Spatial Index
+=========================
+Uniform-grid index over the segments of a recorded travel path, for
+proximity queries and revisit analysis on long paths.
+
+Features:
+- Grid built with NumPy in one pass (CSR layout: sorted cell keys with
+  segment ranges), no Python loop over segments
+- Cells sized from the median step, and each segment registered only in
+  the cells its line passes through; the few steps too long for that are
+  kept out of the grid and checked directly, so they cannot flood it
+- Bounding-box, radius and nearest-segment queries
+- Self-intersection (loop) detection that only tests segments sharing a
+  grid cell, instead of every pair of segments
+
+Segment i joins point i to point i + 1, i.e. it is step i + 1 of the journey.
+
+Author: Enhanced Version
+Date: November 2025
+"""
+
+import numpy as np
+from typing import Optional, Tuple
+
+# Grid cells a segment may be registered in, on average, before the cell size
+# is doubled (keeps paths made mostly of long steps from flooding the grid)
+MAX_CELLS_PER_SEGMENT = 8
+
+# Segments spanning more cells than this are not registered in the grid but
+# tested against every segment; only the longest MAX_LONG_SEGMENTS of them
+# (or the square root of the segment count, if larger) are set aside
+LONG_SEGMENT_CELLS = 64
+MAX_LONG_SEGMENTS = 64
+
+# Tolerance for touching/collinear tests, relative to the cell size
+EPSILON = 1e-9
+
+INTERSECTION_DTYPE = np.dtype([
+    ('first', np.intp), ('second', np.intp), ('x', np.float64), ('y', np.float64),
+])
+
+
+def _cross(ax, ay, bx, by):
+    return ax * by - ay * bx
+
+
+def _gather_ranges(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Concatenate the index ranges [starts[k], ends[k]) without a Python loop."""
+    counts = ends - starts
+    total = int(counts.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.intp)
+    offsets = np.repeat(starts - np.concatenate(([0], np.cumsum(counts)[:-1])), counts)
+    return offsets + np.arange(total)
+
+
+class SegmentGrid:
+    """Uniform grid over the segments of a path."""
+
+    def __init__(self, path_x, path_y, cell_size: Optional[float] = None):
+        """
+        Build the index.
+
+        Args:
+            path_x, path_y: Path positions, including the starting point
+            cell_size: Grid cell width (default: the median step length)
+        """
+        x = np.asarray(path_x, dtype=np.float64)
+        y = np.asarray(path_y, dtype=np.float64)
+        if len(x) < 2:
+            raise ValueError("A path needs at least two points")
+        self.x0, self.y0 = x[:-1], y[:-1]
+        self.x1, self.y1 = x[1:], y[1:]
+        self.origin = (float(x.min()), float(y.min()))
+
+        if cell_size is None:
+            # The median, unlike the mean, ignores a few very long steps
+            steps = np.hypot(self.x1 - self.x0, self.y1 - self.y0)
+            steps = steps[steps > 0]
+            cell_size = float(np.median(steps)) if len(steps) else 0.0
+        if not cell_size > 0:
+            # Every step has zero length: any positive size works
+            cell_size = 1.0
+        while not self._build(cell_size):
+            cell_size *= 2
+        self.cell_size = cell_size
+
+    def __len__(self) -> int:
+        return len(self.x0)
+
+    def _cells(self, x, y) -> Tuple[np.ndarray, np.ndarray]:
+        """Grid cell coordinates of points."""
+        return (np.floor((x - self.origin[0]) / self.cell_size).astype(np.int64),
+                np.floor((y - self.origin[1]) / self.cell_size).astype(np.int64))
+
+    def _build(self, cell_size: float) -> bool:
+        """
+        Register each segment in every cell its line passes through.
+
+        Each segment is cut into the grid columns it spans, and within each
+        column registered in the rows covered by that piece, so a diagonal
+        step takes O(length / cell_size) cells rather than its whole
+        bounding box. Ranges are padded by the touching tolerance. Segments
+        spanning more than LONG_SEGMENT_CELLS cells are listed in self.long
+        instead.
+        """
+        self.cell_size = cell_size
+        eps = EPSILON * cell_size
+        (ox, oy), limit = self.origin, MAX_CELLS_PER_SEGMENT * len(self)
+        xlo, xhi = np.minimum(self.x0, self.x1) - eps, np.maximum(self.x0, self.x1) + eps
+        ylo, yhi = np.minimum(self.y0, self.y1) - eps, np.maximum(self.y0, self.y1) + eps
+        cx0 = np.maximum(np.floor((xlo - ox) / cell_size).astype(np.int64), 0)
+        cx1 = np.floor((xhi - ox) / cell_size).astype(np.int64)
+        # Cells crossed by each segment, at most
+        span = cx1 - cx0 + 1 + np.floor((yhi - oy) / cell_size) - np.floor((ylo - oy) / cell_size)
+        threshold, max_long = LONG_SEGMENT_CELLS, max(MAX_LONG_SEGMENTS, int(np.sqrt(len(self))))
+        if np.count_nonzero(span > threshold) > max_long:
+            threshold = np.partition(span, len(span) - max_long - 1)[len(span) - max_long - 1]
+        long = span > threshold
+        self.long = np.flatnonzero(long)
+        columns = np.where(long, 0, cx1 - cx0 + 1)
+        if int(columns.sum()) > limit:
+            return False
+
+        # One entry per (segment, column) with the y-range of the segment there
+        segment = np.repeat(np.arange(len(self)), columns)
+        column = cx0[segment] + (np.arange(len(segment))
+                                 - np.repeat(np.cumsum(columns) - columns, columns))
+        left = np.maximum(xlo[segment], ox + column * cell_size)
+        right = np.minimum(xhi[segment], ox + (column + 1) * cell_size)
+        x0, y0 = self.x0[segment], self.y0[segment]
+        dx, dy = self.x1[segment] - x0, self.y1[segment] - y0
+        steep = np.abs(dx) <= eps
+        slope = dy / np.where(steep, 1.0, dx)
+        low, high = ylo[segment], yhi[segment]
+        ya = np.where(steep, low, np.clip(y0 + (left - x0) * slope, low, high))
+        yb = np.where(steep, high, np.clip(y0 + (right - x0) * slope, low, high))
+        cy0 = np.maximum(np.floor((np.minimum(ya, yb) - eps - oy) / cell_size).astype(np.int64), 0)
+        cy1 = np.floor((np.maximum(ya, yb) + eps - oy) / cell_size).astype(np.int64)
+        rows = cy1 - cy0 + 1
+        total = int(rows.sum())
+        if total > limit:
+            return False
+
+        cell_x = np.repeat(column, rows)
+        cell_y = np.repeat(cy0, rows) + (np.arange(total) - np.repeat(np.cumsum(rows) - rows, rows))
+        segment = np.repeat(segment, rows)
+
+        self.shape = (int(np.floor((xhi.max() - ox) / cell_size)) + 1,
+                      int(np.floor((yhi.max() - oy) / cell_size)) + 1)
+        keys = cell_x * self.shape[1] + cell_y
+        order = np.argsort(keys, kind='stable')
+        keys, self.segments = keys[order], segment[order]
+        self.keys, starts = np.unique(keys, return_index=True)
+        self.starts = starts
+        self.ends = np.append(starts[1:], len(keys))
+        return True
+
+    def _candidates(self, xmin: float, ymin: float, xmax: float, ymax: float) -> np.ndarray:
+        """Segments registered in any cell overlapping the box, and the long ones (a superset)."""
+        (ax, bx), (ay, by) = self._cells(np.array([xmin, xmax]), np.array([ymin, ymax]))
+        ax, ay = max(ax, 0), max(ay, 0)
+        bx, by = min(bx, self.shape[0] - 1), min(by, self.shape[1] - 1)
+        if ax > bx or ay > by:
+            slots = np.empty(0, dtype=np.intp)
+        elif (bx - ax + 1) * (by - ay + 1) <= len(self.keys):
+            gx, gy = np.meshgrid(np.arange(ax, bx + 1), np.arange(ay, by + 1), indexing='ij')
+            wanted = (gx * self.shape[1] + gy).ravel()
+            slots = np.searchsorted(self.keys, wanted)
+            found = slots < len(self.keys)
+            slots, wanted = slots[found], wanted[found]
+            slots = slots[self.keys[slots] == wanted]
+        else:
+            # Box wider than the occupied grid: filter occupied cells instead
+            kx, ky = np.divmod(self.keys, self.shape[1])
+            slots = np.flatnonzero((kx >= ax) & (kx <= bx) & (ky >= ay) & (ky <= by))
+        found = self.segments[_gather_ranges(self.starts[slots], self.ends[slots])]
+        return np.unique(np.concatenate((found, self.long)))
+
+    def distances(self, px: float, py: float, segments: Optional[np.ndarray] = None) -> np.ndarray:
+        """Distance from a point to each segment (all segments by default)."""
+        if segments is None:
+            segments = slice(None)
+        x0, y0 = self.x0[segments], self.y0[segments]
+        dx, dy = self.x1[segments] - x0, self.y1[segments] - y0
+        length2 = dx * dx + dy * dy
+        t = np.divide((px - x0) * dx + (py - y0) * dy, length2,
+                      out=np.zeros_like(length2), where=length2 > 0)
+        t = np.clip(t, 0.0, 1.0)
+        return np.hypot(x0 + t * dx - px, y0 + t * dy - py)
+
+    def bbox(self, xmin: float, ymin: float, xmax: float, ymax: float) -> np.ndarray:
+        """Indices of segments that cross or touch the box, in path order."""
+        candidates = self._candidates(xmin, ymin, xmax, ymax)
+        x0, y0 = self.x0[candidates], self.y0[candidates]
+        dx, dy = self.x1[candidates] - x0, self.y1[candidates] - y0
+        # Liang-Barsky clipping, vectorised over the candidates
+        t0, t1 = np.zeros(len(candidates)), np.ones(len(candidates))
+        inside = np.ones(len(candidates), dtype=bool)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for p, q in ((-dx, x0 - xmin), (dx, xmax - x0), (-dy, y0 - ymin), (dy, ymax - y0)):
+                r = q / p
+                inside &= (p != 0) | (q >= 0)
+                t0 = np.where(p < 0, np.maximum(t0, r), t0)
+                t1 = np.where(p > 0, np.minimum(t1, r), t1)
+        return candidates[inside & (t0 <= t1)]
+
+    def radius(self, px: float, py: float, r: float) -> np.ndarray:
+        """Indices of segments within distance r of a point, in path order."""
+        candidates = self._candidates(px - r, py - r, px + r, py + r)
+        return candidates[self.distances(px, py, candidates) <= r]
+
+    def nearest(self, px: float, py: float) -> Tuple[int, float]:
+        """
+        Segment closest to a point.
+
+        Searches boxes of doubling size around the point; once a segment lies
+        within the box's half-width, no segment outside the box can be closer.
+
+        Returns:
+            (segment index, distance)
+        """
+        xmin, ymin = self.origin
+        xmax = xmin + self.shape[0] * self.cell_size
+        ymax = ymin + self.shape[1] * self.cell_size
+        # Start at the grid if the point lies outside it
+        r = max(self.cell_size, np.hypot(max(xmin - px, 0, px - xmax),
+                                         max(ymin - py, 0, py - ymax)))
+        while True:
+            candidates = self._candidates(px - r, py - r, px + r, py + r)
+            if len(candidates):
+                d = self.distances(px, py, candidates)
+                best = int(d.argmin())
+                if d[best] <= r:
+                    return int(candidates[best]), float(d[best])
+            r *= 2
+
+    def self_intersections(self) -> np.ndarray:
+        """
+        Find every place where the path crosses or touches itself.
+
+        Only pairs of segments registered in a common grid cell are tested,
+        plus the long segments kept out of the grid against all others.
+        Consecutive steps (which always share a point) are not reported; each
+        other pair (i, j) with i < j closes a loop formed by steps i+1..j+1.
+
+        Returns:
+            Structured array (INTERSECTION_DTYPE) of segment pairs and
+            crossing points, ordered by the later segment
+        """
+        parts = [self._intersect(*self._cell_pairs())]
+        # Long segments are in no cell: test each against every segment,
+        # skipping pairs of long segments already tested the other way round
+        is_long = np.zeros(len(self), dtype=bool)
+        is_long[self.long] = True
+        others = np.arange(len(self))
+        xlo, xhi = np.minimum(self.x0, self.x1), np.maximum(self.x0, self.x1)
+        ylo, yhi = np.minimum(self.y0, self.y1), np.maximum(self.y0, self.y1)
+        eps = EPSILON * self.cell_size
+        for segment in self.long.tolist():
+            near = ((xlo <= xhi[segment] + eps) & (xlo[segment] <= xhi + eps)
+                    & (ylo <= yhi[segment] + eps) & (ylo[segment] <= yhi + eps))
+            near &= (np.abs(others - segment) > 1) & (~is_long | (others > segment))
+            partners = others[near]
+            parts.append(self._intersect(np.minimum(partners, segment),
+                                         np.maximum(partners, segment)))
+        result = np.concatenate(parts)
+        if len(self.long):
+            result = result[np.lexsort((result['first'], result['second']))]
+        return result
+
+    def _cell_pairs(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Distinct non-consecutive segment pairs (i < j) sharing a grid cell."""
+        # Every pair of registrations within the same cell
+        sizes = self.ends - self.starts
+        position = np.arange(len(self.segments))
+        cell_end = np.repeat(self.ends, sizes)
+        counts = cell_end - position - 1
+        left = np.repeat(position, counts)
+        right = left + 1 + (np.arange(int(counts.sum()))
+                            - np.repeat(np.cumsum(counts) - counts, counts))
+        i, j = self.segments[left], self.segments[right]
+        i, j = np.minimum(i, j), np.maximum(i, j)
+        keep = j - i > 1
+        if not keep.any():
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        # A pair sharing several cells is tested once
+        pairs = np.sort(j[keep] * len(self) + i[keep])
+        pairs = pairs[np.r_[True, pairs[1:] != pairs[:-1]]]
+        j, i = np.divmod(pairs, len(self))
+        return i, j
+
+    def _intersect(self, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+        """Crossing or touching pairs among segment pairs (i, j), as INTERSECTION_DTYPE."""
+        eps = EPSILON * self.cell_size
+        # Cheap rejection of pairs whose bounding boxes do not overlap
+        overlap = ((np.minimum(self.x0[i], self.x1[i]) <= np.maximum(self.x0[j], self.x1[j]) + eps)
+                   & (np.minimum(self.x0[j], self.x1[j]) <= np.maximum(self.x0[i], self.x1[i]) + eps)
+                   & (np.minimum(self.y0[i], self.y1[i]) <= np.maximum(self.y0[j], self.y1[j]) + eps)
+                   & (np.minimum(self.y0[j], self.y1[j]) <= np.maximum(self.y0[i], self.y1[i]) + eps))
+        i, j = i[overlap], j[overlap]
+
+        ax, ay = self.x0[i], self.y0[i]
+        rx, ry = self.x1[i] - ax, self.y1[i] - ay
+        cx, cy = self.x0[j], self.y0[j]
+        sx, sy = self.x1[j] - cx, self.y1[j] - cy
+
+        # Orientation of each end point relative to the other segment
+        o1 = _cross(rx, ry, cx - ax, cy - ay)
+        o2 = _cross(rx, ry, cx + sx - ax, cy + sy - ay)
+        o3 = _cross(sx, sy, ax - cx, ay - cy)
+        o4 = _cross(sx, sy, ax + rx - cx, ay + ry - cy)
+        proper = (o1 * o2 < 0) & (o3 * o4 < 0)
+        proper &= (np.abs(o1) > eps) & (np.abs(o2) > eps) & (np.abs(o3) > eps) & (np.abs(o4) > eps)
+
+        def on_segment(px, py, qx, qy, dx, dy, o):
+            # Point p lies on segment q + t*d (given it is collinear with it)
+            return ((np.abs(o) <= eps)
+                    & (np.minimum(qx, qx + dx) - eps <= px) & (px <= np.maximum(qx, qx + dx) + eps)
+                    & (np.minimum(qy, qy + dy) - eps <= py) & (py <= np.maximum(qy, qy + dy) + eps))
+
+        # Touching or collinear overlap: some end point lies on the other segment
+        touches = [
+            (on_segment(cx, cy, ax, ay, rx, ry, o1), cx, cy),
+            (on_segment(cx + sx, cy + sy, ax, ay, rx, ry, o2), cx + sx, cy + sy),
+            (on_segment(ax, ay, cx, cy, sx, sy, o3), ax, ay),
+            (on_segment(ax + rx, ay + ry, cx, cy, sx, sy, o4), ax + rx, ay + ry),
+        ]
+        hit = proper.copy()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = _cross(cx - ax, cy - ay, sx, sy) / _cross(rx, ry, sx, sy)
+            px, py = ax + t * rx, ay + t * ry
+        for mask, tx, ty in reversed(touches):
+            mask = mask & ~proper
+            hit |= mask
+            px, py = np.where(mask, tx, px), np.where(mask, ty, py)
+
+        result = np.empty(int(hit.sum()), dtype=INTERSECTION_DTYPE)
+        result['first'], result['second'] = i[hit], j[hit]
+        result['x'], result['y'] = px[hit], py[hit]
+        return result
@@ -0,0 +1,22 @@
+"""Saving and replaying path files."""
+
+import numpy as np
+import pytest
+
+from path_format import PathFile, save_path
+from travel_path_simulator import GeoPathBuffer, compute_path_stats
+
+
+def test_geodesic_file_matches_in_memory_stats(tmp_path):
+    rng = np.random.default_rng(1)
+    distances, codes = rng.uniform(1, 100, 500), rng.integers(0, 8, 500)
+    path = GeoPathBuffer(60.0, -20.0)
+    path.extend(distances, codes.astype(np.uint8))
+    filename = save_path(str(tmp_path / 'geo.tpath'), path.x, path.y, chunk_size=64,
+                         geodesic=True)
+
+    saved = PathFile(filename).stats()
+    stats = compute_path_stats(path.x, path.y, path.total_distance, geodesic=True)
+    assert np.asarray(saved['direction_codes']).tolist() == codes.tolist()
+    assert np.asarray(saved['step_lengths']) == pytest.approx(distances)
+    assert saved['efficiency'] == pytest.approx(stats['efficiency'])
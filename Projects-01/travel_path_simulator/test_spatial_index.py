@@ -0,0 +1,61 @@
+"""SegmentGrid on paths with skewed step lengths."""
+
+import numpy as np
+
+from spatial_index import MAX_CELLS_PER_SEGMENT, SegmentGrid
+
+
+def _skewed_path(steps: int, teleports: int, seed: int = 0):
+    """Random walk of unit-scale steps with a few very long jumps."""
+    rng = np.random.default_rng(seed)
+    step = rng.normal(0, 1, (steps, 2))
+    jumps = rng.choice(steps, teleports, replace=False)
+    step[jumps] = rng.normal(0, 1e5, (teleports, 2))
+    path = np.vstack(([0, 0], np.cumsum(step, axis=0)))
+    return path[:, 0], path[:, 1]
+
+
+def _brute_force_pairs(grid: SegmentGrid):
+    first, second = np.triu_indices(len(grid), 2)
+    found = grid._intersect(first, second)
+    return sorted(zip(found['second'].tolist(), found['first'].tolist()))
+
+
+def test_long_steps_do_not_inflate_cells():
+    x, y = _skewed_path(40_000, teleports=20)
+    grid = SegmentGrid(x, y)
+    steps = np.hypot(np.diff(x), np.diff(y))
+    assert grid.cell_size <= 2 * np.median(steps)
+    assert len(grid.segments) <= MAX_CELLS_PER_SEGMENT * len(grid)
+    # Candidate pairs stay proportional to the path, not quadratic
+    first, _ = grid._cell_pairs()
+    assert len(first) <= 20 * len(grid)
+
+
+def test_skewed_path_intersections_match_brute_force():
+    x, y = _skewed_path(600, teleports=8, seed=1)
+    grid = SegmentGrid(x, y)
+    assert len(grid.long) > 0
+    found = grid.self_intersections()
+    assert list(zip(found['second'].tolist(), found['first'].tolist())) == _brute_force_pairs(grid)
+
+
+def test_queries_include_long_segments():
+    x, y = _skewed_path(600, teleports=8, seed=2)
+    grid = SegmentGrid(x, y)
+    rng = np.random.default_rng(3)
+    for px, py in rng.uniform(min(x.min(), y.min()), max(x.max(), y.max()), (20, 2)):
+        distances = grid.distances(px, py)
+        assert grid.nearest(px, py)[1] == distances.min()
+        r = np.percentile(distances, 5)
+        assert grid.radius(px, py, r).tolist() == np.flatnonzero(distances <= r).tolist()
+
+
+def test_grid_aligned_touching_steps():
+    # A square loop returning to its start, drawn along cell boundaries
+    x = np.array([0, 2, 2, 0, 0, 1], dtype=float)
+    y = np.array([0, 0, 2, 2, 0, 0], dtype=float)
+    grid = SegmentGrid(x, y, cell_size=1.0)
+    found = grid.self_intersections()
+    assert len(found)
+    assert list(zip(found['second'].tolist(), found['first'].tolist())) == _brute_force_pairs(grid)
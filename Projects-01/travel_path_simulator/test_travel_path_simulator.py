@@ -0,0 +1,52 @@
+"""Streaming movement input in travel_path_simulator."""
+
+import io
+
+import numpy as np
+import pytest
+
+from travel_path_simulator import GeoPathBuffer, compute_path_stats, read_movements
+
+
+def _read(text: str, chunk_size: int = 1000):
+    return [(d.tolist(), c.tolist())
+            for d, c in read_movements(io.StringIO(text), 'csv', chunk_size)]
+
+
+@pytest.mark.parametrize('text,line', [("5\nN,3,N\n", 1), ("1,N\n2,E,3\n", 2), ("1,N\n2\n", 2)])
+def test_field_count_checked_per_line(text, line):
+    with pytest.raises(ValueError, match=f"Line {line}: expected 'distance,direction'"):
+        _read(text)
+
+
+def test_error_line_skips_header_after_blank_lines():
+    with pytest.raises(ValueError, match="Line 5: invalid direction 'Q'"):
+        _read("\n\ndistance,direction\n1,N\n2,Q\n")
+
+
+def test_header_skipped_only_once():
+    assert _read("distance,direction\n1,N\n2,E\n", chunk_size=1) == [([1.0], [2]), ([2.0], [0])]
+
+
+def _geo_path(lat: float, distances, codes) -> GeoPathBuffer:
+    path = GeoPathBuffer(lat, 10.0)
+    path.extend(np.array(distances, dtype=float), np.array(codes, dtype=np.uint8))
+    return path
+
+
+def test_high_latitude_east_steps_reported_as_entered():
+    path = _geo_path(80.0, [1000, 1000], [0, 0])
+    stats = compute_path_stats(path.x, path.y, path.total_distance, geodesic=True)
+    assert stats['direction_codes'].tolist() == [0, 0]
+    assert stats['step_lengths'] == pytest.approx([1000, 1000])
+    assert stats['cumulative_distance'][-1] == pytest.approx(path.total_distance)
+    assert stats['efficiency'] == pytest.approx(100)
+
+
+def test_geodesic_steps_invert_buffer():
+    rng = np.random.default_rng(0)
+    distances, codes = rng.uniform(1, 50, 2000), rng.integers(0, 8, 2000)
+    path = _geo_path(40.0, distances, codes)
+    stats = compute_path_stats(path.x, path.y, path.total_distance, geodesic=True)
+    assert stats['direction_codes'].tolist() == codes.tolist()
+    assert stats['step_lengths'] == pytest.approx(distances)
@@ -5,19 +5,36 @@ An advanced travel path simulator that visualizes and analyzes movement patterns
 
 Features:
 - Support for cardinal (N/S/E/W) and diagonal directions (NE/NW/SE/SW)
-- Visual path plotting with distance and direction annotations
+- Visual path plotting with distance and direction annotations, drawn as a
+  single decimated LineCollection so million-step paths render in seconds
 - Statistics including total distance, displacement, and efficiency
+- Vectorised per-step statistics (lengths, headings, direction codes) shared
+  by the summary and the plot
 - Movement history with detailed step-by-step summary
 - Error handling and input validation
 - Option to save the plot as an image
+- Non-interactive mode streaming movements from CSV or JSON Lines files/stdin
+  into growable NumPy buffers
+- Loop/revisit detection and proximity queries through a segment grid index
+  (see spatial_index.py)
+- Compact binary path files with memory-mapped replay (see path_format.py)
+- Geodesic mode: latitude/longitude paths following compass bearings, with
+  per-step rhumb-line lengths and headings, and great-circle displacement
+  and bearing
 
 Author: Enhanced Version
 Date: November 2025
 """
 
+import argparse
+import itertools
+import json
 import math
+import sys
 import matplotlib.pyplot as plt
-from typing import List, Tuple
+import numpy as np
+from matplotlib.collections import LineCollection
+from typing import IO, Iterator, List, Optional, Tuple
 
 # Direction mappings for easier input
 DIRECTION_MAP = {
@@ -31,6 +48,249 @@ DIRECTION_MAP = {
     'SW': (-1, -1), 'SOUTHWEST': (-1, -1)
 }
 
+# Compass directions ordered counter-clockwise from East; code k points at k*45 degrees
+DIRECTIONS = ('E', 'NE', 'N', 'NW', 'W', 'SW', 'S', 'SE')
+_VECTOR_CODES = {DIRECTION_MAP[name]: code for code, name in enumerate(DIRECTIONS)}
+DIRECTION_CODES = {name: _VECTOR_CODES[vector] for name, vector in DIRECTION_MAP.items()}
+
+# Unit movement vector for each direction code (diagonals normalised)
+UNIT_VECTORS = np.array([DIRECTION_MAP[name] for name in DIRECTIONS], dtype=np.float64)
+UNIT_VECTORS /= np.linalg.norm(UNIT_VECTORS, axis=1)[:, None]
+
+# Lines parsed per chunk when streaming movements
+STREAM_CHUNK_SIZE = 65536
+
+# Mean Earth radius (IUGG) for geodesic mode
+EARTH_RADIUS_KM = 6371.0088
+
+# Plot level of detail: vertices drawn per horizontal pixel after decimation,
+# and the most step/point labels placed on one plot
+POINTS_PER_PIXEL = 4
+MAX_ANNOTATIONS = 20
+
+
+class PathBuffer:
+    """
+    Growable NumPy position buffers for a path starting at (0, 0).
+
+    Capacity doubles when full, so appending n moves costs amortised O(n)
+    and memory stays at two float64 values per position.
+    """
+
+    geodesic = False
+
+    def __init__(self, capacity: int = 1024):
+        self._x = np.zeros(max(capacity, 1))
+        self._y = np.zeros(max(capacity, 1))
+        self.size = 1  # the starting point
+        self.total_distance = 0.0
+
+    def _reserve(self, needed: int) -> None:
+        """Grow the buffers to hold at least ``needed`` positions."""
+        capacity = len(self._x)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in ('_x', '_y'):
+            grown = np.empty(capacity)
+            grown[:self.size] = getattr(self, name)[:self.size]
+            setattr(self, name, grown)
+
+    def extend(self, distances: np.ndarray, codes: np.ndarray) -> None:
+        """Append moves given as distances and direction codes."""
+        n = len(distances)
+        if n == 0:
+            return
+        self._reserve(self.size + n)
+        start, end = self.size, self.size + n
+        for buffer, axis in ((self._x, 0), (self._y, 1)):
+            np.cumsum(UNIT_VECTORS[codes, axis] * distances, out=buffer[start:end])
+            buffer[start:end] += buffer[start - 1]
+        self.size = end
+        self.total_distance += float(np.sum(distances))
+
+    @property
+    def x(self) -> np.ndarray:
+        """X coordinates of every position (a view, not a copy)."""
+        return self._x[:self.size]
+
+    @property
+    def y(self) -> np.ndarray:
+        """Y coordinates of every position (a view, not a copy)."""
+        return self._y[:self.size]
+
+    @property
+    def moves(self) -> int:
+        return self.size - 1
+
+
+class GeoPathBuffer(PathBuffer):
+    """
+    PathBuffer on the sphere: x holds longitudes and y latitudes, in degrees.
+
+    Each move follows its compass bearing for the whole step (a rhumb line),
+    which has a closed form: latitude advances by distance * cos(bearing),
+    and longitude by distance * sin(bearing) / q, where q is the ratio of the
+    latitude change to the change in Mercator latitude. Both are plain
+    cumulative sums, so whole chunks advance in one NumPy pass. Longitudes
+    are left unwrapped so paths stay continuous across the antimeridian.
+    """
+
+    geodesic = True
+
+    def __init__(self, lat: float, lon: float, capacity: int = 1024):
+        if not -90 < lat < 90:
+            raise ValueError("Starting latitude must be strictly between -90 and 90")
+        super().__init__(capacity)
+        self._x[0], self._y[0] = lon, lat
+        # Trig of the last latitude, cached between chunks
+        self._phi = math.radians(lat)
+        self._psi = _mercator(self._phi)
+
+    def extend(self, distances: np.ndarray, codes: np.ndarray) -> None:
+        """Append moves given as distances (km) and direction codes."""
+        n = len(distances)
+        if n == 0:
+            return
+        delta = np.asarray(distances, dtype=np.float64) / EARTH_RADIUS_KM
+        # UNIT_VECTORS columns are the east and north components of each bearing
+        phi = self._phi + np.cumsum(delta * UNIT_VECTORS[codes, 1])
+        if np.any(np.abs(phi) >= math.pi / 2):
+            raise ValueError("Path reaches a pole, where compass bearings are undefined")
+        psi = _mercator(phi)
+        d_phi = np.diff(phi, prepend=self._phi)
+        d_psi = np.diff(psi, prepend=self._psi)
+        # East-west steps keep their latitude: q tends to cos(latitude)
+        q = np.where(np.abs(d_psi) > 1e-12, d_phi / np.where(d_psi == 0, 1, d_psi),
+                     np.cos(phi - d_phi))
+        d_lambda = delta * UNIT_VECTORS[codes, 0] / q
+
+        self._reserve(self.size + n)
+        start, end = self.size, self.size + n
+        np.degrees(phi, out=self._y[start:end])
+        np.cumsum(np.degrees(d_lambda), out=self._x[start:end])
+        self._x[start:end] += self._x[start - 1]
+        self.size = end
+        self.total_distance += float(np.sum(distances))
+        self._phi, self._psi = float(phi[-1]), float(psi[-1])
+
+
+def _mercator(phi):
+    """Mercator (isometric) latitude of latitudes in radians."""
+    return np.log(np.tan(np.pi / 4 + np.asarray(phi) / 2))
+
+
+def _parse_movement_line(line: str, fmt: str) -> Tuple[float, int]:
+    """Parse and validate a single CSV or JSON Lines movement record."""
+    if fmt == 'jsonl':
+        record = json.loads(line)
+        distance, direction = record['distance'], record['direction']
+    else:
+        fields = line.split(',')
+        if len(fields) != 2:
+            raise ValueError("expected 'distance,direction'")
+        distance, direction = fields
+    distance = float(distance)
+    if not (distance > 0 and math.isfinite(distance)):
+        raise ValueError("distance must be positive")
+    code = DIRECTION_CODES.get(str(direction).strip().upper())
+    if code is None:
+        raise ValueError(f"invalid direction '{str(direction).strip()}'")
+    return distance, code
+
+
+def _direction_codes(directions: List[str]) -> np.ndarray:
+    """Map direction names to codes, normalising case/whitespace only when needed."""
+    try:
+        return np.fromiter(map(DIRECTION_CODES.__getitem__, directions),
+                           dtype=np.uint8, count=len(directions))
+    except KeyError:
+        return np.fromiter((DIRECTION_CODES[str(d).strip().upper()] for d in directions),
+                           dtype=np.uint8, count=len(directions))
+
+
+def _parse_chunk(lines: List[str], fmt: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Parse a chunk of movement lines in bulk."""
+    if fmt == 'jsonl':
+        records = [json.loads(line) for line in lines]
+        distances = np.array([r['distance'] for r in records], dtype=np.float64)
+        directions = [r['direction'] for r in records]
+    else:
+        # One split for the whole chunk; every line must hold exactly two
+        # fields (a total count alone lets '5' and 'N,3,N' pair up wrongly)
+        if any(line.count(',') != 1 for line in lines):
+            raise ValueError("expected 'distance,direction'")
+        tokens = ','.join(lines).split(',')
+        distances = np.array(tokens[0::2], dtype=np.float64)
+        directions = tokens[1::2]
+    codes = _direction_codes(directions)
+    if not np.all((distances > 0) & np.isfinite(distances)):
+        raise ValueError("distance must be positive")
+    return distances, codes
+
+
+def read_movements(stream: IO[str], fmt: str = 'csv',
+                   chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Stream movements from a CSV ("distance,direction") or JSON Lines
+    ({"distance": ..., "direction": ...}) source.
+
+    Blank lines are ignored, as is a CSV header line.
+
+    Yields:
+        (distances, direction codes) arrays, one pair per chunk of lines
+
+    Raises:
+        ValueError: naming the first malformed line
+    """
+    if fmt not in ('csv', 'jsonl'):
+        raise ValueError(f"Unsupported format '{fmt}', use 'csv' or 'jsonl'")
+    line_no = header_line = 0
+    header_checked = fmt != 'csv'
+    while True:
+        raw = list(itertools.islice(stream, chunk_size))
+        if not raw:
+            break
+        first_line = line_no + 1
+        line_no += len(raw)
+        lines = [line.strip() for line in raw]
+        if not all(lines):
+            lines = [line for line in lines if line]
+        if not header_checked and lines:
+            header_checked = True
+            if 'distance' in lines[0].lower():
+                lines = lines[1:]
+                header_line = first_line + next(i for i, line in enumerate(raw) if line.strip())
+        if not lines:
+            continue
+        try:
+            yield _parse_chunk(lines, fmt)
+        except (ValueError, KeyError, TypeError, IndexError):
+            # Re-parse line by line to report the first bad record
+            for n, line in enumerate(raw, first_line):
+                line = line.strip()
+                if not line or n == header_line:
+                    continue
+                try:
+                    _parse_movement_line(line, fmt)
+                except (ValueError, KeyError, TypeError) as e:
+                    raise ValueError(f"Line {n}: {e}") from None
+            raise
+
+
+def ingest_path(stream: IO[str], fmt: str = 'csv', chunk_size: int = STREAM_CHUNK_SIZE,
+                start: Optional[Tuple[float, float]] = None) -> PathBuffer:
+    """
+    Build a PathBuffer from a stream of movements, or a GeoPathBuffer when
+    a starting (latitude, longitude) is given.
+    """
+    path = PathBuffer() if start is None else GeoPathBuffer(*start)
+    for distances, codes in read_movements(stream, fmt, chunk_size):
+        path.extend(distances, codes)
+    return path
+
+
 def get_direction(dx: float, dy: float) -> str:
     """
     Determine the direction based on changes in x and y coordinates.
@@ -89,20 +349,77 @@ def get_valid_direction() -> Tuple[float, float]:
             return dx, dy
         print(f"❌ Invalid direction! Valid options: {', '.join(sorted(set(DIRECTION_MAP.keys())))}")
 
+def great_circle(lat1, lon1, lat2, lon2) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Haversine distance and initial great-circle bearing between points.
+
+    Works element-wise on arrays; the sines and cosines of each latitude are
+    computed once and shared by both formulas.
+
+    Returns:
+        (distance in km, bearing in degrees counter-clockwise from East, the
+        convention used by calculate_statistics)
+    """
+    phi1, phi2 = np.radians(lat1), np.radians(lat2)
+    d_lambda = np.radians(np.asarray(lon2) - np.asarray(lon1))
+    sin1, cos1 = np.sin(phi1), np.cos(phi1)
+    sin2, cos2 = np.sin(phi2), np.cos(phi2)
+    h = np.sin((phi2 - phi1) / 2)**2 + cos1 * cos2 * np.sin(d_lambda / 2)**2
+    distance = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(h, 0.0, 1.0)))
+    east = np.sin(d_lambda) * cos2
+    north = cos1 * sin2 - sin1 * cos2 * np.cos(d_lambda)
+    return distance, np.degrees(np.arctan2(north, east))
+
+
+def rhumb_line(lat1, lon1, lat2, lon2) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Length and constant bearing of the rhumb lines between points: the
+    inverse of the GeoPathBuffer step, so a stored path reports the steps it
+    was built from. Longitudes are used as given (unwrapped).
+
+    Returns:
+        (distance in km, bearing in degrees counter-clockwise from East)
+    """
+    phi1, phi2 = np.radians(lat1), np.radians(lat2)
+    d_phi = phi2 - phi1
+    d_psi = _mercator(phi2) - _mercator(phi1)
+    # Same q as GeoPathBuffer.extend, including its east-west limit
+    q = np.where(np.abs(d_psi) > 1e-12, d_phi / np.where(d_psi == 0, 1, d_psi), np.cos(phi1))
+    east = EARTH_RADIUS_KM * q * np.radians(np.asarray(lon2) - np.asarray(lon1))
+    north = EARTH_RADIUS_KM * d_phi
+    return np.hypot(east, north), np.degrees(np.arctan2(north, east))
+
+
 def calculate_statistics(path_x: List[float], path_y: List[float], 
-                         total_distance: float) -> dict:
+                         total_distance: float, geodesic: bool = False) -> dict:
     """
-    Calculate various statistics about the journey.
+    Calculate various statistics about the journey (measured from its
+    first point, the origin for a whole journey).
+
+    With geodesic=True, path_x/path_y are longitudes/latitudes and the
+    displacement and bearing follow the great circle to the final position.
+    Efficiency then compares the rhumb line to the final position, the
+    shortest journey on one compass bearing, with the distance travelled.
     
     Returns:
         Dictionary containing statistics
     """
-    displacement = math.sqrt(path_x[-1]**2 + path_y[-1]**2)
-    efficiency = (displacement / total_distance * 100) if total_distance > 0 else 0
+    if geodesic:
+        displacement, bearing = great_circle(path_y[0], path_x[0], path_y[-1], path_x[-1])
+        displacement, bearing = float(displacement), float(bearing)
+        dx, dy = math.cos(math.radians(bearing)), math.sin(math.radians(bearing))
+        # Longitudes are unwrapped: take the shorter way round
+        d_lon = (path_x[-1] - path_x[0] + 180) % 360 - 180
+        straight = float(rhumb_line(path_y[0], 0.0, path_y[-1], d_lon)[0])
+    else:
+        dx = float(path_x[-1] - path_x[0])
+        dy = float(path_y[-1] - path_y[0])
+        displacement = straight = math.sqrt(dx**2 + dy**2)
+    efficiency = (straight / total_distance * 100) if total_distance > 0 else 0
     
     # Calculate bearing to final position
     if displacement > 0:
-        bearing = math.degrees(math.atan2(path_y[-1], path_x[-1]))
+        bearing = math.degrees(math.atan2(dy, dx))
         if bearing < 0:
             bearing += 360
     else:
@@ -112,14 +429,83 @@ def calculate_statistics(path_x: List[float], path_y: List[float],
         'displacement': displacement,
         'efficiency': efficiency,
         'bearing': bearing,
-        'final_x': path_x[-1],
+        'final_x': (path_x[-1] + 180) % 360 - 180 if geodesic else path_x[-1],
         'final_y': path_y[-1]
     }
 
+def direction_codes(dx: np.ndarray, dy: np.ndarray) -> np.ndarray:
+    """
+    Vectorised get_direction: 8-way direction codes (see DIRECTIONS) for
+    arrays of displacements, with -1 where the step has no length.
+    """
+    headings = np.degrees(np.arctan2(dy, dx))
+    # Bins are 45 degrees wide and centred on each compass direction, exactly
+    # like the if/elif ladder in get_direction
+    codes = (np.floor((headings + 22.5) / 45).astype(np.int8)) % 8
+    codes[(np.abs(dx) < 0.001) & (np.abs(dy) < 0.001)] = -1
+    return codes
+
+
+def direction_labels(codes: np.ndarray) -> np.ndarray:
+    """Direction names for codes from direction_codes ('' for code -1)."""
+    return np.array(DIRECTIONS + ('',))[codes]
+
+
+def compute_path_stats(path_x, path_y, total_distance: Optional[float] = None,
+                       geodesic: bool = False) -> dict:
+    """
+    Compute every per-step and whole-journey statistic in one vectorised pass.
+
+    Args:
+        path_x, path_y: Positions including the starting point (longitudes
+            and latitudes in geodesic mode)
+        total_distance: Distance travelled (defaults to the sum of step lengths)
+        geodesic: Measure steps along rhumb lines, as GeoPathBuffer moves
+
+    Returns:
+        Dictionary with the calculate_statistics values plus per-step arrays:
+        dx, dy (km east/north in geodesic mode), step_lengths, headings
+        (degrees, counter-clockwise from East), direction_codes,
+        cumulative_distance, and the scalars total_distance, moves and geodesic
+    """
+    x = np.asarray(path_x, dtype=np.float64)
+    y = np.asarray(path_y, dtype=np.float64)
+    if geodesic:
+        step_lengths, headings = rhumb_line(y[:-1], x[:-1], y[1:], x[1:])
+        radians = np.radians(headings)
+        dx, dy = step_lengths * np.cos(radians), step_lengths * np.sin(radians)
+    else:
+        dx, dy = np.diff(x), np.diff(y)
+        step_lengths = np.hypot(dx, dy)
+        headings = np.degrees(np.arctan2(dy, dx))
+    cumulative_distance = np.cumsum(step_lengths)
+    if total_distance is None:
+        total_distance = float(cumulative_distance[-1]) if len(cumulative_distance) else 0.0
+
+    stats = calculate_statistics(x, y, total_distance, geodesic)
+    stats.update({
+        'dx': dx,
+        'dy': dy,
+        'step_lengths': step_lengths,
+        'headings': headings,
+        'direction_codes': direction_codes(dx, dy),
+        'cumulative_distance': cumulative_distance,
+        'total_distance': total_distance,
+        'moves': len(dx),
+        'geodesic': geodesic,
+    })
+    return stats
+
+
 def print_movement_summary(path_x: List[float], path_y: List[float], 
-                          total_distance: float):
-    """Print detailed movement summary."""
-    stats = calculate_statistics(path_x, path_y, total_distance)
+                          total_distance: float, max_steps: Optional[int] = None,
+                          stats: Optional[dict] = None, first_step: int = 1):
+    """
+    Print detailed movement summary (only the first max_steps steps, if given).
+    first_step numbers the steps of a path that starts mid-journey.
+    """
+    if stats is None:
+        stats = compute_path_stats(path_x, path_y, total_distance)
     
     print("\n" + "="*50)
     print("📊 MOVEMENT SUMMARY")
@@ -128,27 +514,237 @@ def print_movement_summary(path_x: List[float], path_y: List[float],
     # Step-by-step movements
     print("\n🚶 Step-by-Step Movements:")
     print("-" * 50)
-    for i in range(1, len(path_x)):
-        dx = path_x[i] - path_x[i-1]
-        dy = path_y[i] - path_y[i-1]
-        dist = math.sqrt(dx**2 + dy**2)
-        dirn = get_direction(dx, dy)
-        print(f"  Step {i}: {dist:.2f} km {dirn} → Position ({path_x[i]:.2f}, {path_y[i]:.2f})")
+    moves = stats['moves']
+    shown = moves if max_steps is None else min(moves, max_steps)
+    labels = direction_labels(stats['direction_codes'][:shown])
+    for i in range(shown):
+        print(f"  Step {i + first_step}: {stats['step_lengths'][i]:.2f} km {labels[i]} → "
+              f"Position ({path_x[i + 1]:.2f}, {path_y[i + 1]:.2f})")
+    if shown < moves:
+        print(f"  ... {moves - shown} more steps")
     
     # Statistics
     print("\n📈 Journey Statistics:")
     print("-" * 50)
-    print(f"  🏁 Starting Point    : (0.00, 0.00)")
+    print(f"  🏁 Starting Point    : ({path_x[0]:.2f}, {path_y[0]:.2f})")
     print(f"  🎯 Final Position    : ({stats['final_x']:.2f}, {stats['final_y']:.2f})")
     print(f"  📏 Total Path Length : {total_distance:.2f} km")
     print(f"  ↗️  Net Displacement  : {stats['displacement']:.2f} km")
     print(f"  🧭 Bearing to End    : {stats['bearing']:.1f}°")
     print(f"  ⚡ Path Efficiency   : {stats['efficiency']:.1f}%")
-    print(f"  📍 Total Moves       : {len(path_x) - 1}")
+    print(f"  📍 Total Moves       : {moves}")
     print("="*50)
 
-def main():
+def decimate_path(path_x, path_y, max_points: int) -> np.ndarray:
+    """
+    Pick the path vertices worth drawing at a given resolution.
+
+    The path is split into consecutive buckets of steps; each bucket keeps
+    its first vertex and the vertices with the smallest and largest x and y,
+    so the drawn outline matches the full path down to one bucket.
+
+    Returns:
+        Sorted indices into path_x/path_y (always including both ends)
+    """
+    n = len(path_x)
+    if n <= max_points:
+        return np.arange(n)
+
+    size = -(-n // max(max_points // 5, 1))
+    full = n // size * size  # points in complete buckets
+    offsets = np.arange(0, full, size)
+    picks = [np.arange(0, n, size), [n - 1]]
+    for values in (path_x, path_y):
+        # Reshaping keeps memory-mapped input as a view: nothing is copied
+        values = np.asarray(values)
+        grid = values[:full].reshape(-1, size)
+        picks.extend((offsets + grid.argmin(axis=1), offsets + grid.argmax(axis=1)))
+        if full < n:
+            tail = values[full:]
+            picks.append([full + tail.argmin(), full + tail.argmax()])
+    return np.unique(np.concatenate(picks))
+
+
+def _annotation_steps(count: int, limit: int) -> np.ndarray:
+    """Up to ``limit`` evenly spaced indices out of ``count``."""
+    if count <= limit:
+        return np.arange(count)
+    return np.unique(np.linspace(0, count - 1, limit).round().astype(np.intp))
+
+
+def plot_path(path_x, path_y, stats: dict, figsize: Tuple[float, float] = (12, 9),
+              dpi: int = 100, max_annotations: int = MAX_ANNOTATIONS):
+    """
+    Plot the travel path with annotations; returns the figure.
+
+    The path is drawn as one LineCollection, decimated to the figure
+    resolution, and only up to max_annotations steps and points are labelled.
+    """
+    total_distance = stats['total_distance']
+    fig, ax = plt.subplots(figsize=figsize, dpi=dpi)
+    # Only decimated and annotated points are read, so memory-mapped paths
+    # are never loaded in full
+    x, y = np.asarray(path_x), np.asarray(path_y)
+    n = len(x)
+
+    # Plot the path with gradient color
+    keep = decimate_path(x, y, int(figsize[0] * dpi * POINTS_PER_PIXEL))
+    points = np.column_stack((x[keep], y[keep]))
+    segments = np.stack((points[:-1], points[1:]), axis=1)
+    path = LineCollection(segments, cmap='viridis', linewidths=2)
+    path.set_array(keep[:-1] / max(n - 1, 1))
+    path.set_clim(0, 1)
+    ax.add_collection(path)
+    if n <= max_annotations:
+        ax.scatter(x, y, c=np.arange(n) / max(n - 1, 1), cmap='viridis',
+                   s=64, zorder=3)
+    ax.update_datalim(points)
+    ax.autoscale_view()
+
+    # Annotate the path with distances and directions
+    steps = _annotation_steps(stats['moves'], max_annotations)
+    mid_x = (x[steps + 1] + x[steps]) / 2
+    mid_y = (y[steps + 1] + y[steps]) / 2
+    labels = direction_labels(stats['direction_codes'][steps])
+    lengths = stats['step_lengths'][steps]
+    for i in range(len(steps)):
+        label = f"{lengths[i]:.1f} km\n{labels[i]}"
+        ax.text(mid_x[i], mid_y[i], label, fontsize=8, ha='center', va='center',
+                bbox=dict(boxstyle='round,pad=0.4', fc='lightyellow', ec='gray', alpha=0.9))
+
+    # Annotate points with their index (just the ends on large paths)
+    ends = np.arange(n) if n <= max_annotations else (0, n - 1)
+    for i in ends:
+        label = 'START' if i == 0 else f'P{i}'
+        offset = 0.3 if i == 0 else 0.2
+        ax.text(x[i], y[i] + offset, label, fontsize=9, 
+                ha='center', va='bottom', fontweight='bold',
+                bbox=dict(boxstyle='round,pad=0.3', fc='white', ec='black', alpha=0.8))
+
+    # Draw displacement line
+    ax.plot([x[0], x[-1]], [y[0], y[-1]], 'r--', linewidth=2, 
+            alpha=0.6, label=f'Displacement: {stats["displacement"]:.2f} km')
+
+    # Add plot details
+    ax.set_title('🗺️  Travel Path Visualization\nwith Distance & Direction', 
+                 fontsize=16, fontweight='bold', pad=20)
+    if stats.get('geodesic'):
+        ax.set_xlabel('Longitude (°)', fontsize=12, fontweight='bold')
+        ax.set_ylabel('Latitude (°)', fontsize=12, fontweight='bold')
+    else:
+        ax.set_xlabel('X Coordinate (km)', fontsize=12, fontweight='bold')
+        ax.set_ylabel('Y Coordinate (km)', fontsize=12, fontweight='bold')
+    ax.grid(True, alpha=0.3, linestyle='--')
+    ax.axis('equal')
+    
+    # Mark special points
+    ax.scatter(x[0], y[0], color='green', s=200, marker='o', 
+               label=f'Start ({x[0]:.2f}, {y[0]:.2f})', zorder=5, edgecolors='black', linewidths=2)
+    ax.scatter(x[-1], y[-1], color='red', s=200, marker='*', 
+               label='End Point', zorder=5, edgecolors='black', linewidths=2)
+    
+    # Add legend with statistics
+    legend_text = (f'Total Distance: {total_distance:.2f} km\n'
+                  f'Efficiency: {stats["efficiency"]:.1f}%\n'
+                  f'Bearing: {stats["bearing"]:.1f}°')
+    ax.text(0.02, 0.98, legend_text, transform=ax.transAxes,
+            fontsize=10, verticalalignment='top',
+            bbox=dict(boxstyle='round', facecolor='lightblue', alpha=0.8))
+    
+    ax.legend(loc='upper right', fontsize=10)
+    plt.tight_layout()
+    return fig
+
+
+def print_loop_summary(path_x, path_y) -> None:
+    """Print where the path crosses or revisits itself."""
+    from spatial_index import SegmentGrid
+
+    crossings = SegmentGrid(path_x, path_y).self_intersections()
+    print("\n🔁 Loops & Revisits:")
+    print("-" * 50)
+    if len(crossings) == 0:
+        print("  The path never crosses itself")
+        return
+    loop_steps = crossings['second'] - crossings['first'] + 1
+    first, shortest = crossings[0], crossings[loop_steps.argmin()]
+    print(f"  🔀 Self-intersections : {len(crossings)}")
+    print(f"  ⏮️  First revisit      : step {first['second'] + 1} crosses step "
+          f"{first['first'] + 1} at ({first['x']:.2f}, {first['y']:.2f})")
+    print(f"  🔂 Shortest loop      : {loop_steps.min()} steps "
+          f"(steps {shortest['first'] + 1}-{shortest['second'] + 1})")
+
+
+def run_stream(source: str, fmt: Optional[str] = None, max_steps: int = 20,
+               plot_file: Optional[str] = None, loops: bool = False,
+               save_file: Optional[str] = None,
+               start: Optional[Tuple[float, float]] = None) -> PathBuffer:
+    """
+    Non-interactive mode: ingest movements from a file (or '-' for stdin),
+    print the journey summary (and loop analysis if requested) and
+    optionally save the plot to plot_file and the path to save_file.
+    A (latitude, longitude) start switches to geodesic mode.
+    """
+    if fmt is None:
+        fmt = 'jsonl' if source.lower().endswith(('.jsonl', '.ndjson', '.json')) else 'csv'
+    if source == '-':
+        path = ingest_path(sys.stdin, fmt, start=start)
+    else:
+        with open(source, 'r', encoding='utf-8') as stream:
+            path = ingest_path(stream, fmt, start=start)
+    if path.moves == 0:
+        print("⚠️  No movements found in input.")
+        return path
+    stats = compute_path_stats(path.x, path.y, path.total_distance, path.geodesic)
+    print_movement_summary(path.x, path.y, path.total_distance, max_steps, stats)
+    if loops:
+        print_loop_summary(path.x, path.y)
+    if save_file:
+        from path_format import save_path
+        save_path(save_file, path.x, path.y, geodesic=path.geodesic)
+        print(f"✅ Path saved as {save_file}")
+    if plot_file:
+        fig = plot_path(path.x, path.y, stats)
+        fig.savefig(plot_file, dpi=fig.dpi)
+        plt.close(fig)
+        print(f"✅ Plot saved as {plot_file}")
+    return path
+
+
+def main(argv: Optional[List[str]] = None):
     """Main function to simulate the travel path."""
+    parser = argparse.ArgumentParser(description="Travel Path Simulator")
+    parser.add_argument('--input', '-i', metavar='FILE',
+                        help="read movements from a CSV/JSON Lines file ('-' for stdin) "
+                             "instead of prompting")
+    parser.add_argument('--format', choices=('csv', 'jsonl'),
+                        help="input format (default: from the file extension, else csv)")
+    parser.add_argument('--max-steps', type=int, default=20,
+                        help="steps listed in the summary in non-interactive mode")
+    parser.add_argument('--plot', metavar='FILE',
+                        help="save the path plot to FILE in non-interactive mode")
+    parser.add_argument('--loops', action='store_true',
+                        help="report self-intersections in non-interactive mode")
+    parser.add_argument('--save', metavar='FILE',
+                        help="save the path in the binary path format (see path_format.py)")
+    parser.add_argument('--geodesic', metavar='LAT,LON',
+                        help="start at this latitude/longitude and follow bearings on "
+                             "the globe in non-interactive mode")
+    args = parser.parse_args(argv)
+
+    if args.input:
+        try:
+            start = None
+            if args.geodesic:
+                lat, lon = (float(v) for v in args.geodesic.split(','))
+                start = (lat, lon)
+            run_stream(args.input, args.format, args.max_steps, args.plot, args.loops,
+                       args.save, start)
+        except (OSError, ValueError) as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        return
+
     print("\n🗺️  TRAVEL PATH SIMULATOR")
     print("="*50)
     
@@ -200,7 +796,8 @@ def main():
         print(f"✓ Current position: ({x:.2f}, {y:.2f})")
 
     # Display movement summary
-    print_movement_summary(path_x, path_y, total_distance)
+    stats = compute_path_stats(path_x, path_y, total_distance)
+    print_movement_summary(path_x, path_y, total_distance, stats=stats)
 
     # Ask if user wants to visualize
     visualize = input("\n🎨 Would you like to visualize the path? (y/n): ").strip().lower()
@@ -208,64 +805,7 @@ def main():
         print("\n👋 Thank you for using Travel Path Simulator!")
         return
 
-    # Plot the travel path
-    fig, ax = plt.subplots(figsize=(12, 9))
-    
-    # Plot the path with gradient color
-    for i in range(len(path_x) - 1):
-        color = plt.cm.viridis(i / (len(path_x) - 1))
-        ax.plot(path_x[i:i+2], path_y[i:i+2], marker='o', linestyle='-', 
-                color=color, linewidth=2, markersize=8)
-
-    # Annotate the path with distances and directions
-    for i in range(1, len(path_x)):
-        dx = path_x[i] - path_x[i-1]
-        dy = path_y[i] - path_y[i-1]
-        mid_x = (path_x[i] + path_x[i-1]) / 2
-        mid_y = (path_y[i] + path_y[i-1]) / 2
-        dist = math.sqrt(dx**2 + dy**2)
-        dirn = get_direction(dx, dy)
-        label = f"{dist:.1f} km\n{dirn}"
-        ax.text(mid_x, mid_y, label, fontsize=8, ha='center', va='center',
-                bbox=dict(boxstyle='round,pad=0.4', fc='lightyellow', ec='gray', alpha=0.9))
-
-    # Annotate each point with its index
-    for i in range(len(path_x)):
-        label = 'START' if i == 0 else f'P{i}'
-        offset = 0.3 if i == 0 else 0.2
-        ax.text(path_x[i], path_y[i] + offset, label, fontsize=9, 
-                ha='center', va='bottom', fontweight='bold',
-                bbox=dict(boxstyle='round,pad=0.3', fc='white', ec='black', alpha=0.8))
-
-    # Draw displacement line
-    stats = calculate_statistics(path_x, path_y, total_distance)
-    ax.plot([0, path_x[-1]], [0, path_y[-1]], 'r--', linewidth=2, 
-            alpha=0.6, label=f'Displacement: {stats["displacement"]:.2f} km')
-
-    # Add plot details
-    ax.set_title('🗺️  Travel Path Visualization\nwith Distance & Direction', 
-                 fontsize=16, fontweight='bold', pad=20)
-    ax.set_xlabel('X Coordinate (km)', fontsize=12, fontweight='bold')
-    ax.set_ylabel('Y Coordinate (km)', fontsize=12, fontweight='bold')
-    ax.grid(True, alpha=0.3, linestyle='--')
-    ax.axis('equal')
-    
-    # Mark special points
-    ax.scatter(0, 0, color='green', s=200, marker='o', 
-               label='Start (0,0)', zorder=5, edgecolors='black', linewidths=2)
-    ax.scatter(path_x[-1], path_y[-1], color='red', s=200, marker='*', 
-               label='End Point', zorder=5, edgecolors='black', linewidths=2)
-    
-    # Add legend with statistics
-    legend_text = (f'Total Distance: {total_distance:.2f} km\n'
-                  f'Efficiency: {stats["efficiency"]:.1f}%\n'
-                  f'Bearing: {stats["bearing"]:.1f}°')
-    ax.text(0.02, 0.98, legend_text, transform=ax.transAxes,
-            fontsize=10, verticalalignment='top',
-            bbox=dict(boxstyle='round', facecolor='lightblue', alpha=0.8))
-    
-    ax.legend(loc='upper right', fontsize=10)
-    plt.tight_layout()
+    plot_path(path_x, path_y, stats)
     
     # Ask to save
     save_plot = input("\n💾 Save plot as image? (y/n): ").strip().lower()
@@ -3,41 +3,66 @@ Advanced Morse Code Converter
 ==============================
 A comprehensive Morse code converter with support for:
 - Full alphabet (A-Z), numbers (0-9), and special characters
-- Text to Morse and Morse to Text conversion
-- Audio playback of Morse code
+- Text to Morse and Morse to Text conversion on a background thread, with
+  progress, incremental output and cancellation
+- Live mode that re-encodes only the edited lines as you type
+- Audio playback of Morse code (synthesised with morse_audio.py; saved as
+  WAV where no player is available)
+- Decoding of recorded Morse audio (WAV) back to text with morse_receiver.py
 - Copy to clipboard functionality
 - Interactive Morse code chart
 - Modern and intuitive GUI
+- Conversion engine in morse_codec.py, also usable from the command line
 
 Author: Enhanced Version
 Date: November 2025
 """
 
+import io
+import itertools
+import queue
 import tkinter as tk
-from tkinter import messagebox, scrolledtext
-import winsound
+from tkinter import filedialog, messagebox, scrolledtext
 import threading
+import time
 from typing import Dict
 
+try:
+    import winsound
+except ImportError:  # not on Windows
+    winsound = None
+
+import morse_audio
+import morse_codec
+import morse_receiver
+
+# Tcl proxy for the input widget: reports each insert/delete to Python just
+# before and after it runs, so live mode knows which lines changed. Errors
+# from the real widget command propagate unchanged.
+EDIT_PROXY = r"""
+proc ::morse_edit_proxy {orig before after cmd args} {
+    set edit [expr {$cmd in {insert delete replace}}]
+    if {$edit} { $before $cmd {*}$args }
+    set result [uplevel 1 [list $orig $cmd {*}$args]]
+    if {$edit} { $after }
+    return $result
+}
+"""
+
 class MorseConverterGUI:
-    # Complete Morse code dictionary
-    MORSE_CODE: Dict[str, str] = {
-        'A': '.-', 'B': '-...', 'C': '-.-.', 'D': '-..', 'E': '.', 
-        'F': '..-.', 'G': '--.', 'H': '....', 'I': '..', 'J': '.---',
-        'K': '-.-', 'L': '.-..', 'M': '--', 'N': '-.', 'O': '---',
-        'P': '.--.', 'Q': '--.-', 'R': '.-.', 'S': '...', 'T': '-',
-        'U': '..-', 'V': '...-', 'W': '.--', 'X': '-..-', 'Y': '-.--', 'Z': '--..',
-        '0': '-----', '1': '.----', '2': '..---', '3': '...--', '4': '....-',
-        '5': '.....', '6': '-....', '7': '--...', '8': '---..', '9': '----.',
-        '.': '.-.-.-', ',': '--..--', '?': '..--..', "'": '.----.',
-        '!': '-.-.--', '/': '-..-.', '(': '-.--.', ')': '-.--.-',
-        '&': '.-...', ':': '---...', ';': '-.-.-.', '=': '-...-',
-        '+': '.-.-.', '-': '-....-', '_': '..--.-', '"': '.-..-.',
-        '$': '...-..-', '@': '.--.-.', ' ': '/'
-    }
-    
-    # Reverse dictionary for decoding
-    REVERSE_MORSE: Dict[str, str] = {v: k for k, v in MORSE_CODE.items()}
+    # Morse tables (shared with the standalone codec)
+    MORSE_CODE: Dict[str, str] = morse_codec.MORSE_CODE
+    REVERSE_MORSE: Dict[str, str] = morse_codec.REVERSE_MORSE
+    # Playback speed (12 WPM: 100 ms dots) and tone
+    AUDIO_WPM = 12
+    AUDIO_FREQUENCY = 800
+    # Conversion runs on a worker thread in chunks of CHUNK_CHARS; results
+    # reach the Tk thread through a queue polled every POLL_MS, spending at
+    # most POLL_BUDGET seconds per poll on inserting output
+    CHUNK_CHARS = 1 << 15
+    POLL_MS = 30
+    POLL_BUDGET = 0.02
+    LIVE_DELAY_MS = 150
     
     def __init__(self, root):
         self.root = root
@@ -50,7 +75,19 @@ class MorseConverterGUI:
         self.root.grid_rowconfigure(0, weight=1)
         self.root.grid_columnconfigure(0, weight=1)
         
+        # Background conversion state
+        self._messages = queue.Queue()
+        self._job = None
+        self._job_ids = itertools.count()
+        # Live mode state: pending edit, dirty line range and update timer
+        self.live_var = tk.BooleanVar(value=False)
+        self._edit_span = None
+        self._dirty = None
+        self._live_after = None
+        
         self.create_widgets()
+        self._install_edit_proxy()
+        self.root.after(self.POLL_MS, self._poll_messages)
         
     def create_widgets(self):
         # Main container
@@ -105,6 +142,16 @@ class MorseConverterGUI:
                  command=self.copy_to_clipboard, bg='#9b59b6', fg='white',
                  activebackground='#8e44ad', **btn_style).grid(row=1, column=1, padx=5, pady=5)
         
+        tk.Button(control_frame, text="⏹️ Cancel", 
+                 command=self.cancel_conversion, bg='#7f8c8d', fg='white',
+                 activebackground='#707b7c', **btn_style).grid(row=2, column=0, padx=5, pady=5)
+        
+        tk.Checkbutton(control_frame, text="⚡ Live Text to Morse", variable=self.live_var,
+                       command=self.toggle_live, font=("Arial", 10, "bold"),
+                       bg='#2c3e50', fg='#ecf0f1', selectcolor='#34495e',
+                       activebackground='#2c3e50', activeforeground='#ecf0f1'
+                       ).grid(row=2, column=1, padx=5, pady=5)
+        
         # Output Section
         output_frame = tk.LabelFrame(main_frame, text="📤 Output", 
                                      font=("Arial", 11, "bold"),
@@ -140,6 +187,10 @@ class MorseConverterGUI:
         tk.Button(bottom_frame, text="🗑️ Clear All", 
                  command=self.clear_all, bg='#95a5a6', fg='white',
                  activebackground='#7f8c8d', **btn_style2).grid(row=0, column=2, padx=5)
+        
+        tk.Button(bottom_frame, text="🎧 Decode WAV", 
+                 command=self.decode_audio_file, bg='#d35400', fg='white',
+                 activebackground='#ba4a00', **btn_style2).grid(row=0, column=3, padx=5)
 
     
     def text_to_morse(self):
@@ -150,18 +201,8 @@ class MorseConverterGUI:
             messagebox.showwarning("Empty Input", "Please enter some text to convert!")
             return
         
-        morse_result = []
-        for char in input_text:
-            if char in self.MORSE_CODE:
-                morse_result.append(self.MORSE_CODE[char])
-            elif char == '\n':
-                morse_result.append('\n')
-            else:
-                morse_result.append('?')
-        
-        result = ' '.join(morse_result)
-        self.display_output(result)
-        self.update_status(f"✅ Converted {len(input_text)} characters to Morse code")
+        self._start_job(morse_codec.encode_stream, input_text,
+                        f"✅ Converted {len(input_text)} characters to Morse code")
     
     def morse_to_text(self):
         """Convert Morse code to regular text."""
@@ -171,28 +212,195 @@ class MorseConverterGUI:
             messagebox.showwarning("Empty Input", "Please enter Morse code to convert!")
             return
         
-        # Split by newlines to handle multiple lines
-        lines = input_text.split('\n')
-        decoded_lines = []
-        
-        for line in lines:
-            # Split by spaces to get individual Morse codes
-            codes = line.split()
-            decoded_chars = []
-            
-            for code in codes:
-                if code in self.REVERSE_MORSE:
-                    decoded_chars.append(self.REVERSE_MORSE[code])
-                elif code == '':
-                    continue
-                else:
-                    decoded_chars.append('?')
-            
-            decoded_lines.append(''.join(decoded_chars))
-        
-        result = '\n'.join(decoded_lines)
-        self.display_output(result)
-        self.update_status(f"✅ Decoded Morse code to text")
+        self._start_job(morse_codec.decode_stream, input_text, "✅ Decoded Morse code to text")
+    
+    def cancel_conversion(self):
+        """Stop the running conversion, keeping the output produced so far."""
+        if self._job is None:
+            self.update_status("ℹ️ Nothing to cancel")
+            return
+        self._cancel_job()
+        self.update_status("⏹️ Conversion cancelled")
+    
+    def _cancel_job(self):
+        """Signal the running worker to stop; its queued output is ignored."""
+        if self._job is not None:
+            self._job['cancel'].set()
+            self._job = None
+    
+    def _start_job(self, stream_fn, text, done_message, live=False):
+        """
+        Convert text on a worker thread, appending output as it arrives.
+        
+        Args:
+            stream_fn: Generator (stream, chunk_size) -> output pieces
+            text: Input to convert
+            done_message: Status shown when the conversion completes
+            live: Whether this is a live-mode refresh (other conversions
+                take over the output and switch live mode off)
+        """
+        self._cancel_job()
+        if not live:
+            self.live_var.set(False)
+            self._cancel_live_update()
+        self.display_output("")
+        job = {'id': next(self._job_ids), 'cancel': threading.Event()}
+        self._job = job
+        thread = threading.Thread(target=self._convert_thread,
+                                  args=(job, stream_fn, text, done_message))
+        thread.daemon = True
+        thread.start()
+        self.update_status("🔄 Converting... 0%")
+    
+    def _convert_thread(self, job, stream_fn, text, done_message):
+        """Worker: stream text through the codec and queue the pieces."""
+        source = io.StringIO(text)
+        total = max(len(text), 1)
+        for piece in stream_fn(source, self.CHUNK_CHARS):
+            if job['cancel'].is_set():
+                return
+            self._messages.put(('output', job['id'], piece, source.tell() / total))
+        self._messages.put(('done', job['id'], done_message))
+    
+    def _poll_messages(self):
+        """Apply queued worker messages on the Tk thread, within a time budget."""
+        deadline = time.perf_counter() + self.POLL_BUDGET
+        try:
+            while time.perf_counter() < deadline:
+                self._handle_message(self._messages.get_nowait())
+        except queue.Empty:
+            pass
+        self.root.after(self.POLL_MS, self._poll_messages)
+    
+    def _handle_message(self, message):
+        """Apply one worker message; output from cancelled jobs is dropped."""
+        kind = message[0]
+        if kind == 'status':
+            self.update_status(message[1])
+            return
+        if self._job is None or message[1] != self._job['id']:
+            return
+        if kind == 'output':
+            self._append_output(message[2])
+            self.update_status(f"🔄 Converting... {message[3]:.0%}")
+        elif kind == 'done':
+            self._job = None
+            self.update_status(message[2])
+    
+    @staticmethod
+    def _encode_lines(stream, chunk_size):
+        """Encode line by line, so output line n always mirrors input line n."""
+        while True:
+            lines = stream.readlines(chunk_size)
+            if not lines:
+                break
+            yield ''.join(morse_codec.encode(line.rstrip('\n')) + '\n' * line.endswith('\n')
+                          for line in lines)
+    
+    def toggle_live(self):
+        """Switch live-as-you-type conversion on or off."""
+        if self.live_var.get():
+            self._start_live_refresh()
+        else:
+            self._cancel_live_update()
+            if self._job is not None:
+                self.cancel_conversion()
+    
+    def _start_live_refresh(self):
+        """Re-encode the whole input in the background (live mode)."""
+        self._cancel_live_update()
+        text = self.input_text.get("1.0", "end-1c")
+        self._start_job(self._encode_lines, text, "⚡ Live conversion up to date", live=True)
+    
+    def _cancel_live_update(self):
+        """Drop any pending incremental live update."""
+        if self._live_after is not None:
+            self.root.after_cancel(self._live_after)
+            self._live_after = None
+        self._dirty = None
+    
+    def _install_edit_proxy(self):
+        """Route the input widget's commands through EDIT_PROXY."""
+        widget = self.input_text._w
+        self.root.tk.eval(EDIT_PROXY)
+        self.root.tk.call('rename', widget, widget + '_orig')
+        self.root.tk.call('interp', 'alias', '', widget, '', '::morse_edit_proxy',
+                          widget + '_orig', self.root.register(self._before_input_edit),
+                          self.root.register(self._after_input_edit))
+    
+    def _line(self, index):
+        """Zero-based line number of a text index."""
+        return int(index.split('.')[0]) - 1
+    
+    def _before_input_edit(self, command, *args):
+        """
+        Record the lines an input edit is about to touch.
+        
+        The span is (first line, last line before, last line after).
+        """
+        if not self.live_var.get():
+            return
+        widget = self.input_text
+        last = widget.index("end-1c")
+        try:
+            if command == 'insert':
+                start = widget.index(args[0])
+                if widget.compare(start, '>', last):
+                    start = last
+                first = self._line(start)
+                span = (first, first, first + ''.join(args[1::2]).count('\n'))
+            elif command == 'delete' and len(args) <= 2:
+                start = widget.index(args[0])
+                end = widget.index(args[1]) if len(args) == 2 else widget.index(f"{start}+1c")
+                if widget.compare(end, '>', last):
+                    end = last
+                if not widget.compare(end, '>', start):
+                    return
+                span = (self._line(start), self._line(end), self._line(start))
+            else:
+                span = 'full'
+        except tk.TclError:
+            return  # the edit itself will fail
+        self._edit_span = span
+    
+    def _after_input_edit(self):
+        """Fold a completed input edit into the dirty range and schedule an update."""
+        span, self._edit_span = self._edit_span, None
+        if span is None:
+            return
+        if span == 'full' or self._job is not None:
+            self._start_live_refresh()
+            return
+        
+        # The dirty range [lo, hi) is in current input lines; delta is the
+        # change in line count since the output was last in step
+        first, old_last, new_last = span
+        shift = new_last - old_last
+        if self._dirty is None:
+            self._dirty = (first, new_last + 1, shift)
+        else:
+            lo, hi, delta = self._dirty
+            if hi > old_last:
+                hi += shift
+            self._dirty = (min(lo, first), max(hi, new_last + 1), delta + shift)
+        if self._live_after is None:
+            self._live_after = self.root.after(self.LIVE_DELAY_MS, self._apply_live_edit)
+    
+    def _apply_live_edit(self):
+        """Re-encode the dirty input lines and splice them into the output."""
+        self._live_after = None
+        if self._dirty is None or not self.live_var.get():
+            self._dirty = None
+            return
+        lo, hi, delta = self._dirty
+        self._dirty = None
+        region = self.input_text.get(f"{lo + 1}.0", f"{hi}.end")
+        morse = '\n'.join(map(morse_codec.encode, region.split('\n')))
+        self.output_text.config(state=tk.NORMAL)
+        self.output_text.delete(f"{lo + 1}.0", f"{hi - delta}.end")
+        self.output_text.insert(f"{lo + 1}.0", morse)
+        self.output_text.config(state=tk.DISABLED)
+        self.update_status(f"⚡ Live: re-encoded lines {lo + 1}-{hi}")
     
     def play_morse_audio(self):
         """Play Morse code as audio beeps."""
@@ -202,29 +410,45 @@ class MorseConverterGUI:
             messagebox.showwarning("No Output", "Please convert text to Morse first!")
             return
         
+        bank = morse_audio.ToneBank(self.AUDIO_WPM, frequency=self.AUDIO_FREQUENCY)
+        if winsound is None:
+            filename = filedialog.asksaveasfilename(
+                title="Save Morse audio", defaultextension=".wav",
+                filetypes=[("WAV audio", "*.wav")])
+            if filename:
+                seconds = morse_audio.write_wav(filename, morse_text, bank)
+                self.update_status(f"💾 Saved {seconds:.1f} s of audio to {filename}")
+            return
+        
         # Run audio in separate thread to avoid blocking UI
-        thread = threading.Thread(target=self._play_morse_thread, args=(morse_text,))
+        thread = threading.Thread(target=self._play_morse_thread, args=(morse_text, bank))
         thread.daemon = True
         thread.start()
         self.update_status("🔊 Playing Morse code audio...")
     
-    def _play_morse_thread(self, morse_text):
+    def _play_morse_thread(self, morse_text, bank):
         """Play Morse code audio in a separate thread."""
-        DOT_DURATION = 100  # milliseconds
-        DASH_DURATION = 300  # milliseconds
-        FREQUENCY = 800  # Hz
-        
-        for char in morse_text:
-            if char == '.':
-                winsound.Beep(FREQUENCY, DOT_DURATION)
-            elif char == '-':
-                winsound.Beep(FREQUENCY, DASH_DURATION)
-            elif char == ' ':
-                winsound.Beep(37, 100)  # Short pause between letters
-            elif char == '/':
-                winsound.Beep(37, 300)  # Longer pause between words
-        
-        self.update_status("✅ Audio playback completed")
+        # One rendered buffer, played in a single call
+        winsound.PlaySound(morse_audio.wav_bytes(morse_text, bank), winsound.SND_MEMORY)
+        self._messages.put(('status', "✅ Audio playback completed"))
+    
+    def decode_audio_file(self):
+        """Decode a recorded Morse WAV file into the output area."""
+        filename = filedialog.askopenfilename(
+            title="Open Morse audio", filetypes=[("WAV audio", "*.wav")])
+        if not filename:
+            return
+        
+        try:
+            result = morse_receiver.decode_wav(filename)
+        except (OSError, ValueError, EOFError) as e:
+            messagebox.showerror("Decode Failed", f"Could not decode {filename}:\n{e}")
+            return
+        self._cancel_job()
+        self.live_var.set(False)
+        self._cancel_live_update()
+        self.display_output(result)
+        self.update_status(f"✅ Decoded audio from {filename}")
     
     def copy_to_clipboard(self):
         """Copy output to clipboard."""
@@ -313,11 +537,21 @@ HOW TO USE:
    2. Click "Morse to Text" button
    3. Decoded text appears in output
 
+⚡ Live Mode:
+   • Tick "Live Text to Morse" to convert as you type
+   • Only the lines you edit are re-encoded
+   • Large inputs convert in the background; "Cancel" stops them
+
 🔊 Audio Playback:
    • Convert text to Morse first
    • Click "Play Audio" to hear the code
    • Dot (.) = short beep
    • Dash (-) = long beep
+   • Without a sound player, the audio is saved as a WAV file
+
+🎧 Decode Audio:
+   • Click "Decode WAV" and pick a Morse recording
+   • Speed and tone are detected automatically
 
 📋 Copy to Clipboard:
    • Click to copy output
@@ -342,7 +576,9 @@ Created with ❤️ for Morse code enthusiasts!
     
     def clear_all(self):
         """Clear all input and output fields."""
+        self._cancel_job()
         self.input_text.delete("1.0", tk.END)
+        self._cancel_live_update()
         self.output_text.config(state=tk.NORMAL)
         self.output_text.delete("1.0", tk.END)
         self.output_text.config(state=tk.DISABLED)
@@ -355,6 +591,12 @@ Created with ❤️ for Morse code enthusiasts!
         self.output_text.insert("1.0", text)
         self.output_text.config(state=tk.DISABLED)
     
+    def _append_output(self, text):
+        """Append text to the output area."""
+        self.output_text.config(state=tk.NORMAL)
+        self.output_text.insert(tk.END, text)
+        self.output_text.config(state=tk.DISABLED)
+    
     def update_status(self, message):
         """Update status (could be extended to a status bar)."""
         self.root.title(f"🔊 Morse Code Converter - {message}")
@@ -0,0 +1,254 @@
+"""
+Morse Audio Engine
+==================
+Cross-platform PCM synthesis of Morse code with NumPy.
+
+Features:
+- Dot and dash tones and every gap rendered once per setting, with
+  raised-cosine envelopes against key clicks
+- Letters assembled once from those clips and cached, so a message is just
+  a sequence of views concatenated into the output
+- Standard (PARIS) timing in words per minute, with optional Farnsworth
+  spacing for slower effective speeds
+- Whole-message buffers, chunked streaming or WAV output in constant memory
+- No sound device needed: runs anywhere NumPy does
+
+Usage:
+    python morse_audio.py message.txt -o message.wav [--wpm 20] [--farnsworth 10]
+    python morse_audio.py code.morse --morse -o code.wav
+
+Author: Enhanced Version
+Date: November 2025
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+import wave
+from typing import Dict, IO, Iterable, Iterator, Optional, Tuple, Union
+
+import numpy as np
+
+import morse_codec
+
+SAMPLE_RATE = 8000
+FREQUENCY = 800.0
+WPM = 20
+RAMP_MS = 5.0
+AMPLITUDE = 0.8
+CHUNK_SECONDS = 10.0
+
+
+def unit_seconds(wpm: float) -> float:
+    """Length of one dot at the given speed ("PARIS " is 50 units)."""
+    return 1.2 / wpm
+
+
+def gap_seconds(wpm: float, farnsworth_wpm: Optional[float] = None) -> Tuple[float, float]:
+    """
+    Letter and word gap lengths.
+
+    With a Farnsworth speed below wpm, characters keep their wpm timing and
+    the gaps are stretched so the overall speed is farnsworth_wpm (ARRL
+    formula).
+
+    Returns:
+        (letter gap, word gap) in seconds
+    """
+    if not farnsworth_wpm or farnsworth_wpm >= wpm:
+        unit = unit_seconds(wpm)
+        return 3 * unit, 7 * unit
+    delay = (60 * wpm - 37.2 * farnsworth_wpm) / (farnsworth_wpm * wpm)
+    return 3 * delay / 19, 7 * delay / 19
+
+
+class ToneBank:
+    """Pre-rendered 16-bit PCM clips for one set of audio settings."""
+
+    def __init__(self, wpm: float = WPM, farnsworth_wpm: Optional[float] = None,
+                 frequency: float = FREQUENCY, sample_rate: int = SAMPLE_RATE,
+                 ramp_ms: float = RAMP_MS, amplitude: float = AMPLITUDE):
+        if wpm <= 0 or sample_rate <= 0:
+            raise ValueError("wpm and sample_rate must be positive")
+        self.sample_rate = sample_rate
+        self.frequency = frequency
+        self.ramp_ms = ramp_ms
+        self.amplitude = amplitude
+
+        unit = max(1, round(unit_seconds(wpm) * sample_rate))
+        letter_gap, word_gap = gap_seconds(wpm, farnsworth_wpm)
+        self.dot = self._tone(unit)
+        self.dash = self._tone(3 * unit)
+        self.symbol_gap = np.zeros(unit, dtype=np.int16)
+        self.letter_gap = np.zeros(round(letter_gap * sample_rate), dtype=np.int16)
+        self.word_gap = np.zeros(round(word_gap * sample_rate), dtype=np.int16)
+        self._letters: Dict[str, np.ndarray] = {}
+
+    def _tone(self, samples: int) -> np.ndarray:
+        """Sine burst with raised-cosine attack and release."""
+        t = np.arange(samples) / self.sample_rate
+        wave_ = np.sin(2 * np.pi * self.frequency * t)
+        ramp = min(round(self.ramp_ms * self.sample_rate / 1000), samples // 2)
+        envelope = np.ones(samples)
+        if ramp:
+            rise = 0.5 - 0.5 * np.cos(np.pi * np.arange(ramp) / ramp)
+            envelope[:ramp] = rise
+            envelope[samples - ramp:] = rise[::-1]
+        return np.round(self.amplitude * 32767 * wave_ * envelope).astype(np.int16)
+
+    def letter(self, code: str) -> np.ndarray:
+        """Clip for one Morse code (symbols other than '.' and '-' are ignored)."""
+        clip = self._letters.get(code)
+        if clip is None:
+            parts = []
+            for symbol in code:
+                if symbol in '.-':
+                    if parts:
+                        parts.append(self.symbol_gap)
+                    parts.append(self.dot if symbol == '.' else self.dash)
+            clip = np.concatenate(parts) if parts else np.zeros(0, dtype=np.int16)
+            self._letters[code] = clip
+        return clip
+
+
+def _chunks(source: Union[str, IO[str], Iterable[str]]) -> Iterable[str]:
+    """Morse text as an iterable of chunks."""
+    if isinstance(source, str):
+        return (source,)
+    if hasattr(source, 'read'):
+        return iter(lambda: source.read(morse_codec.CHUNK_SIZE), '')
+    return source
+
+
+def clips(source: Union[str, IO[str], Iterable[str]], bank: ToneBank) -> Iterator[np.ndarray]:
+    """
+    Yield the PCM clips of a Morse message in order.
+
+    Letters are separated by spaces; '/' and line breaks mark word gaps.
+    Tokens split across chunk boundaries are carried into the next chunk.
+    """
+    started = False
+    gap = bank.letter_gap
+    carry = ''
+    for chunk in _chunks(source):
+        data = carry + chunk
+        cut = max(data.rfind(' '), data.rfind('\n'), data.rfind('\t'))
+        carry, data = data[cut + 1:], data[:cut + 1]
+        for token in data.replace('\n', ' / ').split():
+            if token == '/':
+                gap = bank.word_gap
+                continue
+            clip = bank.letter(token)
+            if len(clip):
+                if started:
+                    yield gap
+                yield clip
+                started = True
+                gap = bank.letter_gap
+    if carry:
+        clip = bank.letter(carry)
+        if len(clip):
+            if started:
+                yield gap
+            yield clip
+
+
+def stream_pcm(source: Union[str, IO[str], Iterable[str]], bank: Optional[ToneBank] = None,
+               chunk_seconds: float = CHUNK_SECONDS) -> Iterator[np.ndarray]:
+    """Yield the message as int16 PCM chunks of about chunk_seconds each."""
+    bank = bank or ToneBank()
+    target = max(1, int(chunk_seconds * bank.sample_rate))
+    parts, size = [], 0
+    for clip in clips(source, bank):
+        parts.append(clip)
+        size += len(clip)
+        if size >= target:
+            yield np.concatenate(parts)
+            parts, size = [], 0
+    if parts:
+        yield np.concatenate(parts)
+
+
+def synthesize(source: Union[str, IO[str], Iterable[str]],
+               bank: Optional[ToneBank] = None) -> np.ndarray:
+    """Render a whole Morse message as one int16 PCM buffer."""
+    bank = bank or ToneBank()
+    parts = list(clips(source, bank))
+    return np.concatenate(parts) if parts else np.zeros(0, dtype=np.int16)
+
+
+def _write_frames(target, source, bank: ToneBank, chunk_seconds: float) -> int:
+    """Write a mono 16-bit WAV to target; return the number of samples."""
+    samples = 0
+    with wave.open(target, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(bank.sample_rate)
+        for chunk in stream_pcm(source, bank, chunk_seconds):
+            wav.writeframes(chunk.astype('<i2', copy=False).tobytes())
+            samples += len(chunk)
+    return samples
+
+
+def wav_bytes(source: Union[str, IO[str], Iterable[str]], bank: Optional[ToneBank] = None) -> bytes:
+    """Render a Morse message as an in-memory WAV file."""
+    buffer = io.BytesIO()
+    _write_frames(buffer, source, bank or ToneBank(), CHUNK_SECONDS)
+    return buffer.getvalue()
+
+
+def write_wav(filename: str, source: Union[str, IO[str], Iterable[str]],
+              bank: Optional[ToneBank] = None, chunk_seconds: float = CHUNK_SECONDS) -> float:
+    """
+    Stream a Morse message into a WAV file.
+
+    The file is written under a temporary name and moved into place when
+    complete.
+
+    Returns:
+        Duration of the audio in seconds
+    """
+    bank = bank or ToneBank()
+    tmp = filename + '.tmp'
+    try:
+        with open(tmp, 'wb') as f:
+            samples = _write_frames(f, source, bank, chunk_seconds)
+        os.replace(tmp, filename)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return samples / bank.sample_rate
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Render text or Morse code as a WAV file")
+    parser.add_argument('input', nargs='?', default='-', help="input file ('-' for stdin)")
+    parser.add_argument('-o', '--output', required=True, help="WAV file to write")
+    parser.add_argument('--morse', action='store_true', help="input is already Morse code")
+    parser.add_argument('--wpm', type=float, default=WPM, help="character speed")
+    parser.add_argument('--farnsworth', type=float, help="effective speed with stretched gaps")
+    parser.add_argument('--frequency', type=float, default=FREQUENCY, help="tone in Hz")
+    parser.add_argument('--rate', type=int, default=SAMPLE_RATE, help="sample rate in Hz")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == '-' else open(args.input, 'r', encoding='utf-8')
+    try:
+        bank = ToneBank(args.wpm, args.farnsworth, args.frequency, args.rate)
+        chunks = _chunks(source) if args.morse else morse_codec.encode_stream(source)
+        start = time.perf_counter()
+        seconds = write_wav(args.output, chunks, bank)
+        elapsed = time.perf_counter() - start
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    print(f"✅ Wrote {seconds:,.1f} s of audio to {args.output} in {elapsed:.2f} s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Morse Batch Transcoder
+======================
+Convert whole directory trees of text files to Morse code and back.
+
+Features:
+- Walks a source directory and mirrors its layout under a target directory
+- Files sharded across a process pool (one file per task, largest first)
+- Every file streamed through morse_codec in fixed-size chunks, so memory
+  use does not grow with file size
+- Outputs written under a temporary name and moved into place when
+  complete; re-running skips outputs that are already up to date, so an
+  interrupted run resumes where it stopped
+- Per-file throughput and run totals
+
+Usage:
+    python morse_batch.py encode texts/ morse/ [--workers 8]
+    python morse_batch.py decode morse/ texts/ [--recover] [--force]
+
+Author: Enhanced Version
+Date: November 2025
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import morse_codec
+
+SUFFIXES = {'encode': ('.txt', '.morse'), 'decode': ('.morse', '.txt')}
+
+
+def _target_name(name: str, mode: str) -> str:
+    """Output file name: swap the input suffix for the output one."""
+    source_suffix, target_suffix = SUFFIXES[mode]
+    if name.endswith(source_suffix):
+        name = name[:-len(source_suffix)]
+    return name + target_suffix
+
+
+def plan_jobs(source_dir: str, target_dir: str, mode: str = 'encode',
+              force: bool = False) -> Tuple[List[Tuple[str, str]], List[str]]:
+    """
+    Match input files under source_dir with their outputs under target_dir.
+
+    Args:
+        source_dir: Tree to read ('*.txt' for encode, '*.morse' for decode)
+        target_dir: Tree to write, mirroring source_dir
+        mode: 'encode' or 'decode'
+        force: Redo outputs that are already up to date
+
+    Returns:
+        (jobs as (source, target) pairs, largest first; skipped sources)
+    """
+    if mode not in SUFFIXES:
+        raise ValueError(f"Unknown mode '{mode}', use 'encode' or 'decode'")
+    if not os.path.isdir(source_dir):
+        raise ValueError(f"Not a directory: {source_dir}")
+    suffix = SUFFIXES[mode][0]
+    jobs, skipped = [], []
+    for root, dirs, files in os.walk(source_dir):
+        dirs.sort()
+        for name in sorted(files):
+            if not name.endswith(suffix):
+                continue
+            source = os.path.join(root, name)
+            relative = os.path.relpath(source, source_dir)
+            target = os.path.join(target_dir, _target_name(relative, mode))
+            # Outputs only appear once complete, so an existing one that is
+            # newer than its source is finished
+            if not force and os.path.exists(target) and \
+                    os.path.getmtime(target) >= os.path.getmtime(source):
+                skipped.append(source)
+                continue
+            jobs.append((source, target))
+    jobs.sort(key=lambda job: os.path.getsize(job[0]), reverse=True)
+    return jobs, skipped
+
+
+def transcode_file(job: tuple) -> Dict[str, object]:
+    """
+    Stream one file through the codec into its target (runs in a worker).
+
+    Returns:
+        Dictionary with source, target, bytes_in, bytes_out, seconds and
+        error (None on success)
+    """
+    source, target, mode, chunk_size, recover = job
+    result = {'source': source, 'target': target, 'bytes_in': 0, 'bytes_out': 0,
+              'seconds': 0.0, 'error': None}
+    start = time.perf_counter()
+    tmp = f"{target}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(target) or '.', exist_ok=True)
+        with open(tmp, 'w', encoding='utf-8', newline='') as out:
+            if mode == 'encode':
+                with open(source, 'r', encoding='utf-8', errors='replace', newline='') as f:
+                    morse_codec.transcode(f, out, 'encode', chunk_size)
+            else:
+                with open(source, 'rb') as f:
+                    for piece in morse_codec.decode_bytes_stream(f, chunk_size, recover):
+                        out.write(piece)
+        os.replace(tmp, target)
+        result['bytes_in'] = os.path.getsize(source)
+        result['bytes_out'] = os.path.getsize(target)
+    except (OSError, ValueError) as e:
+        result['error'] = str(e)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+def run_batch(source_dir: str, target_dir: str, mode: str = 'encode',
+              workers: Optional[int] = None, chunk_size: int = morse_codec.CHUNK_SIZE,
+              recover: bool = False, force: bool = False) -> Iterator[Dict[str, object]]:
+    """
+    Transcode a directory tree across a process pool.
+
+    Args:
+        source_dir: Input tree
+        target_dir: Output tree
+        mode: 'encode' or 'decode'
+        workers: Number of worker processes (default: CPU count; 1 runs in
+            the calling process)
+        chunk_size: Characters (encode) or bytes (decode) read per chunk
+        recover: Decode unknown codes as the nearest valid code
+        force: Redo outputs that are already up to date
+
+    Yields:
+        One result per file (see transcode_file) as it completes, after a
+        result with 'skipped' set for each up-to-date file
+    """
+    jobs, skipped = plan_jobs(source_dir, target_dir, mode, force)
+    for source in skipped:
+        yield {'source': source, 'skipped': True}
+    tasks = [(source, target, mode, chunk_size, recover) for source, target in jobs]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) <= 1:
+        for task in tasks:
+            yield transcode_file(task)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+        futures = [executor.submit(transcode_file, task) for task in tasks]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def _megabytes(count: float) -> str:
+    return f"{count / 1e6:,.2f} MB"
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Transcode directory trees to and from Morse code")
+    parser.add_argument('mode', choices=('encode', 'decode'))
+    parser.add_argument('source', help="input directory")
+    parser.add_argument('target', help="output directory")
+    parser.add_argument('--workers', type=int, help="worker processes (default: CPU count)")
+    parser.add_argument('--chunk-size', type=int, default=morse_codec.CHUNK_SIZE,
+                        help="characters or bytes read per chunk")
+    parser.add_argument('--recover', action='store_true',
+                        help="decode unknown codes as the nearest valid code")
+    parser.add_argument('--force', action='store_true', help="redo up-to-date outputs")
+    parser.add_argument('--quiet', action='store_true', help="print totals only")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    done = skipped = failed = 0
+    bytes_in = bytes_out = 0
+    try:
+        for result in run_batch(args.source, args.target, args.mode, args.workers,
+                                args.chunk_size, args.recover, args.force):
+            if result.get('skipped'):
+                skipped += 1
+                continue
+            if result['error']:
+                failed += 1
+                print(f"❌ {result['source']}: {result['error']}", file=sys.stderr)
+                continue
+            done += 1
+            bytes_in += result['bytes_in']
+            bytes_out += result['bytes_out']
+            if not args.quiet:
+                rate = result['bytes_in'] / max(result['seconds'], 1e-9)
+                print(f"✅ {result['source']} -> {result['target']}  "
+                      f"{_megabytes(result['bytes_in'])} in {result['seconds']:.2f} s "
+                      f"({_megabytes(rate)}/s)")
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+
+    elapsed = time.perf_counter() - start
+    print(f"\n📊 {done} converted, {skipped} up to date, {failed} failed")
+    print(f"   {_megabytes(bytes_in)} read, {_megabytes(bytes_out)} written in {elapsed:.2f} s "
+          f"({_megabytes(bytes_in / max(elapsed, 1e-9))}/s)")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
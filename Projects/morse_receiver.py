@@ -0,0 +1,431 @@
+"""
+Morse Audio Receiver
+====================
+Decode Morse code audio (WAV files or raw PCM streams) back to text.
+
+Features:
+- Carrier found automatically from the spectrum of the opening audio, or
+  given explicitly
+- Vectorised envelope detection: the carrier bin of every short frame is
+  computed at once (a single-bin DFT, as a Goertzel filter would)
+- Keying threshold that adapts between the running signal peak and the
+  noise floor
+- Dot/dash and letter/word gap thresholds found by splitting the run
+  lengths into two clusters; runs are held until both splits have been
+  seen, so any speed and Farnsworth spacing decode without configuration,
+  short messages included
+- Streaming in chunks with state carried across boundaries, many times
+  faster than real time; levels are tracked over fixed one-second blocks,
+  so the result does not depend on how the input is chunked
+- Letters looked up in the shared morse_codec tables
+
+Usage:
+    python morse_receiver.py recording.wav [-o text.txt] [--frequency 800]
+    python morse_receiver.py - --rate 8000 < pcm.raw   # 16-bit mono PCM
+
+Author: Enhanced Version
+Date: November 2025
+"""
+
+import argparse
+import sys
+import time
+import wave
+from typing import BinaryIO, Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+
+import morse_codec
+
+FRAME_MS = 5.0
+SMOOTH_FRAMES = 3      # moving average over the envelope against noise
+BLOCK_SECONDS = 1.0    # level-tracking block
+CHUNK_SECONDS = 10.0
+MIN_CARRIER = 100.0
+MAX_CARRIER = 4000.0
+PEAK_DECAY = 0.5       # per block, so the threshold follows fading signals
+FLOOR_SMOOTHING = 0.3  # weight of each block in the noise floor
+HISTORY = 128          # recent runs behind the timing estimates
+MIN_MARKS = 8          # marks seen before the opening of a stream is classified
+MARK_RATIO = 2.2       # smallest dash/dot spread taken as two clusters (nominally 3)
+GAP_RATIO = 1.8        # smallest word/letter gap spread (nominally 7/3)
+
+# Run classes and the Morse text they produce
+GAP, DOT, DASH, LETTER_GAP, WORD_GAP = range(5)
+RUN_TEXT = np.array(['', '.', '-', ' ', ' / '])
+
+
+def estimate_carrier(samples: np.ndarray, sample_rate: int) -> float:
+    """Frequency of the strongest tone between MIN_CARRIER and MAX_CARRIER."""
+    samples = samples[:1 << 16]
+    spectrum = np.abs(np.fft.rfft(samples * np.hanning(len(samples))))
+    freqs = np.fft.rfftfreq(len(samples), 1 / sample_rate)
+    band = (freqs >= MIN_CARRIER) & (freqs <= min(MAX_CARRIER, sample_rate / 2))
+    if not band.any():
+        raise ValueError("Sample rate too low to find a carrier")
+    return float(freqs[band][np.argmax(spectrum[band])])
+
+
+def split_lengths(lengths: np.ndarray, ratio: float) -> Optional[float]:
+    """
+    Threshold between the short and long clusters of a set of run lengths.
+
+    The split maximises the between-cluster variance of the log lengths
+    (Otsu's method), so it holds for any speed.  Runs are weighted by their
+    length, so a few noise blips cannot form a cluster of their own.
+
+    Args:
+        lengths: Run lengths
+        ratio: Smallest ratio of the cluster means taken as two clusters
+
+    Returns:
+        Geometric mean of the two cluster means, or None when the lengths
+        form a single cluster
+    """
+    if len(lengths) < 2:
+        return None
+    lengths = np.sort(np.asarray(lengths, dtype=np.float64))
+    logs = np.log(lengths)
+    weight = np.cumsum(lengths)[:-1]
+    moment = np.cumsum(lengths * logs)[:-1]
+    total, total_moment = lengths.sum(), (lengths * logs).sum()
+    short = moment / weight
+    long = (total_moment - moment) / (total - weight)
+    best = int(np.argmax(weight * (total - weight) * (long - short) ** 2))
+    if long[best] - short[best] < np.log(ratio):
+        return None
+    return float(np.exp((short[best] + long[best]) / 2))
+
+
+class MorseReceiver:
+    """
+    Incremental Morse audio decoder.
+
+    Feed PCM chunks with feed() and call flush() at the end of the stream;
+    both return the text decoded so far.
+    """
+
+    def __init__(self, sample_rate: int, frequency: Optional[float] = None,
+                 frame_ms: float = FRAME_MS, wpm: Optional[float] = None):
+        self.sample_rate = sample_rate
+        self.frame = max(1, round(frame_ms * sample_rate / 1000))
+        self.block = max(SMOOTH_FRAMES, round(BLOCK_SECONDS * sample_rate / self.frame))
+        self.frequency = None
+        self._kernel = None
+        if frequency:
+            self._tune(frequency)
+
+        # Signal level tracking
+        self._peak = 0.0
+        self._floor = None
+        # Samples short of a frame, smoothing history and magnitudes short
+        # of a block, carried between chunks
+        self._pending = np.zeros(0)
+        self._history = np.zeros(0)
+        self._magnitudes = np.zeros(0)
+        # Keying state carried between blocks
+        self._state = False
+        self._run = 0
+        self._started = False
+        self._lengths = np.zeros(0, dtype=np.int64)
+        self._states = np.zeros(0, dtype=bool)
+        # Timing estimates in frames
+        self.unit = 1.2 / wpm * sample_rate / self.frame if wpm else None
+        self.bias = 0.0
+        self.word_gap = None
+        self._settled = False
+        self._recent_lengths = np.zeros(0, dtype=np.int64)
+        self._recent_states = np.zeros(0, dtype=bool)
+        self._morse = ''
+
+    def _tune(self, frequency: float) -> None:
+        """Build the single-bin DFT kernel for the carrier."""
+        self.frequency = frequency
+        n = np.arange(self.frame)
+        window = np.hanning(self.frame) if self.frame > 2 else np.ones(self.frame)
+        self._kernel = window * np.exp(-2j * np.pi * frequency * n / self.sample_rate)
+
+    def _envelope(self, samples: np.ndarray) -> np.ndarray:
+        """Smoothed carrier magnitude of each complete frame; the remainder is kept."""
+        frames = len(samples) // self.frame
+        self._pending = samples[frames * self.frame:]
+        blocks = samples[:frames * self.frame].reshape(frames, self.frame)
+        magnitudes = np.concatenate((self._history, np.abs(blocks @ self._kernel)))
+        self._history = magnitudes[len(magnitudes) - SMOOTH_FRAMES + 1:]
+        if len(magnitudes) < SMOOTH_FRAMES:
+            return np.zeros(0)
+        return np.convolve(magnitudes, np.full(SMOOTH_FRAMES, 1 / SMOOTH_FRAMES), 'valid')
+
+    def _keying(self, magnitudes: np.ndarray, ahead: np.ndarray) -> np.ndarray:
+        """Key-down mask from the adaptive threshold."""
+        floor = np.percentile(magnitudes, 10)
+        self._floor = floor if self._floor is None else \
+            (1 - FLOOR_SMOOTHING) * self._floor + FLOOR_SMOOTHING * floor
+        self._peak = max(self._peak * PEAK_DECAY, np.percentile(magnitudes, 99))
+        # The next block's level counts too, so a tone starting at the end of
+        # a block after a long gap is keyed against the level it reaches
+        peak = max(self._peak, np.percentile(ahead, 99)) if len(ahead) else self._peak
+        if peak < 4 * self._floor:
+            return np.zeros(len(magnitudes), dtype=bool)  # no clear signal
+        return magnitudes > (self._floor + peak) / 2
+
+    def _runs(self, keyed: np.ndarray) -> None:
+        """Append the completed key-up/key-down runs; carry the open one."""
+        edges = np.flatnonzero(keyed[1:] != keyed[:-1]) + 1
+        bounds = np.concatenate(([0], edges, [len(keyed)]))
+        lengths = np.diff(bounds)
+        states = keyed[bounds[:-1]]
+        if states[0] == self._state:
+            lengths[0] += self._run
+        else:
+            lengths = np.concatenate(([self._run], lengths))
+            states = np.concatenate(([self._state], states))
+        self._state, self._run = bool(states[-1]), int(lengths[-1])
+        self._queue(lengths[:-1], states[:-1])
+
+    def _queue(self, lengths: np.ndarray, states: np.ndarray) -> None:
+        """Queue completed runs, dropping the silence before the first mark."""
+        if not self._started:
+            marks = np.flatnonzero(states)
+            if not len(marks):
+                return
+            lengths, states = lengths[marks[0]:], states[marks[0]:]
+            self._started = True
+        self._lengths = np.concatenate((self._lengths, lengths))
+        self._states = np.concatenate((self._states, states))
+
+    def _adjusted(self, lengths: np.ndarray, states: np.ndarray) -> np.ndarray:
+        """Run lengths with the keying bias (marks short, gaps long) removed."""
+        return np.where(states, lengths + self.bias, lengths - self.bias)
+
+    def _update_timing(self, lengths: np.ndarray, states: np.ndarray) -> bool:
+        """
+        Re-estimate the dot length, keying bias and word-gap threshold from runs.
+
+        Returns:
+            True when both the marks (dots/dashes) and the long gaps
+            (letter/word) split into two clusters
+        """
+        marks = lengths[states]
+        mark_split = split_lengths(marks, MARK_RATIO)
+        if mark_split is not None:
+            # Dots and dashes are 1 and 3 units, each cut short by the same
+            # amount where the envelope crosses the threshold
+            dot = np.median(marks[marks < mark_split])
+            dash = np.median(marks[marks >= mark_split])
+            self.unit = float(dash - dot) / 2
+            self.bias = float(np.clip(self.unit - dot, -self.unit / 2, self.unit / 2))
+        elif len(marks):
+            # One kind of mark: dashes when symbol gaps are much shorter,
+            # otherwise whichever reading agrees with the last estimate
+            mark = float(np.median(marks)) + self.bias
+            if self.unit is not None:
+                self.unit = min((mark, mark / 3), key=lambda unit: abs(np.log(unit / self.unit)))
+            else:
+                gaps = lengths[~states] - self.bias
+                self.unit = mark / 3 if (gaps < mark * 2 / 3).any() else mark
+        if self.unit is None:
+            return False
+        gaps = self._adjusted(lengths, states)[~states]
+        gap_split = split_lengths(gaps[gaps >= 2 * self.unit], GAP_RATIO)
+        if gap_split is not None:
+            self.word_gap = gap_split
+        elif self.word_gap is None:
+            # Letter and word gaps are 3 and 7 units without Farnsworth spacing
+            self.word_gap = 5 * self.unit
+        return mark_split is not None and gap_split is not None
+
+    def _merge_blips(self, lengths: np.ndarray, states: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Fold runs much shorter than a dot (noise blips and dropouts) into their neighbours."""
+        keep = np.flatnonzero(self._adjusted(lengths, states) >= self.unit / 3)
+        if len(keep) == len(lengths) or not len(keep):
+            return lengths, states
+        kept = states[keep]
+        first = np.concatenate(([True], kept[1:] != kept[:-1]))
+        starts = keep[first]
+        starts[0] = 0
+        return np.add.reduceat(lengths, starts), kept[first]
+
+    def _classify(self, final: bool = False) -> None:
+        """Turn queued runs into Morse text once the timing is known."""
+        lengths, states = self._lengths, self._states
+        if not len(lengths):
+            return
+        if self._settled:
+            self._update_timing(np.concatenate((self._recent_lengths, lengths))[-HISTORY:],
+                                np.concatenate((self._recent_states, states))[-HISTORY:])
+        else:
+            # Hold every run until dots, dashes, letter and word gaps have all
+            # been seen, then classify the whole opening with those estimates
+            settled = self._update_timing(lengths, states) and states.sum() >= MIN_MARKS
+            self._settled = settled or len(lengths) >= HISTORY
+            if not (self._settled or final):
+                return
+        # Keep the last run back so a blip at the end can still be merged
+        count = len(lengths) if final else len(lengths) - 1
+        lengths, states = lengths[:count], states[:count]
+        self._recent_lengths = np.concatenate((self._recent_lengths, lengths))[-HISTORY:]
+        self._recent_states = np.concatenate((self._recent_states, states))[-HISTORY:]
+        lengths, states = self._merge_blips(lengths, states)
+        lengths = self._adjusted(lengths, states)
+        classes = np.where(states,
+                           np.where(lengths < 2 * self.unit, DOT, DASH),
+                           np.where(lengths < 2 * self.unit, GAP,
+                                    np.where(lengths < self.word_gap, LETTER_GAP, WORD_GAP)))
+        self._morse += ''.join(RUN_TEXT[classes].tolist())
+        self._lengths = self._lengths[count:]
+        self._states = self._states[count:]
+
+    def _text(self, final: bool = False) -> str:
+        """Decode the Morse text up to the last complete letter."""
+        cut = len(self._morse) if final else self._morse.rfind(' ') + 1
+        ready, self._morse = self._morse[:cut], self._morse[cut:]
+        return morse_codec.decode(ready)
+
+    def feed(self, pcm: np.ndarray) -> str:
+        """Decode one chunk of mono PCM; return newly completed text."""
+        samples = np.concatenate((self._pending, np.asarray(pcm, dtype=np.float64)))
+        if self._kernel is None:
+            if len(samples) < self.sample_rate:
+                self._pending = samples  # wait for enough audio to find the carrier
+                return ''
+            self._tune(estimate_carrier(samples, self.sample_rate))
+        self._magnitudes = np.concatenate((self._magnitudes, self._envelope(samples)))
+        # Each block is keyed once the block after it has arrived
+        while len(self._magnitudes) >= 2 * self.block:
+            self._process(self._magnitudes[:self.block], self._magnitudes[self.block:2 * self.block])
+            self._magnitudes = self._magnitudes[self.block:]
+        return self._text()
+
+    def _process(self, magnitudes: np.ndarray, ahead: np.ndarray) -> None:
+        """Key, run-length encode and classify one block of magnitudes."""
+        self._runs(self._keying(magnitudes, ahead))
+        self._classify()
+
+    def flush(self) -> str:
+        """Decode whatever remains at the end of the stream."""
+        text = ''
+        if self._kernel is None and len(self._pending):
+            self._tune(estimate_carrier(self._pending, self.sample_rate))
+            text = self.feed(np.zeros(0))
+        if len(self._magnitudes) > self.block:
+            self._process(self._magnitudes[:self.block], self._magnitudes[self.block:])
+            self._magnitudes = self._magnitudes[self.block:]
+        if len(self._magnitudes):
+            self._process(self._magnitudes, self._magnitudes[:0])
+            self._magnitudes = self._magnitudes[:0]
+        if self._state:
+            self._queue(np.array([self._run]), np.array([True]))
+        self._state, self._run = False, 0
+        self._classify(final=True)
+        return text + self._text(final=True).rstrip()
+
+
+def read_wav(filename: str, chunk_seconds: float = CHUNK_SECONDS) -> Tuple[int, Iterator[np.ndarray]]:
+    """
+    Open a PCM WAV file for chunked reading.
+
+    Returns:
+        (sample rate, iterator of mono float chunks)
+    """
+    wav = wave.open(filename, 'rb')
+    width, channels, rate = wav.getsampwidth(), wav.getnchannels(), wav.getframerate()
+    if width not in (1, 2, 4):
+        wav.close()
+        raise ValueError(f"Unsupported sample width: {8 * width} bits")
+    dtype = {1: np.uint8, 2: '<i2', 4: '<i4'}[width]
+    frames = max(1, int(chunk_seconds * rate))
+
+    def chunks():
+        with wav:
+            while True:
+                data = wav.readframes(frames)
+                if not data:
+                    break
+                pcm = np.frombuffer(data, dtype=dtype).astype(np.float64)
+                if width == 1:
+                    pcm -= 128
+                yield pcm.reshape(-1, channels).mean(axis=1) if channels > 1 else pcm
+
+    return rate, chunks()
+
+
+def read_raw(stream: BinaryIO, sample_rate: int,
+             chunk_seconds: float = CHUNK_SECONDS) -> Iterator[np.ndarray]:
+    """Read 16-bit little-endian mono PCM from a binary stream in chunks."""
+    size = 2 * max(1, int(chunk_seconds * sample_rate))
+    carry = b''
+    while True:
+        data = stream.read(size)
+        if not data:
+            break
+        data = carry + data
+        even = len(data) - len(data) % 2
+        carry = data[even:]
+        yield np.frombuffer(data[:even], dtype='<i2').astype(np.float64)
+
+
+def decode_pcm(chunks: Iterable[np.ndarray], sample_rate: int,
+               frequency: Optional[float] = None, wpm: Optional[float] = None) -> Iterator[str]:
+    """Decode a stream of PCM chunks, yielding text as it completes."""
+    receiver = MorseReceiver(sample_rate, frequency, wpm=wpm)
+    for chunk in chunks:
+        text = receiver.feed(chunk)
+        if text:
+            yield text
+    text = receiver.flush()
+    if text:
+        yield text
+
+
+def decode_wav(filename: str, frequency: Optional[float] = None,
+               wpm: Optional[float] = None) -> str:
+    """Decode a whole WAV recording to text."""
+    rate, chunks = read_wav(filename)
+    return ''.join(decode_pcm(chunks, rate, frequency, wpm))
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Decode Morse code audio to text")
+    parser.add_argument('input', help="WAV file, or '-' for raw 16-bit PCM on stdin")
+    parser.add_argument('-o', '--output', default='-', help="output file ('-' for stdout)")
+    parser.add_argument('--rate', type=int, help="sample rate of raw PCM input")
+    parser.add_argument('--frequency', type=float, help="carrier in Hz (default: detect)")
+    parser.add_argument('--wpm', type=float, help="expected speed (default: detect)")
+    args = parser.parse_args(argv)
+
+    target = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    try:
+        if args.input == '-':
+            if not args.rate:
+                parser.error("--rate is required for raw PCM input")
+            rate, chunks = args.rate, read_raw(sys.stdin.buffer, args.rate)
+        else:
+            rate, chunks = read_wav(args.input)
+        start = time.perf_counter()
+        samples = 0
+
+        def counted():
+            nonlocal samples
+            for chunk in chunks:
+                samples += len(chunk)
+                yield chunk
+
+        for text in decode_pcm(counted(), rate, args.frequency, args.wpm):
+            target.write(text)
+        target.write('\n')
+        elapsed = time.perf_counter() - start
+    except (OSError, ValueError, EOFError, wave.Error) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if target is not sys.stdout:
+            target.close()
+    audio = samples / rate
+    print(f"✅ Decoded {audio:,.1f} s of audio in {elapsed:.2f} s "
+          f"({audio / max(elapsed, 1e-9):,.0f}x real time)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
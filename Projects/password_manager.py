@@ -1,20 +1,33 @@
 from cryptography.fernet import Fernet
 import json
 import os
+import sqlite3
+import threading
+import time
 
-# File to store passwords
+# Files to store passwords (the JSON file is only read to migrate old vaults)
+VAULT_FILE = "passwords.db"
 PASSWORD_FILE = "passwords.json"
 KEY_FILE = "secret.key"
 
+# Seconds of inactivity after which a session forgets the key
+IDLE_TIMEOUT = 300
+
+UPSERT_SQL = ("INSERT INTO services (name, username, password) VALUES (?, ?, ?) "
+              "ON CONFLICT(name) DO UPDATE SET username = excluded.username, password = excluded.password")
+
+_vaults = {}
+_session = None
+
 # Generate or load encryption key
-def load_key():
+def load_key(path=KEY_FILE):
     """Load the encryption key from a file or generate a new one if not found."""
-    if os.path.exists(KEY_FILE):
-        with open(KEY_FILE, "rb") as key_file:
+    if os.path.exists(path):
+        with open(path, "rb") as key_file:
             return key_file.read()
     else:
         key = Fernet.generate_key()
-        with open(KEY_FILE, "wb") as key_file:
+        with open(path, "wb") as key_file:
             key_file.write(key)
         return key
 
@@ -30,38 +43,188 @@ def decrypt_password(encrypted_password, key):
     fernet = Fernet(key)
     return fernet.decrypt(encrypted_password.encode()).decode()
 
+# Session that keeps the key and cipher in memory while in use
+class VaultSession:
+    """Loads the key once and holds a single Fernet cipher while the vault is unlocked.
+
+    The key is read on first use and forgotten after idle_timeout seconds
+    without an encrypt/decrypt call (None keeps it until lock()). A single
+    background timer checks the idle time, so each operation only records
+    a timestamp.
+    """
+
+    def __init__(self, key_file=KEY_FILE, idle_timeout=IDLE_TIMEOUT):
+        self.key_file = key_file
+        self.idle_timeout = idle_timeout
+        self._fernet = None
+        self._last_used = 0.0
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self.unlock()
+        return self
+
+    def __exit__(self, *exc):
+        self.lock()
+
+    @property
+    def unlocked(self):
+        """True while the key is held in memory."""
+        return self._fernet is not None
+
+    def unlock(self):
+        """Load the key and build the cipher (no-op if already unlocked); returns the cipher."""
+        with self._lock:
+            if self._fernet is None:
+                self._fernet = Fernet(load_key(self.key_file))
+                self._schedule(self.idle_timeout)
+            self._last_used = time.monotonic()
+            return self._fernet
+
+    def lock(self):
+        """Forget the key and cipher."""
+        with self._lock:
+            self._fernet = None
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def _schedule(self, delay):
+        if self.idle_timeout is not None:
+            self._timer = threading.Timer(delay, self._check_idle)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _check_idle(self):
+        """Timer callback: lock if idle long enough, otherwise check again later."""
+        with self._lock:
+            if self._fernet is None:
+                return
+            remaining = self._last_used + self.idle_timeout - time.monotonic()
+            if remaining > 0:
+                self._schedule(remaining)
+                return
+            self._fernet = None
+            self._timer = None
+
+    def _cipher(self):
+        fernet = self._fernet
+        if fernet is None:
+            # Use the cipher unlock() returns: the idle timer may lock again
+            # as soon as it releases the lock
+            fernet = self.unlock()
+        else:
+            self._last_used = time.monotonic()
+        return fernet
+
+    def encrypt(self, password):
+        """Encrypts one password."""
+        return self._cipher().encrypt(password.encode()).decode()
+
+    def decrypt(self, encrypted_password):
+        """Decrypts one password."""
+        return self._cipher().decrypt(encrypted_password.encode()).decode()
+
+    def encrypt_many(self, passwords):
+        """Encrypts a sequence of passwords with the same cipher; returns a list."""
+        fernet = self._cipher()
+        return [fernet.encrypt(password.encode()).decode() for password in passwords]
+
+    def decrypt_many(self, encrypted_passwords):
+        """Decrypts a sequence of passwords with the same cipher; returns a list."""
+        fernet = self._cipher()
+        return [fernet.decrypt(token.encode()).decode() for token in encrypted_passwords]
+
+# Shared session used by the menu functions
+def get_session():
+    """Returns the module's VaultSession, creating it on first use."""
+    global _session
+    if _session is None:
+        _session = VaultSession()
+    return _session
+
+# Open the vault database (created on first use)
+def get_vault(path=VAULT_FILE, json_file=PASSWORD_FILE):
+    """Returns the shared SQLite connection to the vault at path, migrating json_file on first use.
+
+    Services live in a table keyed by name (a B-tree), so single-entry reads
+    and writes are O(log n). The database runs in WAL mode with full syncs:
+    every change is its own transaction and survives a crash either
+    completely or not at all.
+    """
+    conn = _vaults.get(path)
+    if conn is None:
+        conn = sqlite3.connect(path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=FULL")
+        conn.execute("""CREATE TABLE IF NOT EXISTS services (
+                            name TEXT PRIMARY KEY,
+                            username TEXT NOT NULL DEFAULT '',
+                            password TEXT NOT NULL DEFAULT ''
+                        ) WITHOUT ROWID""")
+        conn.commit()
+        if os.path.exists(json_file):
+            migrate_json(conn, json_file)
+        _vaults[path] = conn
+    return conn
+
+# Import entries from the old JSON file
+def migrate_json(conn, path):
+    """Copies entries from a passwords.json file into the vault and keeps the file as a .bak backup.
+
+    Entries already in the vault are left untouched.
+    """
+    with open(path, "r") as file:
+        passwords = json.load(file)
+    with conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO services (name, username, password) VALUES (?, ?, ?)",
+            ((service, entry.get("username", ""), entry.get("password", ""))
+             for service, entry in passwords.items()))
+    os.replace(path, path + ".bak")
+    print(f"📦 Migrated {len(passwords)} services from {path} to the vault")
+
+# Check whether a service exists
+def service_exists(service):
+    """Returns True if the service is stored in the vault."""
+    row = get_vault().execute("SELECT 1 FROM services WHERE name = ?", (service,)).fetchone()
+    return row is not None
+
 # Load stored passwords
 def load_passwords():
-    """Loads saved passwords from the JSON file. Returns an empty dictionary if file does not exist."""
-    if os.path.exists(PASSWORD_FILE):
-        with open(PASSWORD_FILE, "r") as file:
-            return json.load(file)
-    return {}
+    """Loads all saved entries from the vault as a dictionary (service -> username/password)."""
+    rows = get_vault().execute("SELECT name, username, password FROM services ORDER BY name")
+    return {name: {"username": username, "password": password} for name, username, password in rows}
 
 # Save updated password data
 def save_passwords(passwords):
-    """Saves password data to the JSON file in a readable format."""
-    with open(PASSWORD_FILE, "w") as file:
-        json.dump(passwords, file, indent=4)
+    """Replaces the vault contents with the given dictionary in one transaction."""
+    conn = get_vault()
+    with conn:
+        conn.execute("DELETE FROM services")
+        conn.executemany(
+            "INSERT INTO services (name, username, password) VALUES (?, ?, ?)",
+            ((service, entry["username"], entry["password"]) for service, entry in passwords.items()))
 
 # Add a new service without a password
 def add_service(service):
     """Adds a new service entry without a password."""
-    passwords = load_passwords()
-    if service in passwords:
-        print("⚠️ Service already exists.")
-    else:
-        passwords[service] = {"username": "", "password": ""}
-        save_passwords(passwords)
+    conn = get_vault()
+    with conn:
+        added = conn.execute("INSERT OR IGNORE INTO services (name) VALUES (?)", (service,)).rowcount
+    if added:
         print(f"✅ Service '{service}' added successfully!")
+    else:
+        print("⚠️ Service already exists.")
 
 # Remove a service completely
 def remove_service(service):
     """Removes a service and its associated credentials from storage."""
-    passwords = load_passwords()
-    if service in passwords:
-        del passwords[service]
-        save_passwords(passwords)
+    conn = get_vault()
+    with conn:
+        removed = conn.execute("DELETE FROM services WHERE name = ?", (service,)).rowcount
+    if removed:
         print(f"🗑️ Service '{service}' removed successfully.")
     else:
         print("❌ Service not found.")
@@ -69,28 +232,37 @@ def remove_service(service):
 # Save or update password
 def save_password(service, username, password):
     """Saves or updates a password for a given service."""
-    key = load_key()
-    passwords = load_passwords()
+    conn = get_vault()
+    with conn:
+        conn.execute(UPSERT_SQL, (service, username, get_session().encrypt(password)))
+    print(f"✅ Password saved for {service}!")
 
-    passwords[service] = {
-        "username": username,
-        "password": encrypt_password(password, key)
-    }
+# Save or update many passwords at once
+def save_many_passwords(entries):
+    """Saves or updates (service, username, password) entries in one transaction.
 
-    save_passwords(passwords)
-    print(f"✅ Password saved for {service}!")
+    Passwords are encrypted in bulk with the session cipher, so scripted
+    rotations over thousands of services avoid per-entry key reads and
+    cipher setup. Returns the number of entries saved.
+    """
+    entries = list(entries)
+    encrypted = get_session().encrypt_many(password for _, _, password in entries)
+    conn = get_vault()
+    with conn:
+        conn.executemany(UPSERT_SQL, ((service, username, token) for (service, username, _), token
+                                      in zip(entries, encrypted)))
+    return len(entries)
 
 # Retrieve password
 def get_password(service):
     """Retrieves and decrypts the password for a given service."""
-    key = load_key()
-    passwords = load_passwords()
+    row = get_vault().execute(
+        "SELECT username, password FROM services WHERE name = ?", (service,)).fetchone()
 
-    if service in passwords:
-        username = passwords[service]["username"]
-        encrypted_password = passwords[service]["password"]
+    if row:
+        username, encrypted_password = row
         if encrypted_password:
-            decrypted_password = decrypt_password(encrypted_password, key)
+            decrypted_password = get_session().decrypt(encrypted_password)
             print(f"🔑 Service: {service}\n👤 Username: {username}\n🔒 Password: {decrypted_password}")
         else:
             print(f"🔹 Service '{service}' exists but no password is saved.")
@@ -100,10 +272,12 @@ def get_password(service):
 # List all saved services
 def list_services():
     """Lists all saved services in the password manager."""
-    passwords = load_passwords()
-    if passwords:
+    services = get_vault().execute("SELECT name FROM services ORDER BY name")
+    first = services.fetchone()
+    if first:
         print("\n🔹 Saved Services:")
-        for service in passwords.keys():
+        print(f"- {first[0]}")
+        for (service,) in services:
             print(f"- {service}")
     else:
         print("❌ No saved services yet.")
@@ -132,7 +306,7 @@ def main():
             remove_service(service)
         elif choice == "3":
             service = input("Enter service name: ").strip()
-            if service in load_passwords():
+            if service_exists(service):
                 username = input("Enter username/email: ").strip()
                 password = input("Enter password: ").strip()
                 if username and password:
@@ -4,63 +4,243 @@ Multi-Dimensional Shape Analyzer with AI
 Advanced shape detection and visualization system supporting 2D, 3D, and 4D shapes.
 Features:
 - AI-powered shape prediction using KNN classifier
+- Batch prediction API with a precomputed, disk-cached lookup table
+- Lazy loading of matplotlib and scikit-learn for fast start-up
 - Rule-based shape detection with extensive shape database
+- Memory-mapped catalog of uniform polytopes (Archimedean solids, prisms,
+  antiprisms and all six regular 4-polytopes)
 - Interactive visualizations for 2D polygons and 3D polyhedra
 - 4D shape projections (tesseract, hypersphere)
+- n-cube, n-simplex and n-orthoplex projections in any dimension
 - Shape properties calculation (area, perimeter, volume, surface area)
+- Vectorized property tables for millions of shapes (tabulate_properties)
 - Color-coded visualizations with rotation capabilities
+- Real-time animated rotation with blitting and GIF/video export
+- Headless batch rendering to PNG/SVG across a process pool
 
 Author: Enhanced Version
 Date: November 2025
 """
 
-import matplotlib.pyplot as plt
+import hashlib
+import io
+import json
+import os
+import time
 import numpy as np
-from sklearn.neighbors import KNeighborsClassifier
-from mpl_toolkits.mplot3d.art3d import Poly3DCollection
-from typing import Tuple, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Iterable, List, Mapping, Tuple, Optional, Union, TYPE_CHECKING
 import warnings
 warnings.filterwarnings('ignore')
 
+from poly_dim_catalog import ShapeCatalog
+from poly_dim_polytopes import (polytope, rotation_planes, rotation_matrices,
+                                project, project_frames, edge_segments)
+
+if TYPE_CHECKING:
+    from sklearn.neighbors import KNeighborsClassifier
+
+# matplotlib and scikit-learn are imported on first use so that callers who
+# only need ShapeDetector do not pay for them at import time.
+plt = None
+Poly3DCollection = None
+
+# On-disk cache for the precomputed prediction lookup table
+CACHE_DIR = os.environ.get(
+    "POLY_DIM_AI_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "poly_dim_ai"))
+DEFAULT_LOOKUP_MAX_SIDES = 1000
+
+
+def _load_plotting() -> None:
+    """Import matplotlib and the 3D toolkit on first use."""
+    global plt, Poly3DCollection
+    if plt is None:
+        import matplotlib.pyplot as pyplot
+        from mpl_toolkits.mplot3d.art3d import Poly3DCollection as Poly3D
+        plt, Poly3DCollection = pyplot, Poly3D
+
+
 # AI Model Trainer
 class AIPredictor:
     """Enhanced AI predictor with expanded training dataset."""
-    
-    def __init__(self):
-        self.model = self.train_model()
+
+    # Expanded training data: [sides, dimension] -> shape_name
+    TRAINING_X: Tuple[Tuple[int, int], ...] = (
+        # 2D shapes (dimension = 2)
+        (3, 2), (4, 2), (5, 2), (6, 2), (7, 2), (8, 2), (9, 2), (10, 2), (12, 2), (20, 2),
+        # 3D shapes (dimension = 3)
+        (3, 3), (4, 3), (5, 3), (6, 3), (8, 3), (12, 3), (20, 3),
+        # 4D shapes (dimension = 4)
+        (3, 4), (4, 4), (5, 4), (6, 4), (8, 4), (16, 4), (24, 4)
+    )
+    TRAINING_Y: Tuple[str, ...] = (
+        # 2D shapes
+        "Triangle", "Quadrilateral", "Pentagon", "Hexagon", "Heptagon",
+        "Octagon", "Nonagon", "Decagon", "Dodecagon", "Icosagon",
+        # 3D shapes
+        "Tetrahedron", "Cube/Hexahedron", "Pentagonal Prism", "Hexagonal Prism",
+        "Octahedron", "Dodecahedron", "Icosahedron",
+        # 4D shapes
+        "5-cell (4-simplex)", "Tesseract (8-cell)", "Penteract (5-cube)",
+        "Hexeract (6-cube)", "Octacross (16-cell)", "Hexadecachoron", "24-cell"
+    )
+    N_NEIGHBORS = 1
+
+    # Dimensions covered by the dense lookup table (row = dimension - 2)
+    LOOKUP_DIMENSIONS: Tuple[int, ...] = (2, 3, 4)
+
+    def __init__(self, lookup_max_sides: Optional[int] = DEFAULT_LOOKUP_MAX_SIDES,
+                 use_cache: bool = True, cache_dir: Optional[str] = None):
+        """
+        Args:
+            lookup_max_sides: Largest side count stored in the lookup table,
+                or None to always query the KNN model
+            use_cache: Load/save the lookup table from the on-disk cache
+            cache_dir: Cache directory (defaults to CACHE_DIR)
+        """
+        self._model = None
+        self._classes: Optional[np.ndarray] = None
+        self.use_cache = use_cache
+        self.cache_dir = cache_dir or CACHE_DIR
         self.accuracy = self._calculate_accuracy()
+        self.lookup_table: Optional[np.ndarray] = None
+        if lookup_max_sides is not None:
+            if not (use_cache and self._load_cached_table(lookup_max_sides)):
+                self.build_lookup_table(lookup_max_sides)
 
-    def train_model(self) -> KNeighborsClassifier:
+    @property
+    def model(self) -> "KNeighborsClassifier":
+        """The fitted KNN model, trained on first access."""
+        if self._model is None:
+            self._model = self.train_model()
+        return self._model
+
+    @property
+    def classes_(self) -> np.ndarray:
+        """Sorted shape labels; lookup table entries index into this array."""
+        if self._classes is None:
+            self._classes = self.model.classes_
+        return self._classes
+
+    def train_model(self) -> "KNeighborsClassifier":
         """Train KNN model with comprehensive shape dataset."""
-        # Expanded training data: [sides, dimension] -> shape_name
-        X = [
-            # 2D shapes (dimension = 2)
-            [3, 2], [4, 2], [5, 2], [6, 2], [7, 2], [8, 2], [9, 2], [10, 2], [12, 2], [20, 2],
-            # 3D shapes (dimension = 3)
-            [3, 3], [4, 3], [5, 3], [6, 3], [8, 3], [12, 3], [20, 3],
-            # 4D shapes (dimension = 4)
-            [3, 4], [4, 4], [5, 4], [6, 4], [8, 4], [16, 4], [24, 4]
-        ]
-        y = [
-            # 2D shapes
-            "Triangle", "Quadrilateral", "Pentagon", "Hexagon", "Heptagon", 
-            "Octagon", "Nonagon", "Decagon", "Dodecagon", "Icosagon",
-            # 3D shapes
-            "Tetrahedron", "Cube/Hexahedron", "Pentagonal Prism", "Hexagonal Prism",
-            "Octahedron", "Dodecahedron", "Icosahedron",
-            # 4D shapes
-            "5-cell (4-simplex)", "Tesseract (8-cell)", "Penteract (5-cube)", 
-            "Hexeract (6-cube)", "Octacross (16-cell)", "Hexadecachoron", "24-cell"
-        ]
-        model = KNeighborsClassifier(n_neighbors=1, weights='uniform')
-        model.fit(X, y)
+        from sklearn.neighbors import KNeighborsClassifier
+
+        model = KNeighborsClassifier(n_neighbors=self.N_NEIGHBORS, weights='uniform')
+        model.fit([list(row) for row in self.TRAINING_X], list(self.TRAINING_Y))
         return model
 
+    @classmethod
+    def training_data_hash(cls) -> str:
+        """Stable hash of the training data and model settings (cache key)."""
+        payload = json.dumps([cls.TRAINING_X, cls.TRAINING_Y, cls.N_NEIGHBORS,
+                              cls.LOOKUP_DIMENSIONS])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _cache_path(self, max_sides: int) -> str:
+        """Path of the cached lookup table for the given side bound."""
+        name = f"lookup-{self.training_data_hash()[:16]}-{max_sides}.npz"
+        return os.path.join(self.cache_dir, name)
+
+    def _load_cached_table(self, max_sides: int) -> bool:
+        """Load a cached lookup table. Returns True on success."""
+        path = self._cache_path(max_sides)
+        if not os.path.exists(path):
+            return False
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                table, classes = data["table"], data["classes"]
+        except (OSError, KeyError, ValueError):
+            return False
+        if table.shape != (len(self.LOOKUP_DIMENSIONS), max_sides + 1):
+            return False
+        self.lookup_table, self._classes = table, classes
+        return True
+
+    def _save_cached_table(self, max_sides: int) -> None:
+        """Persist the lookup table; cache failures are not fatal."""
+        path = self._cache_path(max_sides)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                np.savez(f, table=self.lookup_table, classes=self.classes_)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def build_lookup_table(self, max_sides: int = 1000) -> np.ndarray:
+        """
+        Precompute predictions for every integer (sides, dimension) pair with
+        dimension 2-4 and 0 <= sides <= max_sides.
+
+        The table stores indices into ``classes_`` so that repeated
+        queries become a single array lookup instead of a KNN call.
+        """
+        if max_sides < 0:
+            raise ValueError("max_sides must be non-negative")
+        dims = np.asarray(self.LOOKUP_DIMENSIONS)
+        sides = np.arange(max_sides + 1)
+        grid = np.column_stack((np.tile(sides, dims.size), np.repeat(dims, sides.size)))
+        codes = self._encode_labels(self.model.predict(grid))
+        self.lookup_table = codes.reshape(dims.size, sides.size)
+        if self.use_cache:
+            self._save_cached_table(max_sides)
+        return self.lookup_table
+
+    def _encode_labels(self, labels: np.ndarray) -> np.ndarray:
+        """Map predicted label strings to their index in ``classes_``."""
+        return np.searchsorted(self.classes_, labels).astype(np.int16)
+
+    def _lookup_mask(self, sides: np.ndarray, dims: np.ndarray) -> np.ndarray:
+        """Return a mask of the rows that fall inside the lookup table domain."""
+        if self.lookup_table is None:
+            return np.zeros(sides.shape, dtype=bool)
+        n_dims, n_sides = self.lookup_table.shape
+        first_dim = self.LOOKUP_DIMENSIONS[0]
+        mask = ((sides >= 0) & (sides < n_sides) &
+                (dims >= first_dim) & (dims < first_dim + n_dims))
+        if not np.issubdtype(sides.dtype, np.integer):
+            mask &= (sides == np.floor(sides)) & (dims == np.floor(dims))
+        return mask
+
+    def predict_many(self, pairs) -> np.ndarray:
+        """
+        Predict shape names for an array of (sides, dimension) pairs.
+
+        Args:
+            pairs: Array-like of shape (n, 2) holding [sides, dimension] rows
+
+        Returns:
+            NumPy array of n shape names
+        """
+        X = np.asarray(pairs)
+        if X.ndim == 1 and X.size == 2:
+            X = X.reshape(1, 2)
+        if X.ndim != 2 or X.shape[1] != 2:
+            raise ValueError(f"Expected an array of shape (n, 2), got {X.shape}")
+        if not np.issubdtype(X.dtype, np.number):
+            raise ValueError("Sides and dimension must be numeric")
+
+        sides, dims = X[:, 0], X[:, 1]
+        codes = np.empty(len(X), dtype=np.int16)
+        mask = self._lookup_mask(sides, dims)
+        if mask.any():
+            first_dim = self.LOOKUP_DIMENSIONS[0]
+            codes[mask] = self.lookup_table[dims[mask].astype(np.intp) - first_dim,
+                                            sides[mask].astype(np.intp)]
+        if not mask.all():
+            codes[~mask] = self._encode_labels(self.model.predict(X[~mask]))
+        return self.classes_[codes]
+
     def predict(self, sides: int, dimension: int) -> str:
         """Predict shape name based on sides and dimension."""
         try:
-            prediction = self.model.predict([[sides, dimension]])[0]
-            return prediction
+            prediction = self.predict_many([[sides, dimension]])[0]
+            return str(prediction)
         except Exception as e:
             return f"Unknown Shape (Error: {str(e)})"
     
@@ -69,17 +249,220 @@ class AIPredictor:
         return 100.0  # KNN with k=1 has 100% accuracy on training data
 
 
+# Shape name databases (read-only, shared by every ShapeDetector)
+SHAPES_2D = MappingProxyType({
+    3: "Triangle (Trigon)", 
+    4: "Quadrilateral (Tetragon)", 
+    5: "Pentagon",
+    6: "Hexagon", 
+    7: "Heptagon (Septagon)", 
+    8: "Octagon", 
+    9: "Nonagon (Enneagon)", 
+    10: "Decagon",
+    11: "Hendecagon",
+    12: "Dodecagon",
+    15: "Pentadecagon",
+    20: "Icosagon",
+    100: "Hectogon",
+    1000: "Chiliagon"
+})
+
+# Platonic & Archimedean solids
+SHAPES_3D = MappingProxyType({
+    4: "Tetrahedron (4 faces)",
+    6: "Cube/Hexahedron (6 faces)",
+    8: "Octahedron (8 faces)",
+    12: "Dodecahedron (12 faces)",
+    20: "Icosahedron (20 faces)",
+    # Prisms
+    5: "Pentagonal Prism",
+    7: "Heptagonal Prism",
+    10: "Decagonal Prism"
+})
+
+SHAPES_4D = MappingProxyType({
+    5: "5-cell (4-simplex/Pentachoron)",
+    8: "Tesseract (8-cell/Hypercube)",
+    16: "16-cell (Hexadecachoron/Orthoplex)",
+    24: "24-cell (Icositetrachoron)",
+    120: "120-cell (Hecatonicosachoron)",
+    600: "600-cell (Hexacosichoron)"
+})
+
+# Number of (sides, dimension, edge_length) results kept by detect_shape
+DETECTION_CACHE_SIZE = 512
+
+# Structured array layouts returned by tabulate_properties, one per dimension.
+# Field names match the keys of ShapeDetector.properties.
+PROPERTY_DTYPES = {
+    2: np.dtype([('sides', np.int64), ('interior_angle', np.float64),
+                 ('perimeter', np.float64), ('area', np.float64),
+                 ('circumradius', np.float64)]),
+    3: np.dtype([('faces', np.int64), ('vertices', np.int64), ('edges', np.int64),
+                 ('volume', np.float64), ('surface_area', np.float64)]),
+    4: np.dtype([('cells', np.int64), ('faces', np.int64), ('edges', np.int64),
+                 ('vertices', np.int64), ('hypervolume', np.float64)]),
+}
+
+
+# Rounding applied by ShapeDetector when it reports properties
+DISPLAY_DECIMALS = MappingProxyType({
+    'interior_angle': 2, 'perimeter': 2, 'area': 4, 'circumradius': 4,
+    'volume': 4, 'surface_area': 4, 'hypervolume': 4,
+})
+
+
+@lru_cache(maxsize=None)
+def get_catalog() -> ShapeCatalog:
+    """The uniform polytope catalog, memory-mapped from the cache once per process."""
+    return ShapeCatalog.load(CACHE_DIR)
+
+
+def _describes(label: Optional[str], name: str) -> bool:
+    """Whether a SHAPES_3D/SHAPES_4D label names this catalog shape."""
+    return label is not None and name.lower() in label.lower()
+
+
+@lru_cache(maxsize=None)
+def _catalog_index(dimension: int) -> np.ndarray:
+    """
+    Dense array mapping a face (3D) or cell (4D) count to a catalog row.
+
+    Only shapes with exactly that count are considered; among several, the
+    one named in SHAPES_3D/SHAPES_4D wins, otherwise the first in the
+    catalog. Unknown counts map to -1.
+    """
+    catalog = get_catalog()
+    labels = SHAPES_3D if dimension == 3 else SHAPES_4D
+    table = catalog.table[catalog.table['dimension'] == dimension]
+    largest = int(table['cells' if dimension == 4 else 'faces'].max())
+    index = np.full(largest + 1, -1, dtype=np.int64)
+    for count in range(largest + 1):
+        rows = catalog.rows_by_count(dimension, count)
+        if rows:
+            named = [row for row in rows
+                     if _describes(labels.get(count), str(catalog.table['name'][row]))]
+            index[count] = named[0] if named else rows[0]
+    return index
+
+
+@lru_cache(maxsize=None)
+def _catalog_values(dimension: int) -> np.ndarray:
+    """
+    Numeric catalog columns read by tabulate_properties, plus a final
+    all-zero record so row -1 selects zeros.
+    """
+    table = get_catalog().table
+    fields = [name for name in PROPERTY_DTYPES[dimension].names if name in table.dtype.names]
+    values = np.zeros(len(table) + 1, dtype=[(name, table.dtype[name]) for name in fields])
+    for name in fields:
+        values[name][:-1] = table[name]
+    return values
+
+
+def _catalog_rows(dimension: int, counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Look up catalog rows for an array of counts.
+
+    Returns:
+        (row indices with -1 for unknown shapes, matching numeric records
+        with all-zero values for unknown shapes)
+    """
+    index = _catalog_index(dimension)
+    in_range = (counts >= 0) & (counts < len(index))
+    rows = np.where(in_range, index[np.where(in_range, counts, 0)], -1)
+    return rows, _catalog_values(dimension)[rows]
+
+
+def tabulate_properties(sides, dimension: int, side_length=1.0,
+                        decimals: Union[int, Mapping[str, int], None] = None,
+                        as_dataframe: bool = False):
+    """
+    Calculate shape properties for many shapes in one vectorized pass.
+
+    Args:
+        sides: Array-like of side (2D), face (3D) or cell (4D) counts
+        dimension: 2, 3 or 4
+        side_length: Scalar or array of side/edge lengths (broadcast to sides)
+        decimals: Round floating-point columns to this many places, or per
+            column with a mapping (DISPLAY_DECIMALS matches ShapeDetector)
+        as_dataframe: Return a pandas DataFrame instead of a structured array
+
+    Returns:
+        Structured NumPy array (see PROPERTY_DTYPES) or pandas DataFrame.
+        2D polygons with fewer than 3 sides get NaN properties; unknown 3D/4D
+        shapes get zeros, matching ShapeDetector.
+    """
+    if dimension not in PROPERTY_DTYPES:
+        raise ValueError(f"Dimension must be 2, 3 or 4, got {dimension}")
+    counts = np.asarray(sides, dtype=np.int64).ravel()
+    length = np.broadcast_to(np.asarray(side_length, dtype=np.float64), counts.shape)
+    out = np.empty(counts.shape, dtype=PROPERTY_DTYPES[dimension])
+
+    if dimension == 2:
+        n = counts.astype(np.float64)
+        n[counts < 3] = np.nan
+        half_angle = np.pi / n
+        out['sides'] = counts
+        out['interior_angle'] = (n - 2) * 180 / n
+        out['perimeter'] = n * length
+        out['area'] = n * length**2 / (4 * np.tan(half_angle))
+        out['circumradius'] = length / (2 * np.sin(half_angle))
+    elif dimension == 3:
+        rows, records = _catalog_rows(3, counts)
+        out['faces'] = counts
+        out['vertices'] = records['vertices']
+        out['edges'] = records['edges']
+        out['volume'] = records['volume'] * length**3
+        out['surface_area'] = records['surface_area'] * length**2
+    else:
+        rows, records = _catalog_rows(4, counts)
+        out['cells'] = counts
+        out['faces'] = records['faces']
+        out['edges'] = records['edges']
+        out['vertices'] = records['vertices']
+        out['hypervolume'] = records['hypervolume'] * length**4
+
+    if decimals is not None:
+        for name in out.dtype.names:
+            places = decimals.get(name) if isinstance(decimals, Mapping) else decimals
+            if places is not None and out.dtype[name].kind == 'f':
+                np.round(out[name], places, out=out[name])
+    if as_dataframe:
+        import pandas as pd
+        return pd.DataFrame(out)
+    return out
+
+
 # Shape Detector
 class ShapeDetector:
     """Enhanced shape detector with comprehensive shape database and properties."""
     
-    def __init__(self, sides: int, dimension: int):
+    def __init__(self, sides: int, dimension: int, edge_length: float = 1.0):
         self.sides = sides
         self.dimension = dimension
+        self.edge_length = edge_length
         self.shape_name = ""
         self.properties = {}
 
     def detect_shape(self) -> str:
+        """Detect shape and its properties, reusing cached results when possible."""
+        shape, properties = _cached_detection(self.sides, self.dimension, self.edge_length)
+        self.shape_name = shape
+        self.properties = dict(properties)
+        return shape
+
+    @staticmethod
+    def cache_info():
+        """Hit/miss counters and size of the detection cache."""
+        return _cached_detection.cache_info()
+
+    @staticmethod
+    def cache_clear() -> None:
+        """Empty the detection cache and reset its counters."""
+        _cached_detection.cache_clear()
+
+    def _detect_uncached(self) -> str:
         """Detect shape based on dimension and calculate properties."""
         if self.dimension == 2:
             shape = self.get_2d_shape()
@@ -97,55 +480,35 @@ class ShapeDetector:
 
     def get_2d_shape(self) -> str:
         """Comprehensive 2D shape database."""
-        shape_dict = {
-            3: "Triangle (Trigon)", 
-            4: "Quadrilateral (Tetragon)", 
-            5: "Pentagon",
-            6: "Hexagon", 
-            7: "Heptagon (Septagon)", 
-            8: "Octagon", 
-            9: "Nonagon (Enneagon)", 
-            10: "Decagon",
-            11: "Hendecagon",
-            12: "Dodecagon",
-            15: "Pentadecagon",
-            20: "Icosagon",
-            100: "Hectogon",
-            1000: "Chiliagon"
-        }
-        return shape_dict.get(self.sides, f"{self.sides}-gon (Regular Polygon)")
+        return SHAPES_2D.get(self.sides, f"{self.sides}-gon (Regular Polygon)")
 
     def get_3d_shape(self) -> str:
-        """Comprehensive 3D shape database (Platonic & Archimedean solids)."""
-        shape_dict = {
-            4: "Tetrahedron (4 faces)",
-            6: "Cube/Hexahedron (6 faces)",
-            8: "Octahedron (8 faces)",
-            12: "Dodecahedron (12 faces)",
-            20: "Icosahedron (20 faces)",
-            # Prisms
-            5: "Pentagonal Prism",
-            7: "Heptagonal Prism",
-            10: "Decagonal Prism"
-        }
-        return shape_dict.get(self.sides, f"{self.sides}-faced Polyhedron")
+        """Comprehensive 3D shape database (Platonic & Archimedean solids, prisms)."""
+        return self._catalog_name(SHAPES_3D, f"{self.sides}-faced Polyhedron")
 
     def get_4d_shape(self) -> str:
         """4D polytope database."""
-        shape_dict = {
-            5: "5-cell (4-simplex/Pentachoron)",
-            8: "Tesseract (8-cell/Hypercube)",
-            16: "16-cell (Hexadecachoron/Orthoplex)",
-            24: "24-cell (Icositetrachoron)",
-            120: "120-cell (Hecatonicosachoron)",
-            600: "600-cell (Hexacosichoron)"
-        }
-        return shape_dict.get(self.sides, f"{self.sides}-cell Polytope")
+        return self._catalog_name(SHAPES_4D, f"{self.sides}-cell Polytope")
+
+    def _catalog_name(self, labels: Mapping[int, str], default: str) -> str:
+        """Name of the catalog shape with this count, using the fuller label when it matches."""
+        entry = self._catalog_entry()
+        label = labels.get(self.sides)
+        if entry is None:
+            return label or default
+        return label if _describes(label, entry['name']) else entry['name']
+
+    def _catalog_entry(self) -> Optional[dict]:
+        """Catalog entry for this face (3D) or cell (4D) count, if any."""
+        index = _catalog_index(self.dimension)
+        if not 0 <= self.sides < len(index) or index[self.sides] < 0:
+            return None
+        return get_catalog().entry(int(index[self.sides]))
     
     def calculate_2d_properties(self) -> None:
         """Calculate properties for regular 2D polygons."""
         n = self.sides
-        side_length = 1.0  # Assume unit side length
+        side_length = self.edge_length
         
         # Interior angle
         interior_angle = ((n - 2) * 180) / n
@@ -168,71 +531,51 @@ class ShapeDetector:
         }
     
     def calculate_3d_properties(self) -> None:
-        """Calculate properties for 3D shapes."""
+        """Calculate properties for 3D shapes from the polytope catalog."""
         faces = self.sides
-        edge_length = 1.0
-        
-        # Calculate based on known Platonic solids
-        if faces == 4:  # Tetrahedron
-            volume = (edge_length**3) / (6 * np.sqrt(2))
-            surface_area = np.sqrt(3) * edge_length**2
-            vertices, edges = 4, 6
-        elif faces == 6:  # Cube
-            volume = edge_length**3
-            surface_area = 6 * edge_length**2
-            vertices, edges = 8, 12
-        elif faces == 8:  # Octahedron
-            volume = (np.sqrt(2) / 3) * edge_length**3
-            surface_area = 2 * np.sqrt(3) * edge_length**2
-            vertices, edges = 6, 12
-        elif faces == 12:  # Dodecahedron
-            volume = ((15 + 7*np.sqrt(5)) / 4) * edge_length**3
-            surface_area = 3 * np.sqrt(25 + 10*np.sqrt(5)) * edge_length**2
-            vertices, edges = 20, 30
-        elif faces == 20:  # Icosahedron
-            volume = (5 * (3 + np.sqrt(5)) / 12) * edge_length**3
-            surface_area = 5 * np.sqrt(3) * edge_length**2
-            vertices, edges = 12, 30
-        else:
-            volume, surface_area = 0, 0
-            vertices, edges = 0, 0
+        edge_length = self.edge_length
+
+        # Unknown shapes report zeros
+        entry = self._catalog_entry() or {'faces': faces, 'vertices': 0, 'edges': 0,
+                                          'volume': 0.0, 'surface_area': 0.0}
         
         self.properties = {
             'faces': faces,
-            'vertices': vertices,
-            'edges': edges,
-            'volume': round(volume, 4),
-            'surface_area': round(surface_area, 4)
+            'vertices': entry['vertices'],
+            'edges': entry['edges'],
+            'volume': round(entry['volume'] * edge_length**3, 4),
+            'surface_area': round(entry['surface_area'] * edge_length**2, 4)
         }
     
     def calculate_4d_properties(self) -> None:
-        """Calculate properties for 4D polytopes."""
+        """Calculate properties for 4D polytopes from the polytope catalog."""
         cells = self.sides
-        
-        if cells == 5:  # 5-cell
-            vertices, edges, faces = 5, 10, 10
-        elif cells == 8:  # Tesseract
-            vertices, edges, faces = 16, 32, 24
-        elif cells == 16:  # 16-cell
-            vertices, edges, faces = 8, 24, 32
-        elif cells == 24:  # 24-cell
-            vertices, edges, faces = 24, 96, 96
-        else:
-            vertices, edges, faces = 0, 0, 0
+        entry = self._catalog_entry() or {'faces': 0, 'edges': 0, 'vertices': 0,
+                                          'hypervolume': 0.0}
         
         self.properties = {
             'cells': cells,
-            'faces': faces,
-            'edges': edges,
-            'vertices': vertices
+            'faces': entry['faces'],
+            'edges': entry['edges'],
+            'vertices': entry['vertices'],
+            'hypervolume': round(entry['hypervolume'] * self.edge_length**4, 4)
         }
 
 
+@lru_cache(maxsize=DETECTION_CACHE_SIZE)
+def _cached_detection(sides: int, dimension: int, edge_length: float) -> Tuple[str, tuple]:
+    """Thread-safe LRU cache of (sides, dimension, edge_length) -> (name, properties)."""
+    detector = ShapeDetector(sides, dimension, edge_length)
+    shape = detector._detect_uncached()
+    return shape, tuple(detector.properties.items())
+
+
 # Visualization Class
 class ShapeVisualizer:
     """Enhanced visualization engine for 2D, 3D, and 4D shapes."""
     
     def __init__(self):
+        _load_plotting()
         self.colors = plt.cm.viridis(np.linspace(0, 1, 10))
     
     def draw_2d_polygon(self, n: int, properties: dict = None) -> None:
@@ -242,7 +585,12 @@ class ShapeVisualizer:
             return
         
         fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
-        
+        self._plot_2d_polygon(ax1, ax2, n, properties)
+        plt.tight_layout()
+        plt.show()
+
+    def _plot_2d_polygon(self, ax1, ax2, n: int, properties: dict = None) -> None:
+        """Draw a 2D polygon on ax1 and its properties panel on ax2."""
         # Main polygon visualization
         theta = np.linspace(0, 2 * np.pi, n, endpoint=False)
         x, y = np.cos(theta), np.sin(theta)
@@ -281,15 +629,16 @@ class ShapeVisualizer:
             
             ax2.text(0.1, 0.5, props_text, fontsize=12, verticalalignment='center',
                     family='monospace', bbox=dict(boxstyle='round', facecolor='lightblue', alpha=0.8))
-        
-        plt.tight_layout()
-        plt.show()
 
     def draw_3d_shape(self, faces: int) -> None:
         """Draw 3D polyhedra with enhanced visualization."""
         fig = plt.figure(figsize=(12, 10))
         ax = fig.add_subplot(111, projection='3d')
-        
+        self._plot_3d_shape(ax, faces)
+        plt.show()
+
+    def _plot_3d_shape(self, ax, faces: int) -> None:
+        """Draw a 3D polyhedron on a 3D axes."""
         if faces == 4:  # Tetrahedron
             self._draw_tetrahedron(ax)
             title = "Tetrahedron (4 faces)"
@@ -313,8 +662,6 @@ class ShapeVisualizer:
         ax.set_xlim([-max_range, max_range])
         ax.set_ylim([-max_range, max_range])
         ax.set_zlim([-max_range, max_range])
-        
-        plt.show()
     
     def _draw_tetrahedron(self, ax) -> None:
         """Draw a tetrahedron."""
@@ -395,7 +742,16 @@ class ShapeVisualizer:
         """Draw 3D projection of 4D shapes."""
         fig = plt.figure(figsize=(12, 10))
         ax = fig.add_subplot(111, projection='3d')
+        self._plot_4d_projection(ax, cells)
+        
+        print(f"\n🌌 4D Visualization Note:")
+        print(f"This is a 3D projection of a {cells}-cell 4D polytope.")
+        print(f"True 4D geometry cannot be fully represented in 3D space.")
         
+        plt.show()
+
+    def _plot_4d_projection(self, ax, cells: int) -> None:
+        """Draw the 3D projection of a 4D polytope on a 3D axes."""
         if cells == 8:  # Tesseract
             self._draw_tesseract_projection(ax)
             title = "Tesseract (4D Hypercube) - 3D Projection"
@@ -410,12 +766,6 @@ class ShapeVisualizer:
         ax.set_xlabel('X-axis')
         ax.set_ylabel('Y-axis')
         ax.set_zlabel('Z-axis')
-        
-        print(f"\n🌌 4D Visualization Note:")
-        print(f"This is a 3D projection of a {cells}-cell 4D polytope.")
-        print(f"True 4D geometry cannot be fully represented in 3D space.")
-        
-        plt.show()
     
     def _draw_tesseract_projection(self, ax) -> None:
         """Draw 3D projection of a tesseract (4D hypercube)."""
@@ -473,6 +823,87 @@ class ShapeVisualizer:
         for i, v in enumerate(vertices):
             ax.text(v[0]*1.2, v[1]*1.2, v[2]*1.2, f'V{i+1}', fontsize=10)
     
+    def draw_polytope(self, kind: str, n: int, angles=None) -> None:
+        """
+        Draw a 3D projection of an n-dimensional cube, simplex or orthoplex.
+
+        Args:
+            kind: 'cube', 'simplex' or 'orthoplex'
+            n: Dimension of the polytope (3 or more)
+            angles: Rotation angles, one per coordinate plane (default: a
+                fixed oblique view)
+        """
+        fig = plt.figure(figsize=(12, 10))
+        ax = fig.add_subplot(111, projection='3d')
+        self._plot_polytope(ax, kind, n, angles)
+        plt.show()
+
+    def _plot_polytope(self, ax, kind: str, n: int, angles=None) -> None:
+        """Draw an n-dimensional polytope on a 3D axes as a single edge collection."""
+        from mpl_toolkits.mplot3d.art3d import Line3DCollection
+
+        if n < 3:
+            raise ValueError("Polytope dimension must be at least 3")
+        vertices, edges = polytope(kind, n)
+        planes = rotation_planes(n)
+        if angles is None:
+            angles = np.full(len(planes), 0.35)
+        points = project_frames(vertices, rotation_matrices(n, planes, angles))
+
+        ax.add_collection3d(Line3DCollection(edge_segments(points, edges),
+                                             colors='navy', linewidths=1, alpha=0.6))
+        ax.scatter(points[:, 0], points[:, 1], points[:, 2], c='red', s=20, depthshade=True)
+
+        ax.set_title(f"{n}D {kind.title()} - 3D Projection "
+                     f"({len(vertices)} vertices, {len(edges)} edges)",
+                     fontsize=14, fontweight='bold')
+        ax.set_xlabel('X-axis')
+        ax.set_ylabel('Y-axis')
+        ax.set_zlabel('Z-axis')
+        ax.set_xlim([-1, 1])
+        ax.set_ylim([-1, 1])
+        ax.set_zlim([-1, 1])
+
+    def animate_3d_shape(self, faces: int, save_to: Optional[str] = None,
+                         frames: int = 240, fps: int = 30) -> float:
+        """
+        Continuously rotate a 3D polyhedron (wireframe).
+
+        Args:
+            faces: Number of faces (4, 6 and 8 are exact; others use a cube)
+            save_to: Export to a .gif/.mp4 file instead of opening a window
+            frames: Number of frames to export
+            fps: Frame rate of the exported file
+
+        Returns:
+            Achieved frames per second
+        """
+        kind, n = ANIMATED_3D_SHAPES.get(faces, ('cube', 3))
+        return self._animate(ShapeAnimator(kind, n, title=ShapeDetector(faces, 3).get_3d_shape()),
+                             save_to, frames, fps)
+
+    def animate_4d_projection(self, cells: int, save_to: Optional[str] = None,
+                              frames: int = 240, fps: int = 30) -> float:
+        """Continuously rotate a 4D polytope in 4D and show its projection."""
+        kind, n = ANIMATED_4D_SHAPES.get(cells, ('cube', 4))
+        return self._animate(ShapeAnimator(kind, n, title=ShapeDetector(cells, 4).get_4d_shape()),
+                             save_to, frames, fps)
+
+    def animate_polytope(self, kind: str, n: int, save_to: Optional[str] = None,
+                         frames: int = 240, fps: int = 30) -> float:
+        """Continuously rotate an n-dimensional cube, simplex or orthoplex."""
+        return self._animate(ShapeAnimator(kind, n), save_to, frames, fps)
+
+    def _animate(self, animator: "ShapeAnimator", save_to: Optional[str],
+                 frames: int, fps: int) -> float:
+        """Show or export an animation and report the achieved frame rate."""
+        if save_to:
+            animator.save(save_to, frames=frames, fps=fps)
+        else:
+            animator.show()
+        print(f"🎞️  Achieved {animator.fps:.1f} frames per second")
+        return animator.fps
+
     def _draw_cube_edges(self, ax, vertices, color, linewidth) -> None:
         """Helper function to draw cube edges."""
         edges = [
@@ -487,6 +918,290 @@ class ShapeVisualizer:
                    color=color, linewidth=linewidth)
 
 
+# Polytopes used to animate the shapes known to draw_3d_shape/draw_4d_projection
+ANIMATED_3D_SHAPES = {4: ('simplex', 3), 6: ('cube', 3), 8: ('orthoplex', 3)}
+ANIMATED_4D_SHAPES = {5: ('simplex', 4), 8: ('cube', 4), 16: ('orthoplex', 4)}
+
+
+# Animation
+class ShapeAnimator:
+    """
+    Real-time rotation of an n-dimensional polytope.
+
+    The polytope is rotated in every coordinate plane at its own rate and
+    perspective-projected straight to 2D. One LineCollection (edges) and one
+    scatter (vertices) are created up front; each frame only replaces their
+    coordinates, and only those artists are redrawn over a cached background
+    (blitting) when the canvas supports it.
+    """
+
+    def __init__(self, kind: str, n: int, speed: float = 0.8, distance: float = 3.0,
+                 title: Optional[str] = None, figsize: Tuple[float, float] = (8, 8),
+                 dpi: int = 100, headless: bool = False):
+        """
+        Args:
+            kind: 'cube', 'simplex' or 'orthoplex'
+            n: Dimension of the polytope (2 or more)
+            speed: Base angular speed in radians per second
+            distance: Perspective camera distance (> 1)
+            title: Figure title (defaults to the polytope name)
+            figsize, dpi: Figure size
+            headless: Draw on an off-screen Agg canvas instead of a window
+        """
+        _load_plotting()
+        from matplotlib.collections import LineCollection
+
+        self.vertices, self.edges = polytope(kind, n)
+        self.n = n
+        self.distance = distance
+        self.planes = rotation_planes(n)
+        # Distinct rate per plane so the shape tumbles instead of spinning
+        self.rates = speed * (0.4 + 0.6 * np.arange(1, len(self.planes) + 1) / len(self.planes))
+        self.fps = 0.0
+        self._frame_times = []
+        self._background = None
+
+        if headless:
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            self.fig = Figure(figsize=figsize, dpi=dpi)
+            FigureCanvasAgg(self.fig)
+        else:
+            self.fig = plt.figure(figsize=figsize, dpi=dpi)
+        self.ax = self.fig.add_subplot(111)
+        self.ax.set_xlim(-1.1, 1.1)
+        self.ax.set_ylim(-1.1, 1.1)
+        self.ax.set_aspect('equal')
+        self.ax.axis('off')
+        self.ax.set_title(title or f"{n}D {kind.title()} - Rotating Projection",
+                          fontsize=14, fontweight='bold')
+
+        points = self.project(0.0)
+        self.lines = LineCollection(edge_segments(points, self.edges), colors='navy',
+                                    linewidths=1.2, alpha=0.7, animated=True)
+        self.ax.add_collection(self.lines)
+        self.points = self.ax.scatter(points[:, 0], points[:, 1], c='red', s=18,
+                                      zorder=3, animated=True)
+        self.fps_text = self.ax.text(0.02, 0.02, "", transform=self.ax.transAxes,
+                                     fontsize=10, animated=True)
+        self.artists = (self.lines, self.points, self.fps_text)
+
+    def project(self, t: float) -> np.ndarray:
+        """Vertex positions in 2D at time t (seconds)."""
+        rotation = rotation_matrices(self.n, self.planes, self.rates * t)
+        return project(self.vertices @ rotation, 2, self.distance)
+
+    def update(self, t: float):
+        """Move the existing artists to their positions at time t."""
+        points = self.project(t)
+        self.lines.set_segments(edge_segments(points, self.edges))
+        self.points.set_offsets(points)
+        self._tick()
+        self.fps_text.set_text(f"{self.fps:.1f} fps")
+        return self.artists
+
+    def _tick(self) -> None:
+        """Record a frame and update the rolling frames-per-second estimate."""
+        now = time.perf_counter()
+        self._frame_times.append(now)
+        self._frame_times = self._frame_times[-60:]
+        if len(self._frame_times) > 1:
+            span = self._frame_times[-1] - self._frame_times[0]
+            self.fps = (len(self._frame_times) - 1) / span if span > 0 else 0.0
+
+    def show(self, interval_ms: int = 16):
+        """Run the animation in a window, blitting when the backend allows."""
+        from matplotlib.animation import FuncAnimation
+
+        start = time.perf_counter()
+        blit = getattr(self.fig.canvas, 'supports_blit', False)
+        self._animation = FuncAnimation(
+            self.fig, lambda _: self.update(time.perf_counter() - start),
+            interval=interval_ms, blit=blit, cache_frame_data=False)
+        plt.show()
+        return self._animation
+
+    def _blit_frame(self, t: float) -> None:
+        """Draw one frame by restoring the cached background and redrawing the artists."""
+        canvas = self.fig.canvas
+        if self._background is None:
+            canvas.draw()
+            self._background = canvas.copy_from_bbox(self.fig.bbox)
+        canvas.restore_region(self._background)
+        for artist in self.update(t):
+            self.ax.draw_artist(artist)
+        canvas.blit(self.fig.bbox)
+
+    def benchmark(self, frames: int = 300) -> float:
+        """Render frames as fast as possible with blitting and return the fps."""
+        self._frame_times = []
+        start = time.perf_counter()
+        for i in range(frames):
+            self._blit_frame(i / 60)
+        self.fps = frames / (time.perf_counter() - start)
+        return self.fps
+
+    def save(self, path: str, frames: int = 240, fps: int = 30, dpi: Optional[int] = None) -> str:
+        """
+        Export the rotation to a GIF (Pillow) or video (ffmpeg) without a display.
+
+        Returns:
+            The output path
+        """
+        from matplotlib.animation import FFMpegWriter, PillowWriter
+
+        writer = PillowWriter(fps=fps) if path.lower().endswith('.gif') else FFMpegWriter(fps=fps)
+        for artist in self.artists:
+            artist.set_animated(False)
+        start = time.perf_counter()
+        with writer.saving(self.fig, path, dpi or self.fig.dpi):
+            for i in range(frames):
+                self.update(i / fps)
+                writer.grab_frame()
+        self.fps = frames / (time.perf_counter() - start)
+        for artist in self.artists:
+            artist.set_animated(True)
+        return path
+
+
+# Headless Rendering
+class HeadlessRenderer:
+    """
+    Off-screen renderer for batches of shapes.
+
+    Uses the Agg canvas directly (no pyplot windows, no display needed) and
+    keeps one figure per layout alive across renders: each render clears and
+    redraws the pooled axes instead of allocating a new figure.
+    """
+
+    FORMATS = ('png', 'svg')
+
+    def __init__(self, dpi: int = 100, figsize_2d: Tuple[float, float] = (14, 6),
+                 figsize_3d: Tuple[float, float] = (12, 10)):
+        _load_plotting()
+        self.dpi = dpi
+        self.figsize_2d = figsize_2d
+        self.figsize_3d = figsize_3d
+        self.visualizer = ShapeVisualizer()
+        self._figures = {}
+
+    def _figure(self, layout: str):
+        """Return the pooled (figure, axes) for a layout, creating it once."""
+        if layout not in self._figures:
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+            if layout == '2d':
+                fig = Figure(figsize=self.figsize_2d, dpi=self.dpi)
+                axes = tuple(fig.subplots(1, 2))
+            else:
+                fig = Figure(figsize=self.figsize_3d, dpi=self.dpi)
+                axes = (fig.add_subplot(111, projection='3d'),)
+            FigureCanvasAgg(fig)
+            self._figures[layout] = (fig, axes)
+        fig, axes = self._figures[layout]
+        for ax in axes:
+            ax.cla()
+        return fig, axes
+
+    def render(self, sides: int, dimension: int, fmt: str = 'png',
+               path: Optional[str] = None) -> Union[bytes, str]:
+        """
+        Render one shape.
+
+        Args:
+            sides: Number of sides/faces/cells
+            dimension: 2, 3 or 4
+            fmt: 'png' or 'svg'
+            path: Write the image here; if omitted the image bytes are returned
+
+        Returns:
+            The output path, or the encoded image bytes
+        """
+        if fmt not in self.FORMATS:
+            raise ValueError(f"Unsupported format '{fmt}', use one of {self.FORMATS}")
+        if dimension == 2:
+            if sides < 3:
+                raise ValueError("Cannot draw a 2D shape with less than 3 sides")
+            detector = ShapeDetector(sides, dimension)
+            detector.detect_shape()
+            fig, (ax1, ax2) = self._figure('2d')
+            self.visualizer._plot_2d_polygon(ax1, ax2, sides, detector.properties)
+            fig.tight_layout()
+        elif dimension == 3:
+            fig, (ax,) = self._figure('3d')
+            self.visualizer._plot_3d_shape(ax, sides)
+        elif dimension == 4:
+            fig, (ax,) = self._figure('3d')
+            self.visualizer._plot_4d_projection(ax, sides)
+        else:
+            raise ValueError("Dimension must be 2, 3, or 4")
+
+        if path is not None:
+            fig.savefig(path, format=fmt, dpi=self.dpi)
+            return path
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format=fmt, dpi=self.dpi)
+        return buffer.getvalue()
+
+
+# Per-process renderer used by render_batch workers
+_worker_renderer: Optional[HeadlessRenderer] = None
+
+
+def _init_render_worker(dpi: int) -> None:
+    """Create the renderer (and its figure pool) once per worker process."""
+    global _worker_renderer
+    _worker_renderer = HeadlessRenderer(dpi=dpi)
+
+
+def _render_job(job: Tuple[int, int, str, Optional[str]]) -> Union[bytes, str]:
+    """Render a single (sides, dimension, fmt, path) job in a worker."""
+    sides, dimension, fmt, path = job
+    return _worker_renderer.render(sides, dimension, fmt, path)
+
+
+def render_batch(shapes: Iterable[Tuple[int, int]], output_dir: Optional[str] = None,
+                 fmt: str = 'png', dpi: int = 100, workers: Optional[int] = None,
+                 chunksize: int = 16) -> List[Union[bytes, str]]:
+    """
+    Render many (sides, dimension) shapes headlessly across a process pool.
+
+    Args:
+        shapes: Iterable of (sides, dimension) pairs
+        output_dir: Directory for '<dimension>d_<sides>.<fmt>' files; if
+            omitted, the encoded images are returned as bytes
+        fmt: 'png' or 'svg'
+        dpi: Output resolution
+        workers: Number of worker processes (default: CPU count; 1 renders
+            in the calling process)
+        chunksize: Shapes handed to a worker at a time
+
+    Returns:
+        List of output paths or image bytes, in input order
+    """
+    if fmt not in HeadlessRenderer.FORMATS:
+        raise ValueError(f"Unsupported format '{fmt}', use one of {HeadlessRenderer.FORMATS}")
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+    jobs = []
+    for sides, dimension in shapes:
+        path = None
+        if output_dir is not None:
+            path = os.path.join(output_dir, f"{dimension}d_{sides}.{fmt}")
+        jobs.append((sides, dimension, fmt, path))
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) <= 1:
+        _init_render_worker(dpi)
+        return [_render_job(job) for job in jobs]
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_render_worker,
+                             initargs=(dpi,)) as executor:
+        return list(executor.map(_render_job, jobs, chunksize=chunksize))
+
+
 # Main Program
 def print_header():
     """Print attractive program header."""
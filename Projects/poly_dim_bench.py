@@ -0,0 +1,299 @@
+"""
+Multi-Dimensional Shape Analyzer - Benchmarks
+=============================================
+Command-line benchmarks for poly_dim_ai.
+
+Commands:
+- startup: cold and warm start-up times for the detector-only, predictor
+  and visualizer paths, each measured in a fresh interpreter
+- run: single-call latency, bulk throughput and peak memory of
+  AIPredictor.predict, ShapeDetector.detect_shape, tabulate_properties and
+  the ShapeVisualizer drawing code over a matrix of dimensions and side counts, optionally
+  compared against a stored baseline
+
+Usage:
+    python poly_dim_bench.py startup [--repeat 5] [--json]
+    python poly_dim_bench.py run [--quick] [--output results.json]
+                                 [--baseline baseline.json] [--save-baseline]
+                                 [--tolerance 0.25] [--noise-floor-us 2]
+
+Author: Enhanced Version
+Date: November 2025
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Sequence, Tuple
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(HERE, "poly_dim_bench_baseline.json")
+DEFAULT_DIMENSIONS = (2, 3, 4)
+DEFAULT_SIDES = (3, 6, 12, 24, 120)
+
+# Latency increases smaller than this are timer and scheduler noise on
+# microsecond-scale calls, not regressions, whatever their ratio
+LATENCY_NOISE_FLOOR_S = 2e-6
+
+# Each snippet runs in a fresh interpreter and prints a JSON report with the
+# elapsed time and whether the heavy dependencies ended up imported.
+_STARTUP_TEMPLATE = """
+import json, sys, time
+t0 = time.perf_counter()
+{body}
+elapsed = time.perf_counter() - t0
+print(json.dumps({{
+    "seconds": elapsed,
+    "sklearn_loaded": "sklearn" in sys.modules,
+    "matplotlib_loaded": "matplotlib" in sys.modules,
+}}))
+"""
+
+STARTUP_PATHS: Dict[str, str] = {
+    "detector": ("from poly_dim_ai import ShapeDetector\n"
+                 "ShapeDetector(6, 2).detect_shape()"),
+    "predictor": ("from poly_dim_ai import AIPredictor\n"
+                  "AIPredictor().predict(6, 2)"),
+    "visualizer": ("from poly_dim_ai import ShapeVisualizer\n"
+                   "ShapeVisualizer()"),
+}
+
+
+def _run_snippet(body: str, cache_dir: str) -> dict:
+    """Run a start-up snippet in a fresh interpreter and return its report."""
+    env = dict(os.environ, POLY_DIM_AI_CACHE=cache_dir, MPLBACKEND="Agg")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [HERE, env.get("PYTHONPATH")]))
+    code = _STARTUP_TEMPLATE.format(body=body)
+    out = subprocess.run([sys.executable, "-c", code], env=env, cwd=HERE,
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def bench_startup(repeat: int = 5) -> Dict[str, dict]:
+    """
+    Measure start-up time of each path.
+
+    The cold run uses an empty model cache; warm runs reuse the cache written
+    by the cold run and report the median of ``repeat`` runs.
+    """
+    results = {}
+    for name, body in STARTUP_PATHS.items():
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cold = _run_snippet(body, cache_dir)
+            warm_runs = [_run_snippet(body, cache_dir) for _ in range(repeat)]
+        results[name] = {
+            "cold_seconds": cold["seconds"],
+            "warm_seconds": statistics.median(r["seconds"] for r in warm_runs),
+            "sklearn_loaded_warm": warm_runs[-1]["sklearn_loaded"],
+            "matplotlib_loaded_warm": warm_runs[-1]["matplotlib_loaded"],
+        }
+    return results
+
+
+def print_startup_report(results: Dict[str, dict]) -> None:
+    """Print start-up results as a table."""
+    print(f"\n{'Path':<12}{'Cold (ms)':>12}{'Warm (ms)':>12}{'sklearn':>10}{'matplotlib':>12}")
+    print("-" * 58)
+    for name, r in results.items():
+        print(f"{name:<12}{r['cold_seconds'] * 1000:>12.1f}{r['warm_seconds'] * 1000:>12.1f}"
+              f"{str(r['sklearn_loaded_warm']):>10}{str(r['matplotlib_loaded_warm']):>12}")
+
+
+def _latency(fn: Callable[[], object], repeat: int) -> float:
+    """Median wall time of a single call, in seconds."""
+    fn()  # warm-up
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def _bulk(fn: Callable[[], object], items: int) -> Tuple[float, int]:
+    """Run fn once under tracemalloc; return (items per second, peak bytes)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return items / elapsed if elapsed > 0 else float("inf"), peak
+
+
+def bench_hot_paths(dimensions: Sequence[int] = DEFAULT_DIMENSIONS,
+                    sides: Sequence[int] = DEFAULT_SIDES, repeat: int = 200,
+                    bulk_size: int = 100_000, render_repeat: int = 3) -> Dict[str, dict]:
+    """
+    Benchmark the analyzer hot paths for every (dimension, sides) pair.
+
+    Returns:
+        Mapping of '<component>/d<dimension>/s<sides>' to metrics:
+        latency_s (median single call), throughput_per_s (bulk items per
+        second) and peak_bytes (peak traced allocation during the bulk run)
+    """
+    import numpy as np
+    from poly_dim_ai import AIPredictor, ShapeDetector, HeadlessRenderer, tabulate_properties
+
+    predictor = AIPredictor()
+    renderer = HeadlessRenderer(dpi=50)
+    results = {}
+    for dimension in dimensions:
+        for n in sides:
+            tag = f"d{dimension}/s{n}"
+            pairs = np.tile([n, dimension], (bulk_size, 1))
+            counts = np.full(bulk_size, n)
+
+            throughput, peak = _bulk(lambda: predictor.predict_many(pairs), bulk_size)
+            results[f"predict/{tag}"] = {
+                "latency_s": _latency(lambda: predictor.predict(n, dimension), repeat),
+                "throughput_per_s": throughput, "peak_bytes": peak}
+
+            def detect_uncached():
+                ShapeDetector.cache_clear()
+                ShapeDetector(n, dimension).detect_shape()
+
+            def detect_many():
+                for count in counts.tolist():
+                    ShapeDetector(count, dimension).detect_shape()
+
+            throughput, peak = _bulk(detect_many, bulk_size)
+            results[f"detect/{tag}"] = {
+                "latency_s": _latency(lambda: ShapeDetector(n, dimension).detect_shape(), repeat),
+                "throughput_per_s": throughput, "peak_bytes": peak}
+            results[f"detect_uncached/{tag}"] = {
+                "latency_s": _latency(detect_uncached, repeat)}
+
+            throughput, peak = _bulk(lambda: tabulate_properties(counts, dimension), bulk_size)
+            results[f"tabulate/{tag}"] = {
+                "latency_s": _latency(lambda: tabulate_properties(counts[:1], dimension), repeat),
+                "throughput_per_s": throughput, "peak_bytes": peak}
+
+            if dimension == 2 and n > 200:
+                continue  # one label per vertex: too slow to be a useful benchmark
+            throughput, peak = _bulk(
+                lambda: [renderer.render(n, dimension) for _ in range(render_repeat)],
+                render_repeat)
+            results[f"draw/{tag}"] = {
+                "latency_s": _latency(lambda: renderer.render(n, dimension), render_repeat),
+                "throughput_per_s": throughput, "peak_bytes": peak}
+    return results
+
+
+def compare_to_baseline(results: Dict[str, dict], baseline: Dict[str, dict],
+                        tolerance: float = 0.25,
+                        noise_floor_s: float = LATENCY_NOISE_FLOOR_S) -> List[str]:
+    """
+    List regressions: latency or peak memory more than ``tolerance`` above the
+    baseline, or throughput more than ``tolerance`` below it. Latency
+    increases under ``noise_floor_s`` seconds are ignored.
+    """
+    regressions = []
+    for key, metrics in results.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        for metric in ("latency_s", "peak_bytes"):
+            if metric in metrics and base.get(metric):
+                ratio = metrics[metric] / base[metric]
+                if metric == "latency_s" and metrics[metric] - base[metric] < noise_floor_s:
+                    continue
+                if ratio > 1 + tolerance:
+                    regressions.append(f"{key} {metric}: {ratio:.2f}x baseline")
+        if "throughput_per_s" in metrics and base.get("throughput_per_s"):
+            ratio = metrics["throughput_per_s"] / base["throughput_per_s"]
+            if ratio < 1 / (1 + tolerance):
+                regressions.append(f"{key} throughput_per_s: {ratio:.2f}x baseline")
+    return regressions
+
+
+def print_hot_path_report(results: Dict[str, dict]) -> None:
+    """Print hot-path results as a table."""
+    print(f"\n{'Benchmark':<28}{'Latency (us)':>14}{'Throughput/s':>16}{'Peak (KiB)':>12}")
+    print("-" * 70)
+    for key, m in results.items():
+        throughput = f"{m['throughput_per_s']:,.0f}" if "throughput_per_s" in m else "-"
+        peak = f"{m['peak_bytes'] / 1024:,.0f}" if "peak_bytes" in m else "-"
+        print(f"{key:<28}{m['latency_s'] * 1e6:>14.1f}{throughput:>16}{peak:>12}")
+
+
+def _environment() -> dict:
+    import numpy as np
+    return {"python": platform.python_version(), "numpy": np.__version__,
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+
+def main(argv: List[str] = None) -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="poly_dim_ai benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    startup = sub.add_parser("startup", help="cold/warm start-up times")
+    startup.add_argument("--repeat", type=int, default=5, help="warm runs per path")
+    startup.add_argument("--json", action="store_true", help="emit JSON")
+
+    run = sub.add_parser("run", help="hot-path latency, throughput and memory")
+    run.add_argument("--dimensions", type=int, nargs="+", default=list(DEFAULT_DIMENSIONS))
+    run.add_argument("--sides", type=int, nargs="+", default=list(DEFAULT_SIDES))
+    run.add_argument("--repeat", type=int, default=200, help="single-call samples")
+    run.add_argument("--bulk-size", type=int, default=100_000, help="items per bulk run")
+    run.add_argument("--quick", action="store_true", help="small matrix for smoke runs")
+    run.add_argument("--output", help="write JSON results to this file")
+    run.add_argument("--json", action="store_true", help="emit JSON on stdout")
+    run.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON file")
+    run.add_argument("--save-baseline", action="store_true",
+                     help="store these results as the new baseline")
+    run.add_argument("--tolerance", type=float, default=0.25,
+                     help="allowed relative slowdown before flagging a regression")
+    run.add_argument("--noise-floor-us", type=float, default=LATENCY_NOISE_FLOOR_S * 1e6,
+                     help="ignore latency increases smaller than this many microseconds")
+
+    args = parser.parse_args(argv)
+    if args.command == "startup":
+        results = bench_startup(args.repeat)
+        if args.json:
+            print(json.dumps(results, indent=2))
+        else:
+            print_startup_report(results)
+    elif args.command == "run":
+        if args.quick:
+            args.sides, args.repeat, args.bulk_size = [4, 8], 50, 10_000
+        os.environ.setdefault("MPLBACKEND", "Agg")
+        report = {"environment": _environment(),
+                  "results": bench_hot_paths(args.dimensions, args.sides, args.repeat,
+                                             args.bulk_size)}
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(report, f, indent=2)
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            print_hot_path_report(report["results"])
+
+        if args.save_baseline:
+            with open(args.baseline, "w") as f:
+                json.dump(report, f, indent=2)
+            print(f"\n💾 Baseline saved to {args.baseline}", file=sys.stderr)
+        elif os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)["results"]
+            regressions = compare_to_baseline(report["results"], baseline, args.tolerance,
+                                              args.noise_floor_us * 1e-6)
+            if regressions:
+                print("\n❌ Regressions against baseline:", file=sys.stderr)
+                for line in regressions:
+                    print(f"   {line}", file=sys.stderr)
+                sys.exit(1)
+            print("\n✅ No regressions against baseline", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+Polytope Catalog
+================
+Precomputed catalog of uniform polytopes used by poly_dim_ai's ShapeDetector.
+
+Contents (all at unit edge length):
+- The 5 Platonic solids and 13 Archimedean solids
+- n-gonal prisms and antiprisms (3 <= n <= PRISM_MAX_SIDES)
+- The 6 regular 4-polytopes (5-cell, tesseract, 16-cell, 24-cell, 120-cell, 600-cell)
+
+Each entry stores vertex/edge/face/cell counts, volume, surface area and
+4D hypervolume. For 4-polytopes, 'volume' and 'surface_area' are the total
+3-volume of the cells and the total area of the 2D faces.
+
+The catalog is written once as a .npy structured array and memory-mapped on
+load, so start-up cost does not grow with the number of shapes. Lookups go
+through dictionaries built over the mapped rows.
+
+Usage:
+    python poly_dim_catalog.py [output.npy]
+
+Author: Enhanced Version
+Date: November 2025
+"""
+
+import hashlib
+import os
+import sys
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+CATALOG_VERSION = 1
+PRISM_MAX_SIDES = 100
+
+CACHE_DIR = os.environ.get(
+    "POLY_DIM_AI_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "poly_dim_ai"))
+
+CATALOG_DTYPE = np.dtype([
+    ('name', 'U40'), ('family', 'U16'), ('dimension', np.int8),
+    ('vertices', np.int64), ('edges', np.int64), ('faces', np.int64), ('cells', np.int64),
+    ('volume', np.float64), ('surface_area', np.float64), ('hypervolume', np.float64),
+])
+
+_R2, _R3, _R5 = np.sqrt(2), np.sqrt(3), np.sqrt(5)
+_PENTAGON_AREA = np.sqrt(25 + 10 * _R5) / 4
+
+# name, vertices, edges, faces, volume, surface_area
+PLATONIC_SOLIDS = (
+    ("Tetrahedron", 4, 6, 4, _R2 / 12, _R3),
+    ("Cube", 8, 12, 6, 1.0, 6.0),
+    ("Octahedron", 6, 12, 8, _R2 / 3, 2 * _R3),
+    ("Dodecahedron", 20, 30, 12, (15 + 7 * _R5) / 4, 3 * np.sqrt(25 + 10 * _R5)),
+    ("Icosahedron", 12, 30, 20, 5 * (3 + _R5) / 12, 5 * _R3),
+)
+
+ARCHIMEDEAN_SOLIDS = (
+    ("Truncated Tetrahedron", 12, 18, 8, 23 * _R2 / 12, 7 * _R3),
+    ("Cuboctahedron", 12, 24, 14, 5 * _R2 / 3, 6 + 2 * _R3),
+    ("Truncated Cube", 24, 36, 14, (21 + 14 * _R2) / 3, 2 * (6 + 6 * _R2 + _R3)),
+    ("Truncated Octahedron", 24, 36, 14, 8 * _R2, 6 + 12 * _R3),
+    ("Rhombicuboctahedron", 24, 48, 26, (12 + 10 * _R2) / 3, 2 * (9 + _R3)),
+    ("Truncated Cuboctahedron", 48, 72, 26, 22 + 14 * _R2, 12 * (2 + _R2 + _R3)),
+    ("Snub Cube", 24, 60, 38, 7.889477399983, 6 + 8 * _R3),
+    ("Icosidodecahedron", 30, 60, 32, (45 + 17 * _R5) / 6,
+     5 * _R3 + 3 * np.sqrt(25 + 10 * _R5)),
+    ("Truncated Dodecahedron", 60, 90, 32, 5 * (99 + 47 * _R5) / 12,
+     5 * (_R3 + 6 * np.sqrt(5 + 2 * _R5))),
+    ("Truncated Icosahedron", 60, 90, 32, (125 + 43 * _R5) / 4,
+     3 * (10 * _R3 + np.sqrt(25 + 10 * _R5))),
+    ("Rhombicosidodecahedron", 60, 120, 62, (60 + 29 * _R5) / 3,
+     30 + 5 * _R3 + 3 * np.sqrt(25 + 10 * _R5)),
+    ("Truncated Icosidodecahedron", 120, 180, 62, 95 + 50 * _R5,
+     30 * (1 + _R3 + np.sqrt(5 + 2 * _R5))),
+    ("Snub Dodecahedron", 60, 150, 92, 37.616649962733,
+     20 * _R3 + 3 * np.sqrt(25 + 10 * _R5)),
+)
+
+# name, vertices, edges, faces, cells, cell volume, face area, hypervolume
+REGULAR_POLYCHORA = (
+    ("5-cell", 5, 10, 10, 5, _R2 / 12, _R3 / 4, _R5 / 96),
+    ("Tesseract", 16, 32, 24, 8, 1.0, 1.0, 1.0),
+    ("16-cell", 8, 24, 32, 16, _R2 / 12, _R3 / 4, 1 / 6),
+    ("24-cell", 24, 96, 96, 24, _R2 / 3, _R3 / 4, 2.0),
+    ("120-cell", 600, 1200, 720, 120, (15 + 7 * _R5) / 4, _PENTAGON_AREA,
+     15 * (105 + 47 * _R5) / 4),
+    ("600-cell", 120, 720, 1200, 600, _R2 / 12, _R3 / 4, 25 * (2 + _R5) / 4),
+)
+
+POLYGON_PREFIXES = {
+    3: "Triangular", 4: "Square", 5: "Pentagonal", 6: "Hexagonal", 7: "Heptagonal",
+    8: "Octagonal", 9: "Enneagonal", 10: "Decagonal", 12: "Dodecagonal",
+}
+
+
+def _polygon_area(n: int) -> float:
+    """Area of a regular n-gon with unit sides."""
+    return n / (4 * np.tan(np.pi / n))
+
+
+def _polygon_prefix(n: int) -> str:
+    return POLYGON_PREFIXES.get(n, f"{n}-gonal")
+
+
+def _prism(n: int) -> tuple:
+    """Uniform n-gonal prism with unit edges."""
+    base = _polygon_area(n)
+    return (f"{_polygon_prefix(n)} Prism", "prism", 3, 2 * n, 3 * n, n + 2, 0,
+            base, 2 * base + n, 0.0)
+
+
+def _antiprism(n: int) -> tuple:
+    """Uniform n-gonal antiprism with unit edges."""
+    volume = (n * np.sqrt(4 * np.cos(np.pi / (2 * n))**2 - 1) * np.sin(3 * np.pi / (2 * n))
+              / (12 * np.sin(np.pi / n)**2))
+    area = 2 * _polygon_area(n) + n * _R3 / 2
+    return (f"{_polygon_prefix(n)} Antiprism", "antiprism", 3, 2 * n, 4 * n, 2 * n + 2, 0,
+            volume, area, 0.0)
+
+
+def build_catalog(prism_max_sides: int = PRISM_MAX_SIDES) -> np.ndarray:
+    """
+    Build the catalog as a structured array (see CATALOG_DTYPE).
+
+    Rows are ordered by preference: when several shapes share a face/cell
+    count, the earlier one is the default match for that count.
+    """
+    rows = []
+    for name, v, e, f, volume, area in PLATONIC_SOLIDS:
+        rows.append((name, "platonic", 3, v, e, f, 0, volume, area, 0.0))
+    for name, v, e, f, volume, area in ARCHIMEDEAN_SOLIDS:
+        rows.append((name, "archimedean", 3, v, e, f, 0, volume, area, 0.0))
+    sides = range(3, prism_max_sides + 1)
+    rows.extend(_prism(n) for n in sides)
+    rows.extend(_antiprism(n) for n in sides)
+    for name, v, e, f, c, cell_volume, face_area, hypervolume in REGULAR_POLYCHORA:
+        rows.append((name, "regular", 4, v, e, f, c, c * cell_volume, f * face_area,
+                     hypervolume))
+    return np.array(rows, dtype=CATALOG_DTYPE)
+
+
+def catalog_path(cache_dir: Optional[str] = None,
+                 prism_max_sides: int = PRISM_MAX_SIDES) -> str:
+    """Cache file for a catalog version and build parameters."""
+    key = f"{CATALOG_VERSION}:{prism_max_sides}:{CATALOG_DTYPE.descr}"
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(cache_dir or CACHE_DIR, f"catalog-{digest}.npy")
+
+
+def save_catalog(catalog: np.ndarray, path: str) -> str:
+    """Write the catalog atomically as a .npy file."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, catalog)
+    os.replace(tmp_path, path)
+    return path
+
+
+class ShapeCatalog:
+    """Memory-mapped polytope catalog with name and element-count indexes."""
+
+    def __init__(self, table: np.ndarray):
+        self.table = table
+        self._by_name: Dict[str, int] = {}
+        self._by_count: Dict[Tuple[int, int], List[int]] = {}
+        names = table['name'].tolist()
+        dims = table['dimension'].tolist()
+        # 3D shapes are indexed by face count, 4D shapes by cell count
+        counts = np.where(table['dimension'] == 4, table['cells'], table['faces']).tolist()
+        for row, (name, dim, count) in enumerate(zip(names, dims, counts)):
+            self._by_name[name.lower()] = row
+            self._by_count.setdefault((dim, count), []).append(row)
+
+    @classmethod
+    def load(cls, cache_dir: Optional[str] = None,
+             prism_max_sides: int = PRISM_MAX_SIDES) -> "ShapeCatalog":
+        """Memory-map the cached catalog, building it first if needed."""
+        path = catalog_path(cache_dir, prism_max_sides)
+        if not os.path.exists(path):
+            try:
+                save_catalog(build_catalog(prism_max_sides), path)
+            except OSError:
+                # Read-only cache: fall back to an in-memory catalog
+                return cls(build_catalog(prism_max_sides))
+        return cls(np.load(path, mmap_mode='r', allow_pickle=False))
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def row_by_name(self, name: str) -> Optional[int]:
+        """Row index of a shape by (case-insensitive) name."""
+        return self._by_name.get(name.lower())
+
+    def rows_by_count(self, dimension: int, count: int) -> List[int]:
+        """Row indices of all shapes with this many faces (3D) or cells (4D)."""
+        return self._by_count.get((dimension, count), [])
+
+    def entry(self, row: int) -> dict:
+        """A catalog row as a plain dictionary."""
+        record = self.table[row]
+        return {name: record[name].item() for name in CATALOG_DTYPE.names}
+
+
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else catalog_path()
+    catalog = build_catalog()
+    save_catalog(catalog, target)
+    print(f"✅ Wrote {len(catalog)} shapes to {target}")
@@ -0,0 +1,359 @@
+"""
+Shape Analysis Service
+======================
+Local asyncio HTTP/JSON service exposing poly_dim_ai's ShapeDetector and
+AIPredictor.
+
+Features:
+- One shared, warmed-up AIPredictor (lookup table loaded at start-up)
+- Micro-batching: concurrent single-shape requests are coalesced into one
+  vectorized predict_many / tabulate_properties call; if a batch fails its
+  items are retried one by one, so a bad request only fails itself
+- Range-checked inputs and Content-Length; bad requests get a 400
+- Per-endpoint latency histograms
+- HTTP/1.1 keep-alive, standard library only
+
+Endpoints:
+    POST /predict   {"sides": 6, "dimension": 2}           -> {"shape": ...}
+                    {"shapes": [[6, 2], [8, 3]]}           -> {"shapes": [...]}
+    POST /detect    {"sides": 6, "dimension": 3,
+                     "edge_length": 1.0}                   -> {"shape": ..., "properties": {...}}
+                    {"shapes": [{"sides": 6, "dimension": 3}, ...]}
+    GET  /stats     latency histograms and batching counters
+    GET  /health    liveness check
+
+Usage:
+    python poly_dim_service.py [--host 127.0.0.1] [--port 8765]
+
+Author: Enhanced Version
+Date: November 2025
+"""
+
+import argparse
+import asyncio
+import bisect
+import json
+import time
+import numpy as np
+from typing import Callable, Dict, List, Optional, Tuple
+
+from poly_dim_ai import AIPredictor, ShapeDetector, tabulate_properties, DISPLAY_DECIMALS
+
+MAX_BODY_BYTES = 8 * 1024 * 1024
+MAX_SIDES = 1_000_000
+MAX_DIMENSION = 64
+MAX_EDGE_LENGTH = 1e12
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class LatencyHistogram:
+    """Fixed log-spaced latency buckets (50 microseconds to ~10 seconds)."""
+
+    BOUNDS = tuple(50e-6 * 2**i for i in range(18))
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        self.total = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.BOUNDS, seconds)] += 1
+        self.total += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket containing the q-th quantile, capped at the maximum seen."""
+        if not self.total:
+            return 0.0
+        target, seen = q * self.total, 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self.BOUNDS[i], self.max) if i < len(self.BOUNDS) else self.max
+        return self.max
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.total,
+            "mean_ms": self.sum / self.total * 1000 if self.total else 0.0,
+            "p50_ms": self.quantile(0.50) * 1000,
+            "p95_ms": self.quantile(0.95) * 1000,
+            "p99_ms": self.quantile(0.99) * 1000,
+            "max_ms": self.max * 1000,
+            "buckets_ms": {f"<={b * 1000:g}": c for b, c in zip(self.BOUNDS, self.counts) if c},
+        }
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent single requests into one batched call.
+
+    Items wait at most ``max_delay`` seconds (or until ``max_batch`` items
+    are queued) before ``handler`` is called once with the whole list.
+    """
+
+    def __init__(self, handler: Callable[[list], list], max_batch: int = 512,
+                 max_delay: float = 0.0005):
+        self.handler = handler
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.batches = 0
+        self.items = 0
+        self.retried = 0
+        self._pending: List[Tuple[object, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def submit(self, item):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        self.batches += 1
+        self.items += len(pending)
+        items = [item for item, _ in pending]
+        try:
+            results = self.handler(items)
+        except Exception as e:
+            if len(items) == 1:
+                results = [e]
+            else:
+                # Retry one by one so a bad item only fails its own request
+                self.retried += 1
+                results = [self._call_one(item) for item in items]
+        for (_, future), result in zip(pending, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def _call_one(self, item):
+        """Handle a single item, returning the exception instead of raising it."""
+        try:
+            return self.handler([item])[0]
+        except Exception as e:
+            return e
+
+    def snapshot(self) -> dict:
+        return {"batches": self.batches, "items": self.items, "retried_batches": self.retried,
+                "mean_batch_size": self.items / self.batches if self.batches else 0.0}
+
+
+def _parse_shape(payload) -> Tuple[int, int, float]:
+    """Validate one {"sides", "dimension", "edge_length"} object or [sides, dimension] pair."""
+    if isinstance(payload, dict):
+        sides, dimension = payload.get("sides"), payload.get("dimension")
+        edge_length = payload.get("edge_length", 1.0)
+    elif isinstance(payload, (list, tuple)) and len(payload) == 2:
+        (sides, dimension), edge_length = payload, 1.0
+    else:
+        raise ValueError("Expected {'sides': ..., 'dimension': ...} or [sides, dimension]")
+    if isinstance(sides, bool) or not isinstance(sides, int) or not 0 <= sides <= MAX_SIDES:
+        raise ValueError(f"'sides' must be an integer between 0 and {MAX_SIDES}")
+    if isinstance(dimension, bool) or not isinstance(dimension, int) \
+            or not 0 <= dimension <= MAX_DIMENSION:
+        raise ValueError(f"'dimension' must be an integer between 0 and {MAX_DIMENSION}")
+    if isinstance(edge_length, bool) or not isinstance(edge_length, (int, float)) \
+            or not 0 < edge_length <= MAX_EDGE_LENGTH:
+        raise ValueError(f"'edge_length' must be a positive number up to {MAX_EDGE_LENGTH:g}")
+    return sides, dimension, float(edge_length)
+
+
+class ShapeService:
+    """Request handling, shared models and batching for the HTTP server."""
+
+    def __init__(self, max_batch: int = 512, max_delay: float = 0.0005):
+        # Warm the shared model: lookup table, catalog and detection path
+        self.predictor = AIPredictor()
+        self.predictor.predict_many([[6, 2]])
+        ShapeDetector(6, 3).detect_shape()
+
+        self.predict_batcher = MicroBatcher(self._predict_batch, max_batch, max_delay)
+        self.detect_batcher = MicroBatcher(self._detect_batch, max_batch, max_delay)
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.routes = {
+            ("POST", "/predict"): self.predict,
+            ("POST", "/detect"): self.detect,
+            ("GET", "/stats"): self.stats,
+            ("GET", "/health"): self.health,
+        }
+
+    # Batched work -------------------------------------------------------
+
+    def _predict_batch(self, pairs: List[Tuple[int, int]]) -> List[str]:
+        return self.predictor.predict_many(np.asarray(pairs, dtype=np.int64)).tolist()
+
+    def _detect_batch(self, shapes: List[Tuple[int, int, float]]) -> List[dict]:
+        """Tabulate properties for all queued shapes, one vectorized call per dimension."""
+        results: List[Optional[dict]] = [None] * len(shapes)
+        sides = np.array([s[0] for s in shapes], dtype=np.int64)
+        dims = np.array([s[1] for s in shapes], dtype=np.int64)
+        lengths = np.array([s[2] for s in shapes], dtype=np.float64)
+        for dimension in np.unique(dims).tolist():
+            rows = np.flatnonzero(dims == dimension)
+            table = tabulate_properties(sides[rows], dimension, lengths[rows],
+                                        decimals=DISPLAY_DECIMALS)
+            get_name = {2: ShapeDetector.get_2d_shape, 3: ShapeDetector.get_3d_shape,
+                        4: ShapeDetector.get_4d_shape}[dimension]
+            names = {n: get_name(ShapeDetector(n, dimension))
+                     for n in np.unique(sides[rows]).tolist()}
+            fields = table.dtype.names
+            for i, record in zip(rows.tolist(), table.tolist()):
+                results[i] = {"shape": names[shapes[i][0]],
+                              "properties": dict(zip(fields, record))}
+        return results
+
+    # Endpoints ------------------------------------------------------------
+
+    async def predict(self, body: dict) -> dict:
+        if "shapes" in body:
+            pairs = [_parse_shape(item)[:2] for item in body["shapes"]]
+            if not pairs:
+                return {"shapes": []}
+            return {"shapes": self._predict_batch(pairs)}
+        sides, dimension, _ = _parse_shape(body)
+        return {"shape": await self.predict_batcher.submit((sides, dimension))}
+
+    async def detect(self, body: dict) -> dict:
+        def checked(item):
+            sides, dimension, edge_length = _parse_shape(item)
+            if dimension not in (2, 3, 4):
+                raise ValueError("Dimension must be 2, 3, or 4")
+            if sides < 3:
+                raise ValueError("Shape must have at least 3 sides/faces/cells")
+            return sides, dimension, edge_length
+
+        if "shapes" in body:
+            shapes = [checked(item) for item in body["shapes"]]
+            return {"shapes": self._detect_batch(shapes) if shapes else []}
+        return await self.detect_batcher.submit(checked(body))
+
+    async def stats(self, body: dict) -> dict:
+        return {
+            "latency": {path: h.snapshot() for path, h in self.histograms.items()},
+            "batching": {"predict": self.predict_batcher.snapshot(),
+                         "detect": self.detect_batcher.snapshot()},
+            "detection_cache": ShapeDetector.cache_info()._asdict(),
+        }
+
+    async def health(self, body: dict) -> dict:
+        return {"status": "ok"}
+
+    # HTTP -----------------------------------------------------------------
+
+    async def dispatch(self, method: str, path: str, raw_body: bytes) -> Tuple[int, dict]:
+        """Route a request and record its latency."""
+        start = time.perf_counter()
+        handler = self.routes.get((method, path))
+        if handler is None:
+            known = any(route_path == path for _, route_path in self.routes)
+            status, payload = (405, {"error": f"{method} not allowed on {path}"}) if known \
+                else (404, {"error": f"Unknown endpoint {path}"})
+            return status, payload
+        try:
+            body = json.loads(raw_body) if raw_body else {}
+            if not isinstance(body, dict):
+                raise ValueError("Request body must be a JSON object")
+            status, payload = 200, await handler(body)
+        except (ValueError, TypeError, KeyError) as e:
+            status, payload = 400, {"error": str(e)}
+        except Exception as e:
+            status, payload = 500, {"error": str(e)}
+        self.histograms.setdefault(path, LatencyHistogram()).record(time.perf_counter() - start)
+        return status, payload
+
+    async def handle_connection(self, reader: asyncio.StreamReader,
+                                writer: asyncio.StreamWriter) -> None:
+        """Serve HTTP/1.1 requests on one connection until it closes."""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        key, value = line.split(":", 1)
+                        headers[key.strip().lower()] = value.strip()
+
+                length_header = headers.get("content-length", "0") or "0"
+                valid = length_header.isascii() and length_header.isdigit()
+                length = int(length_header) if valid else -1
+                if length < 0:
+                    status, payload = 400, {"error": f"Invalid Content-Length: {length_header!r}"}
+                elif length > MAX_BODY_BYTES:
+                    status, payload = 413, {"error": "Request body too large"}
+                else:
+                    raw_body = await reader.readexactly(length) if length else b""
+                    status, payload = await self.dispatch(method, target.split("?", 1)[0],
+                                                          raw_body)
+
+                # Without a usable Content-Length the body cannot be skipped
+                keep_alive = (headers.get("connection", "").lower() != "close"
+                              and version == "HTTP/1.1" and 0 <= length <= MAX_BODY_BYTES)
+                body = json.dumps(payload).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                    .encode("latin-1") + body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(host: str = "127.0.0.1", port: int = 8765, max_batch: int = 512,
+                max_delay: float = 0.0005) -> None:
+    """Start the service and run until cancelled."""
+    service = ShapeService(max_batch, max_delay)
+    server = await asyncio.start_server(service.handle_connection, host, port)
+    print(f"🌐 Shape analysis service listening on http://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv: List[str] = None) -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Shape analysis HTTP/JSON service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-batch", type=int, default=512,
+                        help="largest coalesced batch")
+    parser.add_argument("--max-delay-ms", type=float, default=0.5,
+                        help="longest time a request waits for its batch")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.max_batch, args.max_delay_ms / 1000))
+    except KeyboardInterrupt:
+        print("\n👋 Service stopped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Round trips through morse_audio and morse_receiver."""
+
+import random
+
+import numpy as np
+import pytest
+
+import morse_audio
+import morse_codec
+from morse_receiver import MorseReceiver
+
+SPEEDS = [(5, None), (12, None), (20, None), (35, None), (50, None), (18, 8), (25, 10)]
+LETTERS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
+
+
+def _short_messages(count: int, seed: int = 1) -> list:
+    rng = random.Random(seed)
+    return [' '.join(''.join(rng.choice(LETTERS) for _ in range(rng.randint(1, 6)))
+                     for _ in range(rng.randint(2, 8)))
+            for _ in range(count)]
+
+
+def _round_trip(text: str, wpm: float, farnsworth_wpm=None, chunk=None) -> str:
+    bank = morse_audio.ToneBank(wpm, farnsworth_wpm)
+    silence = np.zeros(bank.sample_rate // 4)
+    pcm = np.concatenate((silence, morse_audio.synthesize(morse_codec.encode(text), bank), silence))
+    receiver = MorseReceiver(bank.sample_rate)
+    chunk = chunk or len(pcm)
+    text = ''.join(receiver.feed(pcm[i:i + chunk]) for i in range(0, len(pcm), chunk))
+    return text + receiver.flush()
+
+
+@pytest.mark.parametrize('wpm,farnsworth_wpm', SPEEDS)
+@pytest.mark.parametrize('text', ['E T E T', 'F XK QNCK1 ZQ 7 BMW', 'SOS HELP', 'HELLO WORLD'])
+def test_short_message_round_trip(text, wpm, farnsworth_wpm):
+    assert _round_trip(text, wpm, farnsworth_wpm) == text
+
+
+@pytest.mark.parametrize('wpm,farnsworth_wpm', SPEEDS)
+def test_random_messages_round_trip(wpm, farnsworth_wpm):
+    for text in _short_messages(12, seed=wpm):
+        assert _round_trip(text, wpm, farnsworth_wpm) == text
+
+
+def test_single_word_round_trip():
+    for wpm in (5, 20, 50):
+        assert _round_trip('PARIS', wpm) == 'PARIS'
+
+
+def test_chunking_does_not_change_result():
+    text = ' '.join(_short_messages(6, seed=3))
+    assert _round_trip(text, 20, chunk=777) == _round_trip(text, 20) == text
@@ -0,0 +1,132 @@
+"""VaultSession and the SQLite vault in password_manager."""
+
+import functools
+import json
+import os
+import time
+
+import pytest
+
+import password_manager
+from password_manager import VaultSession, get_vault
+
+
+@pytest.fixture
+def session(tmp_path):
+    session = VaultSession(key_file=str(tmp_path / "secret.key"), idle_timeout=None)
+    yield session
+    session.lock()
+
+
+def test_encrypt_many_round_trip(session):
+    passwords = [f"pw-{i}-ünïcode" for i in range(50)] + [""]
+    tokens = session.encrypt_many(passwords)
+    assert len(set(tokens)) == len(tokens)
+    assert session.decrypt_many(tokens) == passwords
+    assert [session.decrypt(token) for token in tokens] == passwords
+    assert session.decrypt(session.encrypt("secret")) == "secret"
+
+
+def test_key_reused_after_relock(session):
+    token = session.encrypt("secret")
+    session.lock()
+    assert not session.unlocked
+    assert session.decrypt(token) == "secret"
+    assert session.unlocked
+
+
+def test_relocks_after_idle_timeout(tmp_path):
+    session = VaultSession(key_file=str(tmp_path / "secret.key"), idle_timeout=0.05)
+    with session:
+        assert session.unlocked
+        deadline = time.monotonic() + 2
+        while session.unlocked and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert not session.unlocked
+
+
+class _LockAfterUnlock(VaultSession):
+    """Runs the idle check right after unlock() releases its lock, as the timer may."""
+
+    def unlock(self):
+        fernet = super().unlock()
+        self._check_idle()
+        return fernet
+
+
+def test_idle_lock_between_unlock_and_use(tmp_path):
+    session = _LockAfterUnlock(key_file=str(tmp_path / "secret.key"), idle_timeout=0)
+    token = session.encrypt("secret")
+    assert not session.unlocked
+    assert session.decrypt(token) == "secret"
+    assert session.decrypt_many(session.encrypt_many(["a", "b"])) == ["a", "b"]
+
+
+@pytest.fixture(autouse=True)
+def _close_vaults(monkeypatch):
+    vaults = {}
+    monkeypatch.setattr(password_manager, "_vaults", vaults)
+    yield
+    for conn in vaults.values():
+        conn.close()
+
+
+@pytest.fixture
+def vault(tmp_path, monkeypatch, session):
+    """Point the module's vault and session at a temporary directory."""
+    open_vault = functools.partial(get_vault, str(tmp_path / "passwords.db"),
+                                   str(tmp_path / "passwords.json"))
+    monkeypatch.setattr(password_manager, "get_vault", open_vault)
+    monkeypatch.setattr(password_manager, "get_session", lambda: session)
+    return open_vault()
+
+
+def _passwords(session):
+    return {name: (entry["username"], session.decrypt(entry["password"]) if entry["password"] else "")
+            for name, entry in password_manager.load_passwords().items()}
+
+
+def test_migrates_json_once(tmp_path, capsys):
+    json_file = tmp_path / "passwords.json"
+    json_file.write_text(json.dumps({"mail": {"username": "me", "password": "token"},
+                                     "bank": {}}))
+    conn = get_vault(str(tmp_path / "passwords.db"), str(json_file))
+    rows = conn.execute("SELECT name, username, password FROM services ORDER BY name")
+    assert rows.fetchall() == [("bank", "", ""), ("mail", "me", "token")]
+    assert not json_file.exists() and os.path.exists(f"{json_file}.bak")
+    assert "Migrated 2 services" in capsys.readouterr().out
+    assert get_vault(str(tmp_path / "passwords.db"), str(json_file)) is conn
+
+
+def test_save_password_upserts(vault, session):
+    password_manager.add_service("mail")
+    password_manager.save_password("mail", "me", "first")
+    password_manager.save_password("mail", "me2", "second")
+    password_manager.save_password("bank", "you", "third")
+    assert _passwords(session) == {"bank": ("you", "third"), "mail": ("me2", "second")}
+
+
+def test_save_many_passwords(vault, session):
+    entries = [(f"service{i:04}", f"user{i}", f"pw{i}") for i in range(1000)]
+    assert password_manager.save_many_passwords(entries) == 1000
+    assert password_manager.save_many_passwords([("service0000", "new", "changed")]) == 1
+    stored = _passwords(session)
+    assert len(stored) == 1000
+    assert stored["service0000"] == ("new", "changed")
+    assert stored["service0999"] == ("user999", "pw999")
+
+
+def test_single_entry_statements_use_the_key(vault):
+    for sql in ("SELECT username, password FROM services WHERE name = ?",
+                "DELETE FROM services WHERE name = ?"):
+        plan = " ".join(row[-1] for row in vault.execute(f"EXPLAIN QUERY PLAN {sql}", ("x",)))
+        assert "SEARCH" in plan and "SCAN" not in plan
+
+
+def test_failed_update_changes_nothing(vault, session):
+    password_manager.save_password("mail", "me", "secret")
+    with pytest.raises(KeyError):
+        password_manager.save_passwords({"bank": {"username": "you"}})
+    assert _passwords(session) == {"mail": ("me", "secret")}
+    password_manager.remove_service("mail")
+    assert not password_manager.service_exists("mail")
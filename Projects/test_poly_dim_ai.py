@@ -0,0 +1,45 @@
+"""Catalog lookups behind ShapeDetector and tabulate_properties."""
+
+import numpy as np
+import pytest
+
+from poly_dim_ai import DISPLAY_DECIMALS, ShapeDetector, _catalog_rows, tabulate_properties
+
+
+@pytest.mark.parametrize('faces,name,vertices', [(5, 'Triangular Prism', 6),
+                                                 (7, 'Pentagonal Prism', 10)])
+def test_3d_detection_matches_face_count(faces, name, vertices):
+    detector = ShapeDetector(faces, 3)
+    assert detector.detect_shape() == name
+    assert detector.properties['faces'] == faces
+    assert detector.properties['vertices'] == vertices
+
+
+def test_3d_label_breaks_ties_between_equal_counts():
+    assert ShapeDetector(6, 3).detect_shape() == 'Cube/Hexahedron (6 faces)'
+    assert ShapeDetector(8, 3).detect_shape() == 'Octahedron (8 faces)'
+
+
+@pytest.mark.parametrize('dimension,count_field', [(3, 'faces'), (4, 'cells')])
+def test_counts_reported_as_queried(dimension, count_field):
+    counts = np.array([5, 7, 8, 10, 99999])
+    table = tabulate_properties(counts, dimension)
+    assert table[count_field].tolist() == counts.tolist()
+
+
+@pytest.mark.parametrize('dimension', [3, 4])
+def test_tabulate_matches_detector(dimension):
+    counts = np.arange(0, 130)
+    table = tabulate_properties(counts, dimension, 1.5, decimals=DISPLAY_DECIMALS)
+    for count, record in zip(counts.tolist(), table.tolist()):
+        detector = ShapeDetector(count, dimension, 1.5)
+        detector.detect_shape()
+        assert record == tuple(detector.properties.values())
+
+
+def test_catalog_rows_gathers_numeric_columns_only():
+    rows, records = _catalog_rows(3, np.array([4, 5, -1, 10**9]))
+    assert rows[2] == rows[3] == -1
+    assert records.dtype.itemsize <= 64
+    assert all(records.dtype[name].kind in 'if' for name in records.dtype.names)
+    assert records[2].tolist() == records[3].tolist() == (0,) * len(records.dtype.names)
@@ -0,0 +1,21 @@
+"""Baseline comparison in poly_dim_bench."""
+
+from poly_dim_bench import compare_to_baseline
+
+BASELINE = {"detect": {"latency_s": 2e-6, "throughput_per_s": 1e6, "peak_bytes": 1000}}
+
+
+def test_small_latency_increase_is_noise():
+    results = {"detect": {"latency_s": 3e-6, "throughput_per_s": 1e6, "peak_bytes": 1000}}
+    assert compare_to_baseline(results, BASELINE) == []
+    assert compare_to_baseline(results, BASELINE, noise_floor_s=0) == \
+        ["detect latency_s: 1.50x baseline"]
+
+
+def test_regressions_above_noise_floor_reported():
+    results = {"detect": {"latency_s": 5e-6, "throughput_per_s": 5e5, "peak_bytes": 2000}}
+    assert compare_to_baseline(results, BASELINE) == [
+        "detect latency_s: 2.50x baseline",
+        "detect peak_bytes: 2.00x baseline",
+        "detect throughput_per_s: 0.50x baseline",
+    ]
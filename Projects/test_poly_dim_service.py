@@ -0,0 +1,22 @@
+"""Latency statistics reported by poly_dim_service."""
+
+import pytest
+
+from poly_dim_service import LatencyHistogram
+
+
+@pytest.mark.parametrize('latencies', [[3e-3] * 100, [1e-5, 2e-4, 7e-3, 0.3], [20.0, 30.0]])
+def test_quantiles_never_exceed_max(latencies):
+    histogram = LatencyHistogram()
+    for seconds in latencies:
+        histogram.record(seconds)
+    for q in (0.5, 0.95, 0.99, 1.0):
+        assert histogram.quantile(q) <= histogram.max == max(latencies)
+
+
+def test_uniform_latency_reports_itself():
+    histogram = LatencyHistogram()
+    for _ in range(100):
+        histogram.record(3e-3)
+    snapshot = histogram.snapshot()
+    assert snapshot['p50_ms'] == snapshot['p99_ms'] == snapshot['max_ms'] == pytest.approx(3)